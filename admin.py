@@ -0,0 +1,181 @@
+"""CSC111 Project 1: Text Adventure Game - Admin Console
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the admin commands of a hosted server: commands an operator types
+(or a monitoring script sends) to inspect the sessions of a SessionManager (see sessions.py)
+without playing. Every command returns its output as a string.
+
+Commands:
+    memstats [--json] [--dump FILE] [SESSION ...]
+        The memory of the resident sessions (or of the given ones), by category (see
+        memstats.py), with the state of the memory budget and spill store. --json prints it as
+        JSON instead, and --dump FILE writes the JSON to FILE.
+    where ITEM [SESSION ...]
+        Where the named item is in each resident session (or in the given ones, rehydrating them
+        if they are hibernated): at which location, in the player's inventory, or in the drop table
+        of an enemy. Answered from each game's item index (see item_index.py).
+    help
+        The list of commands.
+
+Running this module opens a number of sessions, plays random turns in them, and then runs the
+admin commands given on the command line, or reads them from standard input.
+
+Usage:
+    python admin.py [--sessions N] [--turns N] [COMMAND ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import os
+import shlex
+from typing import Callable
+
+from item_index import format_holder
+from memstats import dump_memstats, memstats, memstats_data
+from sessions import Session, SessionManager
+
+
+def _memstats(manager: SessionManager, args: list[str]) -> str:
+    """Return the memory of the manager's resident sessions, as a table or as JSON (see the module docstring)."""
+    session_ids, dump_file, as_json = [], None, False
+    words = iter(args)
+    for word in words:
+        if word == "--json":
+            as_json = True
+        elif word == "--dump":
+            dump_file = next(words, None)
+            if dump_file is None:
+                return "Usage: memstats [--json] [--dump FILE] [SESSION ...]"
+        else:
+            session_ids.append(word)
+
+    if dump_file is not None:
+        dump_memstats(manager, dump_file, session_ids)
+        return f"Memory stats written to {dump_file}"
+    if as_json:
+        return json.dumps(memstats_data(manager, session_ids), indent=2)
+    return "\n".join([
+        memstats(manager, session_ids).format(),
+        f"resident sessions: {manager.resident_count()} (estimated {manager.resident_bytes:,} bytes "
+        f"of a {manager.memory_budget:,} byte budget)",
+        f"hibernated sessions: {len(manager.store)} ({manager.store.live_bytes:,} bytes spilled, "
+        f"spill file {manager.store.size():,} bytes)"])
+
+
+def _where(manager: SessionManager, args: list[str]) -> str:
+    """Return where the named item is in the manager's resident sessions or in the given ones
+    (see the module docstring).
+    """
+    if not args:
+        return "Usage: where ITEM [SESSION ...]"
+    item_name, session_ids = args[0], args[1:]
+    if not session_ids:
+        return "\n".join(_where_in(session, item_name) for session in manager.resident_sessions()) or \
+            "No resident sessions."
+
+    lines = []
+    for session_id in session_ids:
+        try:
+            with manager.use(session_id) as session:
+                lines.append(_where_in(session, item_name))
+        except KeyError:
+            lines.append(f"{session_id}: no such session")
+    return "\n".join(lines)
+
+
+def _where_in(session: Session, item_name: str) -> str:
+    """Return the line of the where command for one session."""
+    holders = session.game.get_item_index(session.player).holders(item_name)
+    if not holders:
+        return f"{session.session_id}: {item_name} is nowhere"
+    return f"{session.session_id}: {item_name} is in " + ", ".join(format_holder(holder) for holder in holders)
+
+
+def _help(manager: SessionManager, args: list[str]) -> str:
+    """Return the list of admin commands."""
+    return "Admin commands: " + ", ".join(sorted(ADMIN_COMMANDS))
+
+
+# The function run by each admin command, given the manager and the command's arguments.
+ADMIN_COMMANDS: dict[str, Callable[[SessionManager, list[str]], str]] = {
+    "memstats": _memstats,
+    "where": _where,
+    "help": _help,
+}
+
+
+def handle_admin_command(manager: SessionManager, line: str) -> str:
+    """Run the admin command line against manager and return its output.
+
+    >>> handle_admin_command(None, "frobnicate")
+    'Unknown admin command "frobnicate". Admin commands: help, memstats, where'
+    """
+    words = shlex.split(line)
+    if not words:
+        return ""
+    if words[0] not in ADMIN_COMMANDS:
+        return f'Unknown admin command "{words[0]}". {_help(manager, [])}'
+    return ADMIN_COMMANDS[words[0]](manager, words[1:])
+
+
+if __name__ == "__main__":
+    import argparse
+    import contextlib
+    import doctest
+    import random
+    import tempfile
+    from scheduler import run_command
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Run admin commands against a server of random sessions.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="an admin command to run (read from standard input if none)")
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = SessionManager(args.game_data, os.path.join(temp_dir, "sessions.spill"))
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for n in range(args.sessions):
+                server.open(f"s{n}")
+                with server.use(f"s{n}") as session:
+                    for _ in range(args.turns):
+                        commands = [command for command in session.game.get_location().available_commands
+                                    if command.startswith(("go", "take"))]
+                        run_command(session, rng.choice(commands), os.path.join(temp_dir, "admin.sav"))
+
+        if args.command:
+            print(handle_admin_command(server, " ".join(shlex.quote(word) for word in args.command)))
+        else:
+            while True:
+                try:
+                    admin_line = input("admin> ")
+                except EOFError:
+                    break
+                if admin_line.strip() == "quit":
+                    break
+                print(handle_admin_command(server, admin_line))
+        server.shutdown()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -18,18 +18,45 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
+import hashlib
 import json
 import os
-from typing import Optional
+from collections import Counter
+from typing import Optional, TYPE_CHECKING
 
 from game_entities import Location, Item, Player, Inventory, Enemy
 from event_logger import Event, EventList
+from packing import choose_items
+from rendering import RenderCache
+from autosave import Autosaver, CorruptSaveError
+from save_format import WorldMismatchError, encode_compact, load_save_data, write_compact_save
+from item_index import INVENTORY_HOLDER, ItemIndex, at_location, held_by_enemy
+from winnability import shortest_distances, unwinnable_reason
+from world_validator import check_world
+
+if TYPE_CHECKING:
+    from hot_reload import WorldTemplate
+    from policy import HintTable
+    from world_clock import WorldClock
 
 
 # Note: You may add in other import statements here as needed
 
 # Note: You may add helper functions, classes, etc. below as needed
 
+# Saves used to be pretty-printed JSON in this file; it is still loaded if no compact save exists.
+LEGACY_SAVE_FILE = 'save_game.json'
+
+# The items that must be brought to the win location (OISE) to submit the assignment.
+REQUIRED_ITEMS = ["usb stick", "lucky mug", "laptop charger"]
+WIN_LOCATION_ID = 1
+
+# Regular menu options, available at every location
+MENU = ["look", "inventory", "stats", "score", "log", "quit", "save", "drop", "pack", "hint"]
+
+# The number of events shown per page of the log viewer
+LOG_PAGE_SIZE = 10
+
 
 class AdventureGame:
     """A text adventure game class storing all location, item and map data.
@@ -42,6 +69,14 @@ class AdventureGame:
         - ongoing: Whether the game is currently active.
         - steps: The number of steps the player has taken.
         - max_steps: The maximum allowed steps before game over.
+        - render_cache: The cache of rendered location text, keyed by location ID and version.
+        - item_index: The index of where every item is (see item_index.py), or None until it is
+          next needed (see get_item_index).
+        - world_clock: The clock running the timed events of this game's world, such as patrolling
+          enemies (see world_clock.py), or None if the world only changes through the player.
+        - world_hash: The SHA-256 hash of the game data file this game was loaded from.
+        - world_generation: The generation of the shared world template this game was last
+          reconciled with (see hot_reload.py), or 0 if it does not follow one.
 
     Representation Invariants:
         - self.current_location_id in self._locations
@@ -54,21 +89,40 @@ class AdventureGame:
     #                       This represents all the locations in the game.
     #   - _items: a dictionary of Item objects, representing all items in the game.
     #   - _enemies: a dicitonary of Enemy objects, representing all enemies in the game
+    #   - _initial_world: the items and enemies of each location as loaded from the game data file
+    #   - _hint_tables: the hint table opened for each (speed, attack, defense), or None if there is none
+    #   - _distances: the number of moves between every pair of locations, or None until first needed
 
     _locations: dict[int, Location]
     _items: dict[str, Item]
     _enemies: dict[str, Enemy]
+    _initial_world: dict[int, tuple[list[str], list[str]]]
+    _hint_tables: dict[tuple[int, int, int], Optional[HintTable]]
+    _distances: Optional[dict[int, dict[int, int]]]
     current_location_id: int  # Suggested attribute, can be removed
     ongoing: bool  # Suggested attribute, can be removed
     steps: int
     max_steps: int
-
-    def __init__(self, game_data_file: str, initial_location_id: int) -> None:
+    render_cache: RenderCache
+    item_index: Optional[ItemIndex]
+    world_clock: Optional[WorldClock]
+    world_hash: str
+    world_generation: int
+
+    def __init__(self, game_data_file: str, initial_location_id: int, world_data: Optional[dict] = None,
+                 world_hash: str = "") -> None:
         """
         Initialize a new text adventure game, based on the data in the given file.
 
         The game starting location is set to the given initial_location_id.
 
+        If world_data is given, it is used instead of reading the file: it is the already parsed
+        contents of the game data file (e.g. a shared world template), whose SHA-256 hash is
+        world_hash. It is never modified.
+
+        The game data is validated first (see world_validator.py), unless a world with the same
+        hash was already found valid; InvalidWorldError lists every error found.
+
         Preconditions:
         - game_data_file is the filename of a valid game data JSON file
         - initial_location_id is a valid location ID in the game data
@@ -82,62 +136,99 @@ class AdventureGame:
         # 2. Make sure the Item class is used to represent each item.
 
         # Suggested helper method (you can remove and load these differently if you wish to do so):
-        self._locations, self._items, self._enemies = self._load_game_data(game_data_file)
+        if world_data is None:
+            world_data, world_hash = self._load_game_data(game_data_file)
+        check_world(world_data, world_hash)
+        self._locations, self._items, self._enemies = self._build_world(world_data)
+        self._initial_world = {loc_id: (list(loc.items), list(loc.enemies))
+                               for loc_id, loc in self._locations.items()}
+        self.world_hash = world_hash
+        self.world_generation = 0
 
         # Suggested attributes (you can remove and track these differently if you wish to do so):
         self.current_location_id = initial_location_id  # game begins at this location
         self.ongoing = True  # whether the game is ongoing
         self.steps = 0
         self.max_steps = 50
+        self.render_cache = RenderCache()
+        self.item_index = None
+        self.world_clock = None
+        self._hint_tables = {}
+        self._distances = None
 
     @staticmethod
-    def _load_game_data(filename: str) -> tuple[dict[int, Location], dict[str, Item], dict[str, Enemy]]:
+    def _load_game_data(filename: str) -> tuple[dict, str]:
         """
-        Load locations, items, and enemies from a JSON file.
+        Load the game data from a JSON file.
+
+        Returns a tuple containing:
+        1. The parsed game data, to be built into locations, items and enemies by _build_world.
+        2. The SHA-256 hash of the file's contents.
+        """
+
+        with open(filename, 'rb') as f:
+            contents = f.read()
+
+        return json.loads(contents), hashlib.sha256(contents).hexdigest()
+
+    @staticmethod
+    def _build_world(data: dict) -> tuple[dict[int, Location], dict[str, Item], dict[str, Enemy]]:
+        """
+        Build the locations, items, and enemies described by the parsed game data.
 
         Returns a tuple containing:
         1. A dictionary of locations {id: Location}.
         2. A dictionary of items {name: Item}.
         3. A dictionary of enemies {name: Enemy}.
-        """
-
-        with open(filename, 'r') as f:
-            data = json.load(f)  # This loads all the data from the JSON file
 
+        The objects built do not share any mutable state with data.
+        """
         locations = {}
         for loc_data in data['locations']:  # Go through each element associated with the 'locations' key in the file
-            location_obj = Location(id_num=loc_data['id'],
-                                    brief_description=loc_data['brief_description'],
-                                    long_description=loc_data['long_description'],
-                                    available_commands=loc_data['available_commands'],
-                                    items=loc_data['items'],
-                                    enemies=loc_data['enemies'])
-            locations[loc_data['id']] = location_obj
+            locations[loc_data['id']] = AdventureGame._make_location(loc_data)
 
         items = {}
         for item_data in data['items']:  # Go through each element associated with the 'items' key in the file
-            item_obj = Item(name=item_data['name'],
-                            description=item_data['description'],
-                            start_position=item_data['start_position'],
-                            target_position=item_data['target_position'],
-                            target_points=item_data['target_points'],
-                            weight=item_data['weight'],
-                            combat_use=item_data['combat_use'],
-                            strength=item_data['strength'],)
-            items[item_obj.name] = item_obj
+            items[item_data['name']] = AdventureGame._make_item(item_data)
 
         enemies = {}
         for enemy_data in data['enemies']:  # Go through each element associated with the 'items' key in the file
-            enemy_obj = Enemy(name=enemy_data['name'],
-                              max_health=enemy_data['max_health'],
-                              current_health=enemy_data['current_health'],
-                              attack=enemy_data['attack'],
-                              items=enemy_data['items'],
-                              attack_pattern=enemy_data['attack_pattern'])
-            enemies[enemy_obj.name] = enemy_obj
+            enemies[enemy_data['name']] = AdventureGame._make_enemy(enemy_data)
 
         return locations, items, enemies
 
+    @staticmethod
+    def _make_location(loc_data: dict) -> Location:
+        """Return the Location described by one entry of the game data's 'locations' list."""
+        return Location(id_num=loc_data['id'],
+                        brief_description=loc_data['brief_description'],
+                        long_description=loc_data['long_description'],
+                        available_commands=dict(loc_data['available_commands']),
+                        items=list(loc_data['items']),
+                        enemies=list(loc_data['enemies']))
+
+    @staticmethod
+    def _make_item(item_data: dict) -> Item:
+        """Return the Item described by one entry of the game data's 'items' list."""
+        return Item(name=item_data['name'],
+                    description=item_data['description'],
+                    start_position=item_data['start_position'],
+                    target_position=item_data['target_position'],
+                    target_points=item_data['target_points'],
+                    weight=item_data['weight'],
+                    combat_use=item_data['combat_use'],
+                    strength=item_data['strength'],)
+
+    @staticmethod
+    def _make_enemy(enemy_data: dict) -> Enemy:
+        """Return the Enemy described by one entry of the game data's 'enemies' list."""
+        return Enemy(name=enemy_data['name'],
+                     max_health=enemy_data['max_health'],
+                     current_health=enemy_data['current_health'],
+                     attack=enemy_data['attack'],
+                     items=list(enemy_data['items']),
+                     attack_pattern=list(enemy_data['attack_pattern']))
+
     def get_location(self, loc_id: Optional[int] = None) -> Location:
         """
         Return Location object associated with the provided location ID.
@@ -147,23 +238,235 @@ class AdventureGame:
         Preconditions:
         - loc_id is None or loc_id in self._locations
         """
-        if loc_id:
+        if loc_id is not None:
             return self._locations[loc_id]
         else:
             return self._locations[self.current_location_id]
 
+    def get_location_ids(self) -> list[int]:
+        """
+        Return the IDs of all locations in the game.
+        """
+        return list(self._locations)
+
+    def get_distances(self) -> dict[int, dict[int, int]]:
+        """
+        Return the number of moves between every pair of locations, as a dictionary mapping a
+        location ID to the distance to every location reachable from it. The distances are
+        computed the first time they are needed.
+        """
+        if self._distances is None:
+            exits_ = {loc_id_: [dest_ for command_, dest_ in loc_.available_commands.items()
+                                if command_.startswith("go ")]
+                      for loc_id_, loc_ in self._locations.items()}
+            self._distances = shortest_distances(exits_)
+        return self._distances
+
     def get_item(self, item_name: str) -> Optional[Item]:
         """
         Return the Item object with the given name, or None if it doesn't exist.
         """
         return self._items.get(item_name)
 
+    def get_item_names(self) -> list[str]:
+        """
+        Return the names of all items in the game.
+        """
+        return list(self._items)
+
+    def get_enemy_names(self) -> list[str]:
+        """
+        Return the names of all enemies in the game.
+        """
+        return list(self._enemies)
+
     def get_enemy(self, enemy_name: str) -> Optional[Enemy]:
         """
         Return the Enemy object with the given name, or None if it doesn't exist.
         """
         return self._enemies.get(enemy_name)
 
+    def get_initial_world(self) -> dict[int, tuple[list[str], list[str]]]:
+        """
+        Return the items and enemies of each location as loaded from the game data file,
+        as a dictionary mapping location ID to (items, enemies).
+        """
+        return self._initial_world
+
+    def apply_world_changes(self, locations_: dict[int, Optional[dict]], items_: dict[str, Optional[dict]],
+                            enemies_: dict[str, Optional[dict]], player_: Player, world_hash_: str,
+                            generation_: int) -> None:
+        """
+        Reconcile this game with a changed game data file, touching only the changed entities.
+
+        Each of locations_, items_ and enemies_ maps the ID or name of a changed entity to its new
+        game data entry, or to None if it was removed. Progress made in this game is kept: items
+        the player moved stay where the player left them (or in their inventory), defeated enemies
+        stay defeated, and damage dealt to an enemy carries over to its new max_health.
+        """
+        for name_, item_data_ in items_.items():
+            if item_data_ is None:
+                self._remove_item(name_, player_)
+            elif name_ in self._items:
+                # Update in place: the player's inventory holds these objects
+                for field_, value_ in vars(self._make_item(item_data_)).items():
+                    setattr(self._items[name_], field_, value_)
+            else:
+                self._items[name_] = self._make_item(item_data_)
+        player_.inventory.current_weight = sum(item_.weight for item_ in player_.inventory.items)
+
+        for name_, enemy_data_ in enemies_.items():
+            if enemy_data_ is None:
+                self._enemies.pop(name_, None)
+                for loc_ in self._locations.values():
+                    if name_ in loc_.enemies:
+                        loc_.enemies = [enemy_ for enemy_ in loc_.enemies if enemy_ != name_]
+                        loc_.version += 1
+                continue
+            new_enemy_ = self._make_enemy(enemy_data_)
+            old_enemy_ = self._enemies.get(name_)
+            if old_enemy_ is None:
+                self._enemies[name_] = new_enemy_
+                continue
+            damage_taken_ = old_enemy_.max_health - old_enemy_.current_health
+            new_enemy_.current_health = max(new_enemy_.max_health - damage_taken_, 1)
+            for field_, value_ in vars(new_enemy_).items():
+                setattr(old_enemy_, field_, value_)
+
+        additions_ = []
+        for loc_id_, loc_data_ in locations_.items():
+            additions_.extend((loc_id_, item_) for item_ in self._reconcile_location(loc_id_, loc_data_))
+
+        # Items newly placed by the designer are added last, unless the player already has them
+        # or they are already somewhere else in this game (e.g. moved there by the player)
+        if additions_:
+            present_ = {item_.name for item_ in player_.inventory.items}
+            present_.update(item_ for loc_ in self._locations.values() for item_ in loc_.items)
+            for loc_id_, item_ in additions_:
+                if item_ not in present_:
+                    loc_ = self._locations[loc_id_]
+                    loc_.items.append(item_)
+                    loc_.available_commands.setdefault(f"take {item_}", loc_id_)
+                    present_.add(item_)
+
+        if self.current_location_id not in self._locations:
+            self.current_location_id = WIN_LOCATION_ID  # OISE, where every game starts
+
+        self.world_hash = world_hash_
+        self.world_generation = generation_
+        self.render_cache.clear()
+        self.item_index = None
+        self._hint_tables = {}
+        self._distances = None
+
+    def _remove_item(self, item_name_: str, player_: Player) -> None:
+        """
+        Remove the item with the given name from the game entirely, including the player's inventory.
+        """
+        self._items.pop(item_name_, None)
+        player_.inventory.items = [item_ for item_ in player_.inventory.items if item_.name != item_name_]
+        for loc_ in self._locations.values():
+            if item_name_ in loc_.items:
+                loc_.items = [name_ for name_ in loc_.items if name_ != item_name_]
+                loc_.available_commands.pop(f"take {item_name_}", None)
+                loc_.version += 1
+
+    def _reconcile_location(self, loc_id_: int, loc_data_: Optional[dict]) -> list[str]:
+        """
+        Replace the location with the given ID by its new game data entry (None if it was removed),
+        keeping the items the player took from it or left at it and the enemies defeated at it.
+
+        Return the items that the new entry places here but the old one did not; they are not added.
+        """
+        if loc_data_ is None:
+            self._locations.pop(loc_id_, None)
+            self._initial_world.pop(loc_id_, None)
+            return []
+
+        new_loc_ = self._make_location(loc_data_)
+        loc_ = self._locations.get(loc_id_)
+        old_items_, old_enemies_ = self._initial_world.get(loc_id_, ([], []))
+        added_ = Counter(new_loc_.items) - Counter(old_items_)
+        if loc_ is None:
+            new_loc_.items = []
+        else:
+            taken_ = Counter(old_items_) - Counter(loc_.items)
+            left_ = Counter(loc_.items) - Counter(old_items_)
+            kept_ = Counter(new_loc_.items) - added_ - taken_
+            new_loc_.items = list(kept_.elements()) + list(left_.elements())
+            defeated_ = set(old_enemies_) - set(loc_.enemies)
+            new_loc_.enemies = [enemy_ for enemy_ in new_loc_.enemies if enemy_ not in defeated_]
+
+        # Take commands follow the items actually here
+        commands_ = {command_: dest_ for command_, dest_ in new_loc_.available_commands.items()
+                     if not command_.startswith("take ") or command_[len("take "):] in new_loc_.items}
+        for item_ in new_loc_.items:
+            commands_.setdefault(f"take {item_}", loc_id_)
+        new_loc_.available_commands = commands_
+
+        if loc_ is None:
+            self._locations[loc_id_] = new_loc_
+        else:
+            # Update in place, keeping the visited flag, so that references to the location stay valid
+            loc_.brief_description = new_loc_.brief_description
+            loc_.long_description = new_loc_.long_description
+            loc_.available_commands = new_loc_.available_commands
+            loc_.items = new_loc_.items
+            loc_.enemies = new_loc_.enemies
+            loc_.version += 1
+        self._initial_world[loc_id_] = (list(loc_data_['items']), list(loc_data_['enemies']))
+        return list(added_.elements())
+
+    def get_item_index(self, player_: Player) -> ItemIndex:
+        """
+        Return the index of where every item of this game and of its player's inventory is,
+        building it by scanning the world if it has not been built since the world last changed
+        as a whole.
+        """
+        if self.item_index is None:
+            self.item_index = ItemIndex(self, player_)
+        return self.item_index
+
+    def take_item(self, player_: Player, item_: Item) -> bool:
+        """
+        Move the item from the current location to the player's inventory, unless it is too heavy,
+        keeping the item index up to date. Return whether the item was taken.
+
+        Preconditions:
+        - item_.name in self.get_location().items
+        """
+        loc_ = self.get_location()
+        carried_ = len(player_.inventory.items)
+        player_.inventory.take_item(item=item_, current_location=loc_)
+        if len(player_.inventory.items) == carried_:
+            return False
+        if self.item_index is not None:
+            self.item_index.move(item_.name, at_location(loc_.id_num), INVENTORY_HOLDER)
+        return True
+
+    def drop_item(self, player_: Player, item_: Item) -> None:
+        """
+        Move the item from the player's inventory to the current location, keeping the item index up to date.
+
+        Preconditions:
+        - item_ in player_.inventory.items
+        """
+        loc_ = self.get_location()
+        player_.inventory.drop_item(item=item_, current_location=loc_)
+        if self.item_index is not None:
+            self.item_index.move(item_.name, INVENTORY_HOLDER, at_location(loc_.id_num))
+
+    def get_hint_table(self, player_: Player) -> Optional[HintTable]:
+        """
+        Return the precomputed hint table for the player's stats, or None if none has been built
+        for this game data file. The table is opened the first time it is needed.
+        """
+        stats_ = (player_.speed, player_.attack, player_.defense)
+        if stats_ not in self._hint_tables:
+            from policy import open_hint_table  # imported when the first hint is asked for
+            self._hint_tables[stats_] = open_hint_table(stats_, self.world_hash)
+        return self._hint_tables[stats_]
+
     def update_location(self, location_to_update_: Location) -> None:
         """
         Update the stored location object with a new version.
@@ -171,19 +474,22 @@ class AdventureGame:
         """
         self._locations[location_to_update_.id_num] = location_to_update_
 
-    def save_game(self, filename: str, player_: Player, game_log_: EventList) -> None:
+    def to_save_data(self, player_: Player, game_log_: EventList) -> dict:
         """
-        Save the current game state to a JSON file.
+        Return a point-in-time snapshot of the current game state as a dictionary.
 
-        The save file includes:
+        The snapshot includes:
         - Current location
         - Step count
         - Player stats (inventory, health, attack, defense, speed, points)
         - Visited locations
         - Items and enemies at each location
         - The event log
+
+        The snapshot shares no mutable objects with the game, so it can be serialized on
+        another thread while the game continues.
         """
-        data = {
+        return {
             'location_id': self.current_location_id,
             'steps': self.steps,
             'player': {
@@ -196,30 +502,73 @@ class AdventureGame:
                 'points': player_.points
             },
             'visited_locations': [loc_id for loc_id, loc in self._locations.items() if loc.visited],
-            'location_items': {str(loc_id): loc.items for loc_id, loc in self._locations.items()},
-            'location_enemies': {str(loc_id): loc.enemies for loc_id, loc in self._locations.items()},
+            'location_items': {str(loc_id): list(loc.items) for loc_id, loc in self._locations.items()},
+            'location_enemies': {str(loc_id): list(loc.enemies) for loc_id, loc in self._locations.items()},
             'log': game_log_.to_data()
         }
-        with open(filename, 'w') as f:
-            json.dump(data, f, indent=4)
+
+    def state_digest(self, player_: Player, game_log_: Optional[EventList] = None) -> str:
+        """
+        Return a short digest of the full game state (see to_save_data), including the event log
+        only if game_log_ is given, so that runs of the interactive loop and the simulation,
+        which log events differently, can be compared on everything else.
+        """
+        data_ = self.to_save_data(player_, EventList() if game_log_ is None else game_log_)
+        encoded_ = json.dumps(data_, sort_keys=True, separators=(',', ':')).encode()
+        return hashlib.sha256(encoded_).hexdigest()[:16]
+
+    def encode_save_data(self, data_: dict) -> bytes:
+        """
+        Return the given snapshot from to_save_data encoded in the compact save format.
+        """
+        return encode_compact(data_, self._initial_world, self.world_hash)
+
+    def save_game(self, filename: str, player_: Player, game_log_: EventList,
+                  autosaver_: Optional[Autosaver] = None) -> None:
+        """
+        Save the current game state to a file in the compact save format (see save_format.py).
+
+        The file is written atomically (via a temporary file and a rename) and includes a
+        checksum of its contents, so a crash mid-save never leaves a corrupted save behind.
+        If autosaver_ writes to the same file, the save goes through it, so that an older
+        autosave still being written cannot replace this one. See to_save_data for what is saved.
+        """
+        data_ = self.to_save_data(player_, game_log_)
+        if autosaver_ is not None and os.path.abspath(autosaver_.filename) == os.path.abspath(filename):
+            autosaver_.save_now(data_)
+        else:
+            write_compact_save(filename, data_, self._initial_world, self.world_hash)
         print(f"Game saved to {filename}")
 
     def load_game(self, filename: str, p_load_: Player, log_load_: EventList) -> None:
         """
-        Load the game state from a JSON file.
+        Load the game state from a save file in either the compact or the original JSON format.
 
         Restores the player's stats, inventory, and location, as well as the
         state of the world (items, enemies, visited locations).
+        Does nothing if the file is missing, fails its checksum, was made with a different
+        game_data.json, or holds a game that is over (see saved_outcome).
         """
         if not os.path.exists(filename):
             print("Save file not found.")
             return
 
-        with open(filename, 'r') as f:
-            data_ = json.load(f)
+        try:
+            descriptions_ = {lid_: loc_.brief_description for lid_, loc_ in self._locations.items()}
+            data_ = load_save_data(filename, self._initial_world, descriptions_, self.world_hash)
+        except CorruptSaveError as error_:
+            print(f"Save file is corrupted and was not loaded. ({error_})")
+            return
+        except WorldMismatchError as error_:
+            print(f"Save file is intact but does not fit this world, and was not loaded. ({error_})")
+            return
+        if data_.get('outcome') is not None:
+            print(f"The saved game is over ({data_['outcome']}) and was not loaded.")
+            return
 
         # Restore player using public attribute 'points'
         p_load_.inventory.items = [self._items[n] for n in data_['player']['inventory'] if n in self._items]
+        p_load_.inventory.current_weight = sum(i_.weight for i_ in p_load_.inventory.items)
         p_load_.speed = data_['player']['speed']
         p_load_.attack = data_['player']['attack']
         p_load_.defense = data_['player']['defense']
@@ -229,6 +578,19 @@ class AdventureGame:
 
         self._restore_game_state(data_, log_load_)
 
+    def saved_outcome(self, filename: str) -> Optional[str]:
+        """
+        Return how the game saved in filename ended (see get_outcome), or None if it was saved
+        while still ongoing, or cannot be read.
+
+        game_loop records the outcome in a final save once a game is decided.
+        """
+        try:
+            data_ = load_save_data(filename, self._initial_world, {}, self.world_hash)
+        except (CorruptSaveError, WorldMismatchError, OSError):
+            return None
+        return data_.get('outcome')
+
     def _restore_game_state(self, data_: dict, log_load_: EventList) -> None:
         """
         Helper method to restore game state variables from loaded data.
@@ -240,13 +602,17 @@ class AdventureGame:
             loc_.visited = lid_ in data_['visited_locations']
             if str(lid_) in data_['location_items']:
                 loc_.items = data_['location_items'][str(lid_)]
+            if str(lid_) in data_.get('location_enemies', {}):
+                loc_.enemies = data_['location_enemies'][str(lid_)]
 
             # Sync commands
             loc_.available_commands = {k: v for k, v in loc_.available_commands.items()
                                        if not k.startswith("take ")}
             for itm_ in loc_.items:
                 loc_.available_commands[f"take {itm_}"] = loc_.id_num
+            loc_.version += 1
 
+        self.item_index = None
         log_load_.from_data(data_['log'])
 
     def check_steps(self) -> None:
@@ -266,13 +632,7 @@ class AdventureGame:
         - Helper items found (e.g. old socks)
         - Items successfully brought to their target locations
         """
-        score_val_ = 0
-        for lid_, loc_ in self._locations.items():
-            for item_name_ in loc_.items:
-                item_obj_ = self.get_item(item_name_)
-                if item_obj_ and item_obj_.target_position == lid_:
-                    score_val_ += item_obj_.target_points
-
+        score_val_ = self.get_item_index(player_).placed_points
         for item_ in player_.inventory.items:
             if item_.name == "old socks":
                 score_val_ += item_.target_points
@@ -287,13 +647,30 @@ class AdventureGame:
         Winning requires bringing specific items (USB Stick, Lucky Mug, Laptop Charger)
         to the start location (OISE, ID 1) and ensuring they are present there.
         """
-        oise_ = self.get_location(1)
-        req_ = ["usb stick", "lucky mug", "laptop charger"]
-        if all(i_ in oise_.items for i_ in req_):
+        index_ = self.get_item_index(player_)
+        if all(index_.is_at(i_, at_location(WIN_LOCATION_ID)) for i_ in REQUIRED_ITEMS):
             print("\nCONGRATULATIONS! Assignment submitted!")
             print(f"Final Score: {self.get_score(player_)}")
             self.ongoing = False
 
+    def get_outcome(self, player_: Player, unwinnable_: bool = False) -> str:
+        """
+        Return how the game ended: "win", "dead", "out of steps", "unwinnable" if it was ended
+        early because it could no longer be won (as unwinnable_ tells), or "quit" if it ended
+        before it was decided.
+        """
+        index_ = self.get_item_index(player_)
+        if all(index_.is_at(i_, at_location(WIN_LOCATION_ID)) for i_ in REQUIRED_ITEMS):
+            return "win"
+        elif player_.current_health <= 0:
+            return "dead"
+        elif self.steps >= self.max_steps:
+            return "out of steps"
+        elif unwinnable_:
+            return "unwinnable"
+        else:
+            return "quit"
+
     def increment_steps(self, player_: Player) -> None:
         """
         Increment the step counter based on the player's speed.
@@ -336,27 +713,39 @@ def _handle_combat_defeat(game_: AdventureGame, enemy_: Enemy) -> None:
     loc_ = game_.get_location()
 
     # Safely remove enemy and drop items
-    if loc_.enemies:
-        loc_.enemies.pop()
+    defeated_ = loc_.enemies.pop() if loc_.enemies else None
 
     loc_.items.extend(item_names_)
+    if game_.item_index is not None:
+        dropped_ = game_.get_enemy(defeated_) if defeated_ is not None else None
+        for item_name_ in dropped_.items if dropped_ is not None else []:
+            game_.item_index.remove(item_name_, held_by_enemy(defeated_))
+        for item_name_ in item_names_:
+            game_.item_index.add(item_name_, at_location(loc_.id_num))
+    if game_.world_clock is not None:
+        game_.world_clock.enemy_defeated(game_, enemy_.name, loc_.id_num)
     for item_name_ in item_names_:
         loc_.available_commands[f"take {item_name_}"] = loc_.id_num
+    loc_.version += 1
 
 
 def _combat_player_turn(player_: Player, enemy_: Enemy, game_: AdventureGame,
-                        game_log_: EventList) -> bool:
+                        game_log_: EventList, turn_num_: int = 1) -> bool:
     """
-    Handle the player's turn in the combat loop.
+    Handle the player's turn in the combat loop, on the given turn of the fight.
 
-    Prompts the user for an action (attack, flee, inventory) and executes it.
+    Prompts the user for an action (attack, flee, inventory, auto) and executes it.
     Returns True if the combat encounter should end (e.g., enemy defeated or player fled),
     False otherwise.
     """
-    options_ = ["attack", "flee", "inventory"]
+    options_ = ["attack", "flee", "inventory", "auto"]
     move_ = ""
     while move_ not in options_:
-        move_ = input("What to do? Choose from Attack, Flee, or Inventory: ").lower().strip()
+        move_ = input("What to do? Choose from Attack, Flee, Inventory, or Auto: ").lower().strip()
+
+    if move_ == "auto":
+        _auto_combat(player_, enemy_, game_, game_log_, turn_num_)
+        return True
 
     # Update the log for the chosen combat action
     update_game_log(game_log_, game_.get_location(), move_)
@@ -374,6 +763,45 @@ def _combat_player_turn(player_: Player, enemy_: Enemy, game_: AdventureGame,
     return False
 
 
+def _auto_combat(player_: Player, enemy_: Enemy, game_: AdventureGame, game_log_: EventList,
+                 turn_num_: int) -> None:
+    """
+    Resolve the rest of a fight at once, from the given turn, exactly as if the player chose to
+    attack on every remaining turn: the outcome is computed in closed form (see
+    Enemy.fight_outcome), applied in one update, and logged as a single summary event.
+
+    As in turn-by-turn combat, every enemy attack costs the steps of one move, and the fight
+    ends early if the player dies or runs out of steps.
+    """
+    location_ = game_.get_location()
+    step_cost_ = 6 - player_.speed
+    turns_left_ = -(-(game_.max_steps - game_.steps) // step_cost_)  # enemy attacks until out of steps
+    outcome_ = enemy_.fight_outcome(player_.attack, player_.defense, player_.current_health,
+                                    turn_num_, max(turns_left_, 1))
+
+    enemy_.take_damage(player_.attack * outcome_.player_turns)
+    player_.current_health = max(player_.current_health - outcome_.damage_taken, 0)
+    for _ in range(outcome_.enemy_turns):
+        game_.increment_steps(player_)
+
+    print(f"You fight {enemy_.name} to the end: {outcome_.player_turns} attacks, "
+          f"{outcome_.damage_taken} damage taken. HP: {player_.current_health}")
+    if not outcome_.player_survives:
+        result_ = "died"
+        print("You died! Game Over.")
+        game_.ongoing = False
+    elif outcome_.cut_short:
+        result_ = "ran out of time"
+    else:
+        result_ = "won"
+        _handle_combat_defeat(game_, enemy_)
+    game_.check_steps()
+
+    summary_ = (f"Auto combat against {enemy_.name}: {outcome_.player_turns} attacks, "
+                f"{outcome_.damage_taken} damage taken, {result_}.")
+    game_log_.add_event(Event(id_num=location_.id_num, description=summary_), "auto")
+
+
 def _handle_combat_inventory(player_: Player, enemy_: Enemy, game_: AdventureGame) -> bool:
     """
     Handle utilizing an item from the inventory during combat.
@@ -410,6 +838,8 @@ def _handle_combat_inventory(player_: Player, enemy_: Enemy, game_: AdventureGam
             _handle_combat_defeat(game_, enemy_)
             player_.inventory.items.remove(item_obj_)
             player_.inventory.current_weight -= item_obj_.weight
+            if game_.item_index is not None:
+                game_.item_index.remove(item_obj_.name, INVENTORY_HOLDER)
             return True
         print(f"You did {item_obj_.strength} damage!")
         enemy_.take_damage(item_obj_.strength)
@@ -431,7 +861,7 @@ def combat(player_: Player, enemy_: Enemy, game_: AdventureGame, game_log_: Even
 
     while enemy_.current_health > 0 and player_.current_health > 0 and game_.ongoing:
         # Pass game_log_ into the turn handler
-        if _combat_player_turn(player_, enemy_, game_, game_log_):
+        if _combat_player_turn(player_, enemy_, game_, game_log_, turn_num_):
             break
 
         # Enemy Turn
@@ -461,6 +891,31 @@ def update_game_log(game_log_: EventList, location_: Location, choice_: str) ->
     return
 
 
+def _render_items_at_location(game_: AdventureGame, location_: Location) -> str:
+    """
+    Return the text listing the descriptions of all items present at the specified location,
+    or the empty string if there are none.
+    """
+    lines_ = []
+    for item_name_ in location_.items:
+        item_obj_ = game_.get_item(item_name_)
+        if item_obj_:
+            lines_.append(f"- {item_obj_.description}")
+    if not lines_:
+        return ""
+    return "\nYou see:\n" + "\n".join(lines_)
+
+
+def _render_long_description(game_: AdventureGame, location_: Location) -> str:
+    """
+    Return the long description of the specified location followed by its visible items.
+    """
+    items_text_ = _render_items_at_location(game_, location_)
+    if items_text_:
+        return location_.long_description + "\n" + items_text_
+    return location_.long_description
+
+
 def _display_items_at_location(game_: AdventureGame, location_: Location) -> None:
     """
     Print the descriptions of all items present at the specified location.
@@ -468,11 +923,10 @@ def _display_items_at_location(game_: AdventureGame, location_: Location) -> Non
     if not location_.items:
         return
 
-    print("\nYou see:")
-    for item_name_ in location_.items:
-        item_obj_ = game_.get_item(item_name_)
-        if item_obj_:
-            print(f"- {item_obj_.description}")
+    text_ = game_.render_cache.get_or_render((location_.id_num, location_.version, "items"),
+                                             lambda: _render_items_at_location(game_, location_))
+    if text_:
+        print(text_)
 
 
 def print_description(game_: AdventureGame, game_log_: EventList, location_: Location) -> None:
@@ -487,15 +941,179 @@ def print_description(game_: AdventureGame, game_log_: EventList, location_: Loc
     if location_.id_num in game_log_.get_id_log()[:-1]:
         print(location_.brief_description)
     else:
-        print(location_.long_description)
-        _display_items_at_location(game_, location_)
+        print(game_.render_cache.get_or_render((location_.id_num, location_.version, "long"),
+                                               lambda: _render_long_description(game_, location_)))
+
+
+def print_available_actions(game_: AdventureGame, location_: Location) -> None:
+    """
+    Print the menu options together with the actions available at the specified location.
+    """
+    def render() -> str:
+        lines_ = ["What to do? Choose from: look, inventory, stats, score, log, save, pack, hint, quit, drop <item>",
+                  "At this location, you can also:"]
+        lines_.extend(f"- {action_}" for action_ in location_.available_commands)
+        return "\n".join(lines_)
+
+    print(game_.render_cache.get_or_render((location_.id_num, location_.version, "actions"), render))
+
+
+def handle_t_card_puzzle(game_: AdventureGame, player_: Player, location_: Location, item_: Item) -> None:
+    """
+    Handle the special puzzle logic for dropping an item: swiping the T-Card at Bahen
+    spawns the USB Stick at the Exam Center (unless it is already there or carried).
+    """
+    if location_.id_num != 8 or item_.name != "t-card":
+        return
+
+    print("You swipe the T-Card. System Access Granted.")
+    print("A message flashes on the screen: 'USB Stick detected at Exam Center'.")
+    usb_stick_ = game_.get_item("usb stick")
+    if usb_stick_ is None:
+        print("Error: USB Stick not found in game items.")
+        return
+
+    exam_center_ = game_.get_location(12)
+    index_ = game_.get_item_index(player_)
+    if not index_.is_at("usb stick", at_location(12)) and not index_.is_at("usb stick", INVENTORY_HOLDER):
+        exam_center_.items.append("usb stick")
+        exam_center_.available_commands["take usb stick"] = exam_center_.id_num
+        exam_center_.version += 1
+        index_.add("usb stick", at_location(12))
+
+
+def pack_inventory(game_: AdventureGame, player_: Player) -> None:
+    """
+    Handle the 'pack' command: keep the most valuable set of items that fits under the weight limit.
+
+    Considers every item the player carries plus every item that can be taken at the current
+    location, then drops and takes items so that the inventory holds exactly the chosen set.
+    Items already placed where they score (their target location, or required items at OISE)
+    are left where they are.
+    """
+    loc_ = game_.get_location()
+    carried_ = list(player_.inventory.items)
+    on_ground_ = []
+    for item_name_ in loc_.items:
+        item_obj_ = game_.get_item(item_name_)
+        if item_obj_ is None or f"take {item_name_}" not in loc_.available_commands:
+            continue
+        if item_obj_.target_position == loc_.id_num or \
+                (item_name_ in REQUIRED_ITEMS and loc_.id_num == WIN_LOCATION_ID):
+            continue
+        on_ground_.append(item_obj_)
+
+    keep_ = choose_items(carried_ + on_ground_, player_.inventory.weight_limit, set(REQUIRED_ITEMS))
+    to_drop_ = [i_ for i_ in carried_ if i_ not in keep_]
+    to_take_ = [i_ for i_ in on_ground_ if i_ in keep_]
+    if not to_drop_ and not to_take_:
+        print("Your inventory is already packed as well as it can be.")
+        return
+
+    # Drop first so that the freed weight is available for the items being picked up
+    for item_ in to_drop_:
+        game_.drop_item(player_, item_)
+    for item_ in to_take_:
+        game_.take_item(player_, item_)
+
+
+def give_hint(game_: AdventureGame, player_: Player) -> None:
+    """
+    Handle the 'hint' command: print the first action of the fastest way to win from here.
+
+    The answer is a single lookup in the hint table precomputed for the player's stats by policy.py.
+    """
+    table_ = game_.get_hint_table(player_)
+    if table_ is None:
+        print("No hints are available for your stats. (Build the hint tables with: python policy.py)")
+        return
+
+    hint_ = table_.hint(game_, player_)
+    if hint_ is None:
+        print("No hint: there is no known way to submit your assignment from here.")
+        return
+
+    action_, steps_to_win_ = hint_
+    steps_left_ = game_.max_steps - game_.steps
+    print(f"Hint: {action_}")
+    if steps_to_win_ < steps_left_:
+        print(f"The fastest way to submit from here takes {steps_to_win_} more steps ({steps_left_} left).")
+    else:
+        print(f"The fastest way to submit from here takes {steps_to_win_} more steps, "
+              f"but you only have {steps_left_} left.")
+
+
+def _parse_log_filter(filter_: str) -> tuple[Optional[int], Optional[str]]:
+    """
+    Return the (location ID, command) filters in filter_, which looks like
+    "location <id>", "command <command>", or "location <id> command <command>".
+    A filter missing from filter_ is None.
+
+    >>> _parse_log_filter("location 3 command go east")
+    (3, 'go east')
+    >>> _parse_log_filter("command attack")
+    (None, 'attack')
+    >>> _parse_log_filter("")
+    (None, None)
+    """
+    location_id_, command_ = None, None
+    if "command " in filter_:
+        filter_, command_ = filter_.split("command ", 1)
+        command_ = command_.strip()
+    words_ = filter_.split()
+    if len(words_) == 2 and words_[0] == "location" and words_[1].isdigit():
+        location_id_ = int(words_[1])
+    return location_id_, command_
+
+
+def browse_log(game_log_: EventList) -> None:
+    """
+    Let the player page through the events of the game log, optionally only those at one
+    location and/or followed by one command, starting with the most recent page.
+
+    Only the events of the page shown are looked up (see EventList.page), so long logs are
+    never printed or walked in full.
+    """
+    filter_ = input("Filter by 'location <id>' and/or 'command <command>' (Enter for all events): ").strip().lower()
+    location_id_, command_ = _parse_log_filter(filter_)
+    if filter_ and location_id_ is None and command_ is None:
+        print("That is not a valid filter; showing all events.")
+
+    total_ = game_log_.count(location_id_, command_)
+    if total_ == 0:
+        print("No events match.")
+        return
+
+    pages_ = -(-total_ // LOG_PAGE_SIZE)
+    page_num_ = pages_ - 1
+    shown_ = None
+    while True:
+        if page_num_ != shown_:
+            offset_ = page_num_ * LOG_PAGE_SIZE
+            print(f"Events {offset_ + 1}-{min(offset_ + LOG_PAGE_SIZE, total_)} of {total_} "
+                  f"(page {page_num_ + 1} of {pages_}):")
+            for position_, event_ in game_log_.page(offset_, LOG_PAGE_SIZE, location_id_, command_):
+                print(f"#{position_ + 1} Location: {event_.id_num}, Command: {event_.next_command}")
+            shown_ = page_num_
+
+        choice_ = input("[n]ext page, [p]revious page, or Enter to close the log: ").strip().lower()
+        if choice_ == "n" and page_num_ < pages_ - 1:
+            page_num_ += 1
+        elif choice_ == "p" and page_num_ > 0:
+            page_num_ -= 1
+        elif choice_ in ("n", "p"):
+            print("There are no more events that way.")
+        else:
+            return
 
 
 def handle_menu_choices(choice_: str, game_: AdventureGame, player_: Player,
-                        game_log_: EventList, save_file_: str) -> None:
+                        game_log_: EventList, save_file_: str, autosaver_: Optional[Autosaver] = None) -> None:
     """
     Execute 'menu' commands that don't involve movement or direct interaction with the world.
-    (e.g., look, inventory, stats, log, save, quit).
+    (e.g., look, inventory, stats, log, save, pack, hint, quit).
+
+    A save goes through autosaver_, if one is given (see AdventureGame.save_game).
     """
     # Retrieve location inside the function instead of passing it as an argument
     current_loc_ = game_.get_location()
@@ -508,19 +1126,25 @@ def handle_menu_choices(choice_: str, game_: AdventureGame, player_: Player,
     elif choice_ == "stats":
         player_.check_stats()
     elif choice_ == "log":
-        game_log_.display_events()
+        browse_log(game_log_)
     elif choice_ == "save":
-        game_.save_game(save_file_, player_, game_log_)
+        game_.save_game(save_file_, player_, game_log_, autosaver_)
+    elif choice_ == "pack":
+        pack_inventory(game_, player_)
+    elif choice_ == "hint":
+        give_hint(game_, player_)
     elif choice_ == "quit":
         game_.ongoing = False
 
 
-if __name__ == "__main__":
-    import python_ta
-    python_ta.check_all(config={
-        'max-line-length': 120,
-        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
-    })
+def start_game(game_data_file: str = 'game_data.json',
+               save_file: str = 'save_game.sav') -> tuple[AdventureGame, Player, EventList]:
+    """
+    Print the introduction and set up a new game, or continue the one in save_file if the
+    player chooses to, asking the player to spend their stat points in a new game.
+
+    Return the game, the player and the game log, ready for game_loop.
+    """
     print("\n------------------------------------------------------------------")
     print("Welcome to the UofT Adventure!")
     print("GOAL: Find the 3 required items and bring them to OISE (Start Location) to submit your assignment.")
@@ -533,12 +1157,15 @@ if __name__ == "__main__":
                                 current_weight=0)
 
     game_log = EventList()  # This is REQUIRED as one of the baseline requirements
-    game = AdventureGame('game_data.json', 1)  # load data, setting initial location ID to 1
-    menu = ["look", "inventory", "stats", "score", "log", "quit", "save", "drop"]  # Regular menu options
-    save_file = 'save_game.json'
+    game = AdventureGame(game_data_file, 1)  # load data, setting initial location ID to 1
     load_save = False
+    load_file = save_file
+    if not os.path.exists(save_file) and os.path.exists(LEGACY_SAVE_FILE):
+        load_file = LEGACY_SAVE_FILE
 
-    if os.path.exists(save_file):
+    if os.path.exists(load_file) and game.saved_outcome(load_file) is not None:
+        print("The saved game is over; starting a new one.")
+    elif os.path.exists(load_file):
         print("Save file detected.")
         while True:
             start_choice = input("Do you want to overwrite it or continue with it? (overwrite/continue): ")
@@ -551,41 +1178,76 @@ if __name__ == "__main__":
             else:
                 print("Invalid choice.")
 
-    choice = None
     player = Player(start_inventory, skip_stats_selection=load_save)
 
     if load_save:
-        game.load_game(save_file, player, game_log)
+        game.load_game(load_file, player, game_log)
+    return game, player, game_log
+
+
+def run_game(game_data_file: str = 'game_data.json',
+             save_file: str = 'save_game.sav') -> tuple[AdventureGame, Player, EventList]:
+    """
+    Play an interactive game on the console, using the given game data file and save file.
+
+    This is the main game loop; it is run by this module's main block and by the production
+    launcher in play.py. Return the game, the player and the game log once the game is over.
+    """
+    game, player, game_log = start_game(game_data_file, save_file)
+    autosaver = Autosaver(save_file, encode=game.encode_save_data)
+    try:
+        game_loop(game, player, game_log, save_file, autosaver)
+    finally:
+        autosaver.close()
+    return game, player, game_log
 
-    # Note: You may modify the code below as needed; the following starter code is just a suggestion
+
+def game_loop(game: AdventureGame, player: Player, game_log: EventList, save_file: str,
+              autosaver: Optional[Autosaver] = None, world: Optional[WorldTemplate] = None) -> None:
+    """
+    Run the main game loop, reading commands with input(), until the game is no longer ongoing.
+
+    Periodic autosaves are submitted to autosaver, if one is given, and once the game is decided
+    (won or lost, not quit) a final save recording its outcome (see get_outcome), which can no
+    longer be loaded but tells analytics how the session ended. If world is given, the game
+    follows that shared world template and picks up reloads of the game data at the start of
+    each turn. If the game follows a world clock, its due events run at the start of each turn,
+    before any combat. This is separate from run_game so that the loop can also be driven headlessly
+    (e.g. by the fuzzer).
+    """
+    choice = None
+    unwinnable = False
     while game.ongoing:
+        if world is not None:
+            world.sync(game, player)
+        if game.world_clock is not None:
+            game.world_clock.advance(game)
         location = game.get_location()
 
         # Trigger Combat
         if location.enemies:
             enemy_to_fight = game.get_enemy(location.enemies[-1])
             game = combat(player, enemy_to_fight, game, game_log)
+            if not game.ongoing:
+                break  # the player died or ran out of steps in combat
 
         update_game_log(game_log, location, choice)
         print_description(game, game_log, location)
 
         # Display possible actions at this location
-        print("What to do? Choose from: look, inventory, stats, score, log, save, quit, drop <item>")
-        print("At this location, you can also:")
-        for action in location.available_commands:
-            print("-", action)
+        print_available_actions(game, location)
 
         # Validate choice
         choice = input("\nEnter action: ").lower().strip()
-        while choice not in location.available_commands and choice not in menu and not choice.startswith("drop"):
+        while choice not in location.available_commands and choice not in MENU and not choice.startswith("drop"):
             print("That was an invalid option; try again.")
             choice = input("\nEnter action: ").lower().strip()
 
         print("========")
         print("You decided to:", choice)
 
-        if choice in menu:
-            handle_menu_choices(choice, game, player, game_log, save_file)
+        if choice in MENU:
+            handle_menu_choices(choice, game, player, game_log, save_file, autosaver)
         else:
             if choice.startswith("go"):
                 result = location.available_commands[choice]
@@ -593,31 +1255,49 @@ if __name__ == "__main__":
                 game.increment_steps(player)
             elif choice.startswith("take "):
                 requested_item_str = choice.replace("take ", "").strip()
-                if requested_item_str in location.items:
+                if game.get_item_index(player).is_at(requested_item_str, at_location(location.id_num)):
                     requested_item = game.get_item(requested_item_str)  # Use getter
-                    location = player.inventory.take_item(item=requested_item, current_location=location)
-                    game.update_location(location)  # Use setter method
+                    game.take_item(player, requested_item)
                 else:
                     print("No such item here.")
             elif choice.startswith("drop "):
                 requested_item_str = choice.replace("drop ", "").strip()
                 requested_item = game.get_item(requested_item_str)  # Use getter
-                location = player.inventory.drop_item(item=requested_item, current_location=location)
-                game.update_location(location)  # Use setter method
-
-                # Special Puzzle Logic: Drop T-Card at Bahen
-                if location.id_num == 8 and requested_item.name == "t-card":
-                    print("You swipe the T-Card. System Access Granted.")
-                    print("A message flashes on the screen: 'USB Stick detected at Exam Center'.")
-                    if game.get_item("usb stick"):
-                        usb_stick = game.get_item("usb stick")
-                        exam_center = game.get_location(12)
-                        if "usb stick" not in exam_center.items and usb_stick not in player.inventory.items:
-                            exam_center.items.append("usb stick")
-                            exam_center.available_commands["take usb stick"] = exam_center.id_num
-                    else:
-                        print("Error: USB Stick not found in game items.")
+                if game.get_item_index(player).is_at(requested_item_str, INVENTORY_HOLDER):
+                    game.drop_item(player, requested_item)
+
+                    # Special Puzzle Logic: Drop T-Card at Bahen
+                    handle_t_card_puzzle(game, player, location, requested_item)
+                else:
+                    print("You don't have that item.")
 
             # Win Condition Check
             game.check_win(player)
             game.check_steps()
+
+        # End the game as soon as it can no longer be won
+        if game.ongoing:
+            reason = unwinnable_reason(game, player, REQUIRED_ITEMS, WIN_LOCATION_ID)
+            if reason is not None:
+                print(f"\nYou can no longer submit your assignment in time: {reason}.")
+                print("GAME OVER.")
+                game.ongoing = False
+                unwinnable = True
+
+        # Periodic autosave: the snapshot is taken here, the write happens in the background
+        if autosaver is not None and autosaver.tick() and game.ongoing:
+            autosaver.submit(game.to_save_data(player, game_log))
+
+    outcome = game.get_outcome(player, unwinnable)
+    if autosaver is not None and outcome != "quit":
+        autosaver.submit({**game.to_save_data(player, game_log), 'outcome': outcome})
+
+
+if __name__ == "__main__":
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
+
+    run_game()
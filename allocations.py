@@ -0,0 +1,171 @@
+"""CSC111 Project 1: Text Adventure Game - Stat Allocation Report
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module evaluates every legal stat allocation (10 points across speed, attack and
+defense, none above 5) and ranks them, as a quick balance report for designers after a change
+to game_data.json.
+
+Each allocation is evaluated headlessly in two ways:
+    - the fastest possible win, found by the hint table solver in policy.py, which gives the
+      fewest steps to win and the health left at the end of that route,
+    - every shipped walkthrough in simulation.WALKTHROUGHS, replayed with the allocation's
+      stats, which gives a win rate, steps used and health left on scripted play.
+
+Allocations are ranked by whether they can win within the step limit, then by the fewest
+steps to win, then by the most health left, then by walkthrough win rate. Allocations are
+evaluated across a pool of worker processes.
+
+Usage:
+    python allocations.py [--game-data FILE] [--workers N]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import contextlib
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Optional
+
+from adventure import AdventureGame, REQUIRED_ITEMS, WIN_LOCATION_ID
+from policy import WorldModel, optimal_route, solve, stat_allocations
+from simulation import AdventureGameSimulation, WALKTHROUGHS
+
+
+@dataclass
+class WalkthroughResult:
+    """The result of replaying one shipped walkthrough with an allocation's stats.
+
+    Instance Attributes:
+        - name: The walkthrough's name in simulation.WALKTHROUGHS.
+        - outcome: How the game ended (see AdventureGameSimulation.get_outcome).
+        - steps: The number of steps used.
+        - health: The player's health at the end.
+    """
+    name: str
+    outcome: str
+    steps: int
+    health: int
+
+
+@dataclass
+class AllocationReport:
+    """The evaluation of one stat allocation.
+
+    Instance Attributes:
+        - stats: The (speed, attack, defense) allocation.
+        - max_steps: The step limit of the game.
+        - optimal_steps: The fewest steps to win a new game, or None if it cannot be won.
+        - optimal_health: The health left at the end of the fastest win, or None.
+        - optimal_route: The commands of the fastest win (empty if it cannot be won).
+        - walkthroughs: The result of each shipped walkthrough.
+    """
+    stats: tuple[int, int, int]
+    max_steps: int
+    optimal_steps: Optional[int] = None
+    optimal_health: Optional[int] = None
+    optimal_route: list[str] = field(default_factory=list)
+    walkthroughs: list[WalkthroughResult] = field(default_factory=list)
+
+    def wins_in_time(self) -> bool:
+        """Return whether a new game can be won before the step limit."""
+        return self.optimal_steps is not None and self.optimal_steps < self.max_steps
+
+    def win_rate(self) -> float:
+        """Return the fraction of the shipped walkthroughs that win with this allocation."""
+        if not self.walkthroughs:
+            return 0.0
+        return sum(result.outcome == "win" for result in self.walkthroughs) / len(self.walkthroughs)
+
+    def rank_key(self) -> tuple[bool, float, int, float]:
+        """Return the key that orders allocations from best to worst."""
+        return (not self.wins_in_time(),
+                float('inf') if self.optimal_steps is None else self.optimal_steps,
+                -(self.optimal_health or 0),
+                -self.win_rate())
+
+
+def evaluate(game_data_file: str, stats: tuple[int, int, int]) -> AllocationReport:
+    """Evaluate the given (speed, attack, defense) allocation in the world of game_data_file."""
+    game = AdventureGame(game_data_file, 1)
+    report = AllocationReport(stats, game.max_steps)
+
+    model = WorldModel(game, stats, REQUIRED_ITEMS, WIN_LOCATION_ID)
+    policy, _ = solve(model)
+    route = optimal_route(model, policy)
+    if route is not None:
+        report.optimal_route, final_state = route
+        report.optimal_steps = policy[model.start][1]
+        report.optimal_health = final_state[4]
+
+    speed, attack, defense = stats
+    for name, commands in WALKTHROUGHS.items():
+        with contextlib.redirect_stdout(io.StringIO()):
+            sim = AdventureGameSimulation(game_data_file, 1, commands, speed=speed, attack=attack, defense=defense)
+        report.walkthroughs.append(WalkthroughResult(name, sim.get_outcome(), sim.get_steps(),
+                                                     sim.player.current_health))
+    return report
+
+
+def evaluate_all(game_data_file: str, workers: Optional[int] = None) -> list[AllocationReport]:
+    """Evaluate every legal allocation across a pool of worker processes, returning them best first."""
+    allocations = stat_allocations()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        reports = list(pool.map(evaluate, [game_data_file] * len(allocations), allocations))
+    reports.sort(key=AllocationReport.rank_key)
+    return reports
+
+
+def print_report(reports: list[AllocationReport]) -> None:
+    """Print the ranked allocations as a table, followed by the fastest route of the best one."""
+    print(f"{'rank':<6}{'spd/atk/def':<13}{'fastest win':>12}{'HP left':>9}{'walkthrough wins':>18}"
+          f"{'mean steps':>12}{'mean HP':>9}")
+    for rank, report in enumerate(reports, start=1):
+        count = len(report.walkthroughs)
+        fastest = '-' if report.optimal_steps is None else str(report.optimal_steps)
+        if report.optimal_steps is not None and not report.wins_in_time():
+            fastest += '*'
+        print(f"{rank:<6}{'/'.join(map(str, report.stats)):<13}{fastest:>12}"
+              f"{'-' if report.optimal_health is None else report.optimal_health:>9}"
+              f"{f'{round(report.win_rate() * count)}/{count}':>18}"
+              f"{sum(r.steps for r in report.walkthroughs) / count:>12.1f}"
+              f"{sum(r.health for r in report.walkthroughs) / count:>9.1f}")
+    print(f"(* = over the step limit of {reports[0].max_steps})")
+    if reports and reports[0].optimal_route:
+        print(f"\nFastest route for {'/'.join(map(str, reports[0].stats))}: {', '.join(reports[0].optimal_route)}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Rank every stat allocation for the given world.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    start = perf_counter()
+    all_reports = evaluate_all(args.game_data, args.workers)
+    print_report(all_reports)
+    print(f"\nEvaluated {len(all_reports)} allocations in {perf_counter() - start:.2f} s")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
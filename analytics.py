@@ -0,0 +1,422 @@
+"""CSC111 Project 1: Text Adventure Game - Session Analytics
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module aggregates many saved sessions (save files in either format) into
+summary statistics for heatmaps:
+    - visit counts per location,
+    - a location-to-location transition matrix,
+    - usage counts per command,
+    - death counts per location (sessions whose final save records that the player died),
+    - the mean number of events before each item was first taken.
+
+Each session's event log is encoded as two integer arrays (location indices and command
+indices), a chunk of sessions is concatenated, and every statistic is computed with
+vectorized NumPy operations over the chunk. Chunks are processed in parallel across
+worker processes and their partial sums are added together. The result is written as a
+compressed .npz file.
+
+This module requires NumPy.
+
+Usage:
+    python analytics.py SESSION_DIR [--out summary.npz] [--workers N]
+    python analytics.py --benchmark [--sessions 100000]
+    python analytics.py --check         Check the analytics of real game runs
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from itertools import repeat
+from typing import Iterator, Optional
+
+import numpy as np
+
+from adventure import AdventureGame, MENU
+from autosave import CorruptSaveError
+from save_format import WorldMismatchError, load_save_data
+
+# The file extensions of saved sessions.
+SESSION_EXTENSIONS = ('.sav', '.json')
+
+# The number of session files handled by one worker task.
+CHUNK_SIZE = 500
+
+# Command index used for commands outside the vocabulary (and for the final event, which has none).
+OTHER_COMMAND = 0
+
+
+@dataclass
+class Vocabulary:
+    """The integer encoding of locations and commands, derived from the game data so that every
+    worker process computes the same encoding.
+
+    Instance Attributes:
+        - location_ids: The location ID for each location index.
+        - location_index: The location index for each location ID.
+        - commands: The command for each command index; index OTHER_COMMAND is "<other>".
+        - command_index: The command index for each command.
+        - take_commands: The command index of "take <item>" for each item, in item order.
+        - items: The item names, in the same order as take_commands.
+    """
+    location_ids: list[int]
+    location_index: dict[int, int]
+    commands: list[str]
+    command_index: dict[str, int]
+    take_commands: list[int]
+    items: list[str]
+
+
+def build_vocabulary(game: AdventureGame) -> Vocabulary:
+    """Return the encoding of the locations and commands of the given game's world."""
+    location_ids = sorted(game.get_initial_world())
+    items = sorted(game.get_item_names())
+
+    commands = ["<other>"] + list(MENU) + ["attack", "flee", "inventory"]
+    for loc_id in location_ids:
+        commands.extend(command for command in game.get_location(loc_id).available_commands
+                        if command.startswith("go "))
+    commands.extend(f"take {item}" for item in items)
+    commands.extend(f"drop {item}" for item in items)
+    commands.extend(items)  # item names typed when using an item in combat
+    commands = list(dict.fromkeys(commands))  # remove duplicates, keeping order
+    command_index = {command: i for i, command in enumerate(commands)}
+
+    return Vocabulary(location_ids=location_ids,
+                      location_index={loc_id: i for i, loc_id in enumerate(location_ids)},
+                      commands=commands,
+                      command_index=command_index,
+                      take_commands=[command_index[f"take {item}"] for item in items],
+                      items=items)
+
+
+@dataclass
+class Summary:
+    """Aggregate statistics over a set of sessions. Summaries of disjoint sets of sessions can be added.
+
+    Instance Attributes:
+        - sessions: The number of sessions.
+        - events: The total number of events.
+        - visits: visits[i] is the number of events at location index i.
+        - transitions: transitions[i, j] is the number of times an event at location index i
+          was directly followed by one at location index j.
+        - commands: commands[c] is the number of times command index c was used.
+        - deaths: deaths[i] is the number of sessions that ended in death at location index i.
+        - item_time_sum: item_time_sum[k] is the total, over sessions that took item k, of the
+          event index at which it was first taken.
+        - item_time_count: item_time_count[k] is the number of sessions that took item k.
+    """
+    sessions: int
+    events: int
+    visits: np.ndarray
+    transitions: np.ndarray
+    commands: np.ndarray
+    deaths: np.ndarray
+    item_time_sum: np.ndarray
+    item_time_count: np.ndarray
+
+    @staticmethod
+    def empty(vocab: Vocabulary) -> Summary:
+        """Return the summary of no sessions."""
+        n_locations = len(vocab.location_ids)
+        return Summary(0, 0,
+                       np.zeros(n_locations, dtype=np.int64),
+                       np.zeros((n_locations, n_locations), dtype=np.int64),
+                       np.zeros(len(vocab.commands), dtype=np.int64),
+                       np.zeros(n_locations, dtype=np.int64),
+                       np.zeros(len(vocab.items), dtype=np.int64),
+                       np.zeros(len(vocab.items), dtype=np.int64))
+
+    def __add__(self, other: Summary) -> Summary:
+        return Summary(self.sessions + other.sessions, self.events + other.events,
+                       self.visits + other.visits, self.transitions + other.transitions,
+                       self.commands + other.commands, self.deaths + other.deaths,
+                       self.item_time_sum + other.item_time_sum, self.item_time_count + other.item_time_count)
+
+    def mean_time_to_item(self) -> np.ndarray:
+        """Return the mean event index at which each item was first taken (NaN if never taken)."""
+        with np.errstate(invalid='ignore', divide='ignore'):
+            return self.item_time_sum / self.item_time_count
+
+
+def encode_session(data: dict, vocab: Vocabulary) -> tuple[np.ndarray, np.ndarray, bool]:
+    """Return (location indices, command indices, whether the player died) for the given save data.
+
+    The player died if the session's final save records it (see AdventureGame.get_outcome).
+    Events at locations outside the vocabulary are dropped.
+    """
+    log = data['log']
+    location_index = vocab.location_index
+    command_index = vocab.command_index
+    locations = np.fromiter((location_index.get(event['id_num'], -1) for event in log), dtype=np.int32,
+                            count=len(log))
+    commands = np.fromiter((command_index.get(event['next_command'], OTHER_COMMAND) for event in log),
+                           dtype=np.int32, count=len(log))
+    keep = locations >= 0
+    return locations[keep], commands[keep], data.get('outcome') == "dead"
+
+
+def summarize_arrays(sessions: list[tuple[np.ndarray, np.ndarray, bool]], vocab: Vocabulary) -> Summary:
+    """Return the summary of the given encoded sessions, computed over their concatenation."""
+    summary = Summary.empty(vocab)
+    sessions = [session for session in sessions if len(session[0]) > 0]
+    if not sessions:
+        return summary
+
+    n_locations = len(vocab.location_ids)
+    n_commands = len(vocab.commands)
+    lengths = np.fromiter((len(session[0]) for session in sessions), dtype=np.int64, count=len(sessions))
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    locations = np.concatenate([session[0] for session in sessions]).astype(np.int64)
+    commands = np.concatenate([session[1] for session in sessions]).astype(np.int64)
+    session_of_event = np.repeat(np.arange(len(sessions)), lengths)
+
+    summary.sessions = len(sessions)
+    summary.events = int(lengths.sum())
+    summary.visits = np.bincount(locations, minlength=n_locations)
+    summary.commands = np.bincount(commands, minlength=n_commands)
+
+    # Transitions between consecutive events of the same session
+    same_session = session_of_event[:-1] == session_of_event[1:]
+    pairs = locations[:-1][same_session] * n_locations + locations[1:][same_session]
+    summary.transitions = np.bincount(pairs, minlength=n_locations * n_locations).reshape(n_locations, n_locations)
+
+    # A session's death location is the location of its last event
+    died = np.fromiter((session[2] for session in sessions), dtype=bool, count=len(sessions))
+    last_locations = locations[starts + lengths - 1]
+    summary.deaths = np.bincount(last_locations[died], minlength=n_locations)
+
+    # Time to item: the first event index (within its session) at which each item was taken
+    take_to_item = np.full(n_commands, -1, dtype=np.int64)
+    take_to_item[vocab.take_commands] = np.arange(len(vocab.items))
+    item_of_event = take_to_item[commands]
+    takes = np.flatnonzero(item_of_event >= 0)
+    if takes.size:
+        keys = session_of_event[takes] * len(vocab.items) + item_of_event[takes]
+        _, first = np.unique(keys, return_index=True)
+        first_takes = takes[first]
+        items = item_of_event[first_takes]
+        times = first_takes - starts[session_of_event[first_takes]]
+        summary.item_time_sum = np.bincount(items, weights=times, minlength=len(vocab.items)).astype(np.int64)
+        summary.item_time_count = np.bincount(items, minlength=len(vocab.items))
+    return summary
+
+
+def iter_session_files(directory: str) -> Iterator[str]:
+    """Yield the path of every saved session in directory."""
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(SESSION_EXTENSIONS):
+                yield entry.path
+
+
+_worker_game = None
+
+
+def _summarize_files(paths: list[str], game_data_file: str) -> Summary:
+    """Load, encode and summarize the given session files. Run in a worker process."""
+    global _worker_game
+    if _worker_game is None:
+        _worker_game = AdventureGame(game_data_file, 1)
+    game = _worker_game
+    vocab = build_vocabulary(game)
+
+    sessions = []
+    for path in paths:
+        try:
+            data = load_save_data(path, game.get_initial_world(), {}, game.world_hash)
+            sessions.append(encode_session(data, vocab))
+        except (CorruptSaveError, WorldMismatchError, OSError, KeyError, TypeError, ValueError):
+            continue  # not a save file of this world: skipped rather than failing the whole chunk
+    return summarize_arrays(sessions, vocab)
+
+
+def _chunks(paths: Iterator[str], size: int) -> Iterator[list[str]]:
+    """Yield lists of up to size consecutive paths."""
+    chunk = []
+    for path in paths:
+        chunk.append(path)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def analyze(session_dir: str, game_data_file: str, workers: Optional[int] = None) -> Summary:
+    """Return the summary of every saved session in session_dir, computed across worker processes."""
+    vocab = build_vocabulary(AdventureGame(game_data_file, 1))
+    total = Summary.empty(vocab)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for partial in pool.map(_summarize_files, _chunks(iter_session_files(session_dir), CHUNK_SIZE),
+                                repeat(game_data_file)):
+            total = total + partial
+    return total
+
+
+def write_summary(summary: Summary, vocab: Vocabulary, filename: str) -> None:
+    """Write the given summary, with the labels needed to read it, to filename as a compressed .npz file."""
+    np.savez_compressed(filename,
+                        sessions=summary.sessions,
+                        events=summary.events,
+                        location_ids=np.array(vocab.location_ids),
+                        commands=np.array(vocab.commands),
+                        items=np.array(vocab.items),
+                        visits=summary.visits,
+                        transitions=summary.transitions,
+                        command_counts=summary.commands,
+                        deaths=summary.deaths,
+                        mean_time_to_item=summary.mean_time_to_item(),
+                        item_take_counts=summary.item_time_count)
+
+
+def make_synthetic_corpus(directory: str, sessions: int, game_data_file: str, seed: int = 0,
+                          mean_length: int = 60) -> None:
+    """Write the given number of synthetic saved sessions (random walks) to directory, in the compact format."""
+    import random
+    from adventure import update_game_log
+    from event_logger import EventList
+    from game_entities import Inventory, Player
+
+    os.makedirs(directory, exist_ok=True)
+    rng = random.Random(seed)
+    game = AdventureGame(game_data_file, 1)
+    player = Player(Inventory([], 10, 0.0), skip_stats_selection=True)
+    items = game.get_item_names()
+
+    for n in range(sessions):
+        log = EventList()
+        location = game.get_location(1)
+        for _ in range(max(1, int(rng.expovariate(1 / mean_length)))):
+            roll = rng.random()
+            if roll < 0.7:
+                command = rng.choice([c for c in location.available_commands if c.startswith("go ")])
+            elif roll < 0.85:
+                command = rng.choice(["attack", "inventory", "look", "stats"])
+            else:
+                command = "take " + rng.choice(items)
+            update_game_log(log, location, command)
+            if command.startswith("go "):
+                location = game.get_location(location.available_commands[command])
+        update_game_log(log, location, None)
+
+        game.current_location_id = location.id_num
+        data = game.to_save_data(player, log)
+        if rng.random() < 0.2:
+            data['player']['current_health'] = 0
+            data['outcome'] = "dead"
+        with open(os.path.join(directory, f"session{n:07d}.sav"), 'wb') as f:
+            f.write(game.encode_save_data(data))
+
+
+def check_recorded_outcomes(game_data_file: str) -> list[str]:
+    """Play real games through the game loop, autosaving into a session directory as run_game
+    does, and return every way in which their analytics disagree with how they ended.
+
+    One player dies fighting the Stressed Out Student and one quits; a save file without an event
+    log is also in the directory, and must be skipped.
+    """
+    import contextlib
+    import json
+    import tempfile
+    from unittest.mock import patch
+    from adventure import game_loop
+    from autosave import Autosaver
+    from event_logger import EventList
+    from game_entities import Inventory, Player
+
+    failures = []
+    runs = [("dead", (5, 1, 1), ["go south", "auto"]), ("quit", (5, 5, 0), ["go east", "quit"])]
+    with tempfile.TemporaryDirectory() as session_dir, open(os.devnull, 'w') as devnull:
+        for outcome, (speed, attack, defense), script in runs:
+            game = AdventureGame(game_data_file, 1)
+            player = Player(Inventory([], 10, 0.0), speed, attack, defense, skip_stats_selection=True)
+            save_file = os.path.join(session_dir, f"{outcome}.sav")
+            autosaver = Autosaver(save_file, interval_turns=1, encode=game.encode_save_data)
+            with patch('builtins.input', side_effect=script), contextlib.redirect_stdout(devnull):
+                game_loop(game, player, EventList(), save_file, autosaver)
+            autosaver.close()
+            if game.get_outcome(player) != outcome:
+                failures.append(f"the {outcome} run ended as {game.get_outcome(player)}")
+            saved = game.saved_outcome(save_file)
+            if saved != (None if outcome == "quit" else outcome):
+                failures.append(f"the {outcome} run's save records the outcome {saved}")
+        with open(os.path.join(session_dir, "no_log.json"), 'w') as f:
+            json.dump({'location_id': 1, 'player': {'current_health': 0}}, f)
+
+        vocab = build_vocabulary(AdventureGame(game_data_file, 1))
+        summary = _summarize_files(list(iter_session_files(session_dir)), game_data_file)
+        deaths = {vocab.location_ids[i]: int(count) for i, count in enumerate(summary.deaths) if count}
+        if summary.sessions != len(runs):
+            failures.append(f"{summary.sessions} sessions summarized, not {len(runs)}")
+        if deaths != {4: 1}:
+            failures.append(f"deaths counted at {deaths}, not one at location 4")
+    return failures
+
+
+def benchmark(sessions: int = 100_000, workers: Optional[int] = None, directory: Optional[str] = None) -> None:
+    """Generate a synthetic corpus of the given number of sessions, analyze it and print the throughput."""
+    import tempfile
+    from time import perf_counter
+
+    data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        corpus_dir = directory or temp_dir
+        start = perf_counter()
+        make_synthetic_corpus(corpus_dir, sessions, data_file)
+        print(f"Generated {sessions} sessions in {perf_counter() - start:.1f} s")
+
+        start = perf_counter()
+        summary = analyze(corpus_dir, data_file, workers)
+        elapsed = perf_counter() - start
+        print(f"Analyzed {summary.sessions} sessions ({summary.events} events) in {elapsed:.2f} s: "
+              f"{summary.sessions / elapsed:.0f} sessions/s, {summary.events / elapsed:.0f} events/s")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Aggregate saved sessions into heatmap statistics.")
+    parser.add_argument("session_dir", nargs="?")
+    parser.add_argument("--out", default="summary.npz")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--check", action="store_true", help="check the analytics of real game runs")
+    args = parser.parse_args()
+
+    if args.check:
+        outcome_failures = check_recorded_outcomes(os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                                "game_data.json"))
+        print(f"Outcomes of real game runs: {len(outcome_failures)} failures")
+        for failure in outcome_failures:
+            print("   ", failure)
+    elif args.benchmark:
+        benchmark(args.sessions, args.workers)
+    elif args.session_dir:
+        data_path = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+        result = analyze(args.session_dir, data_path, args.workers)
+        write_summary(result, build_vocabulary(AdventureGame(data_path, 1)), args.out)
+        print(f"Summarized {result.sessions} sessions ({result.events} events) into {args.out}")
+    else:
+        parser.print_usage()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
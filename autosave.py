@@ -0,0 +1,254 @@
+"""CSC111 Project 1: Text Adventure Game - Autosave
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains atomic, checksummed save file writing and a background
+autosaver. The game thread captures a snapshot of the game state (a plain dictionary)
+and the autosaver serializes and writes it on a separate thread, so a save in flight
+never blocks a turn. A manual save to the same file goes through the autosaver too, so that
+an older snapshot still being written can never replace it.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from typing import Callable, Optional
+
+# Number of turns between automatic saves.
+AUTOSAVE_INTERVAL_TURNS = 5
+
+
+class CorruptSaveError(Exception):
+    """Raised when a save file cannot be parsed or its checksum does not match its contents."""
+
+
+def compute_checksum(data: dict) -> str:
+    """Return the SHA-256 checksum of the given save data, ignoring any existing 'checksum' key.
+
+    The checksum is taken over a canonical JSON encoding, so it does not depend on key order
+    or indentation.
+
+    >>> compute_checksum({'steps': 1, 'location_id': 2}) == compute_checksum({'location_id': 2, 'steps': 1})
+    True
+    >>> compute_checksum({'steps': 1}) == compute_checksum({'steps': 1, 'checksum': 'abc'})
+    True
+    """
+    payload = {key: value for key, value in data.items() if key != 'checksum'}
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def write_bytes_atomically(filename: str, contents: bytes) -> None:
+    """Write contents to filename so that a crash leaves either the old file or the new one, never a mix.
+
+    The contents are written to a temporary file in the same directory, flushed to disk,
+    and then renamed over filename.
+    """
+    directory = os.path.dirname(os.path.abspath(filename))
+    fd, temp_path = tempfile.mkstemp(prefix='.save-', suffix='.tmp', dir=directory)
+    try:
+        # mkstemp creates the file readable only by its owner; give it the usual permissions instead
+        os.chmod(temp_path, os.stat(filename).st_mode & 0o777 if os.path.exists(filename) else 0o644)
+        with os.fdopen(fd, 'wb') as f:
+            f.write(contents)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def encode_json_save(data: dict) -> bytes:
+    """Return the given save data encoded as pretty-printed JSON, together with its checksum."""
+    contents = dict(data)
+    contents['checksum'] = compute_checksum(data)
+    return json.dumps(contents, indent=4).encode('utf-8')
+
+
+def parse_json_save(contents: bytes, filename: str = "save file") -> dict:
+    """Return the save data encoded in the given JSON save file contents.
+
+    Save files written before checksums were added have no 'checksum' key and are accepted as-is.
+
+    Raises CorruptSaveError if the contents are not valid JSON or the checksum does not match.
+
+    >>> parse_json_save(encode_json_save({'steps': 3}))['steps']
+    3
+    >>> parse_json_save(encode_json_save({'steps': 3}).replace(b'3', b'4'))
+    Traceback (most recent call last):
+    autosave.CorruptSaveError: save file failed its checksum; it may have been modified or partially written.
+    """
+    try:
+        data = json.loads(contents.decode('utf-8'))
+    except (json.JSONDecodeError, UnicodeDecodeError) as error:
+        raise CorruptSaveError(f"{filename} is not a valid save file: {error}") from error
+
+    if not isinstance(data, dict):
+        raise CorruptSaveError(f"{filename} is not a valid save file.")
+    if 'checksum' in data and data['checksum'] != compute_checksum(data):
+        raise CorruptSaveError(f"{filename} failed its checksum; it may have been modified or partially written.")
+    return data
+
+
+def write_save_file(filename: str, data: dict) -> None:
+    """Atomically write the given save data to filename as JSON, together with its checksum."""
+    write_bytes_atomically(filename, encode_json_save(data))
+
+
+def read_save_file(filename: str) -> dict:
+    """Return the save data stored in the JSON save file filename.
+
+    Raises CorruptSaveError if the file is not valid JSON or its checksum does not match.
+    """
+    with open(filename, 'rb') as f:
+        return parse_json_save(f.read(), filename)
+
+
+class Autosaver:
+    """Writes snapshots of the game state to a save file on a background thread.
+
+    Only the most recent snapshot matters, so if a new snapshot is submitted while an older
+    one is still waiting to be written, the older one is discarded; and a snapshot is never
+    written over a newer one, whether submitted or saved at once with save_now.
+
+    Instance Attributes:
+        - filename: The save file that snapshots are written to.
+        - interval_turns: The number of turns between automatic saves.
+        - encode: The function turning a snapshot into the bytes written to the save file.
+        - saves_completed: The number of snapshots written so far.
+        - last_error: The error raised by the most recent failed write, or None.
+
+    Representation Invariants:
+        - self.interval_turns > 0
+    """
+    filename: str
+    interval_turns: int
+    encode: Callable[[dict], bytes]
+    saves_completed: int
+    last_error: Optional[Exception]
+
+    # Private Instance Attributes:
+    #   - _turns: the number of turns since the last automatic save.
+    #   - _snapshots: the number of snapshots submitted or saved so far, which numbers them in order.
+    #   - _pending: the number and contents of the next snapshot to write, or None if there is nothing to write.
+    #   - _written: the number of the newest snapshot written so far, or 0 if there is none.
+    #   - _closing: whether close() has been called.
+    #   - _condition: guards _snapshots, _pending and _closing and wakes the writer thread.
+    #   - _write_lock: held while a snapshot is written, and guards _written.
+    #   - _thread: the background writer thread.
+    _turns: int
+    _snapshots: int
+    _pending: Optional[tuple[int, dict]]
+    _written: int
+    _closing: bool
+    _condition: threading.Condition
+    _write_lock: threading.Lock
+    _thread: threading.Thread
+
+    def __init__(self, filename: str, interval_turns: int = AUTOSAVE_INTERVAL_TURNS,
+                 encode: Callable[[dict], bytes] = encode_json_save) -> None:
+        self.filename = filename
+        self.interval_turns = interval_turns
+        self.encode = encode
+        self.saves_completed = 0
+        self.last_error = None
+
+        self._turns = 0
+        self._snapshots = 0
+        self._pending = None
+        self._written = 0
+        self._closing = False
+        self._condition = threading.Condition()
+        self._write_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name='autosave', daemon=True)
+        self._thread.start()
+
+    def tick(self) -> bool:
+        """Record that a turn has passed and return whether an automatic save is due."""
+        self._turns += 1
+        if self._turns >= self.interval_turns:
+            self._turns = 0
+            return True
+        return False
+
+    def submit(self, snapshot: dict) -> None:
+        """Queue the given snapshot to be written in the background, replacing any unwritten one.
+
+        The snapshot must not share mutable objects with the live game state, since it is
+        serialized on another thread.
+        """
+        with self._condition:
+            self._snapshots += 1
+            self._pending = (self._snapshots, snapshot)
+            self._condition.notify()
+
+    def save_now(self, snapshot: dict) -> None:
+        """Write the given snapshot on the calling thread, returning once it is written.
+
+        Any unwritten snapshot is discarded, and one being written by the background thread
+        either finishes first or is not written at all, so this one is never replaced by an
+        older one. Errors are raised, rather than recorded in last_error.
+        """
+        with self._condition:
+            self._snapshots += 1
+            number = self._snapshots
+            self._pending = None
+        self._write(number, snapshot)
+
+    def close(self) -> None:
+        """Write any pending snapshot and stop the background thread."""
+        with self._condition:
+            self._closing = True
+            self._condition.notify()
+        self._thread.join()
+
+    def _run(self) -> None:
+        """Write snapshots as they are submitted until close() is called."""
+        while True:
+            with self._condition:
+                while self._pending is None and not self._closing:
+                    self._condition.wait()
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    return
+
+            try:
+                self._write(*pending)
+            except Exception as error:  # e.g. a full disk or an unencodable snapshot: keep saving later ones
+                self.last_error = error
+
+    def _write(self, number: int, snapshot: dict) -> None:
+        """Encode and write the snapshot with the given number, unless a newer one was already written."""
+        with self._write_lock:
+            if number < self._written:
+                return
+            write_bytes_atomically(self.filename, self.encode(snapshot))
+            self._written = number
+            self.saves_completed += 1
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
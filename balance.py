@@ -0,0 +1,320 @@
+"""CSC111 Project 1: Text Adventure Game - Enemy Balance Tuner
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module searches enemy stats (max_health, attack and attack_pattern) in
+game_data.json for values that meet a designer's target difficulty, and writes a proposed
+game data file together with a report of what changed.
+
+Difficulty is measured against the median build: for every legal stat allocation that can
+attack (see policy.stat_allocations), a fight is resolved with the game's combat rules, in
+which the player attacks every turn, the killing blow ends the fight, and each earlier turn
+the enemy deals max(deal_damage(turn) - defense, 1). Two metrics are taken as the median
+over those builds:
+    - turns_to_kill: the number of player turns needed to defeat the enemy,
+    - hp_loss: the health the player loses, capped at their maximum health.
+
+Every candidate (max_health, attack, attack_pattern) in the search space is scored at once
+with NumPy, over all builds together, in chunks spread across a pool of worker processes.
+The best candidate minimizes the squared relative error to the targets; ties go to the
+candidate closest to the enemy's current stats.
+
+Targets are a JSON file mapping enemy names to their target metrics, for example
+{"Barista": {"turns_to_kill": 3, "hp_loss": 2}}. Enemies that are not listed are unchanged.
+
+Usage:
+    python balance.py --current                     Print the current metrics, in the targets format.
+    python balance.py TARGETS [--out FILE] [--workers N]
+                                                    Tune the enemies and write the proposed game data.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import difflib
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from itertools import product
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+
+from policy import stat_allocations
+
+# The search space for each enemy.
+HEALTH_RANGE = range(1, 101)
+ATTACK_RANGE = range(1, 21)
+MAX_PATTERN_LENGTH = 4
+
+# The player's health at the start of a fight (Player's default max_health).
+PLAYER_HEALTH = 10
+
+# Weight of the distance from the enemy's current stats in the score; small enough to only break ties.
+CHANGE_WEIGHT = 1e-3
+
+# The number of candidates scored per worker task.
+CHUNK_SIZE = 20_000
+
+
+def pattern_table() -> tuple[list[list[str]], np.ndarray, np.ndarray]:
+    """Return every attack pattern up to MAX_PATTERN_LENGTH, with a (patterns, MAX_PATTERN_LENGTH)
+    array marking its "big" attacks and an array of its lengths.
+
+    >>> patterns, big, lengths = pattern_table()
+    >>> len(patterns), big.shape, int(lengths.max())
+    (30, (30, 4), 4)
+    """
+    patterns = [list(pattern) for length in range(1, MAX_PATTERN_LENGTH + 1)
+                for pattern in product(["small", "big"], repeat=length)]
+    big = np.zeros((len(patterns), MAX_PATTERN_LENGTH), dtype=bool)
+    for i, pattern in enumerate(patterns):
+        big[i, :len(pattern)] = [attack == "big" for attack in pattern]
+    return patterns, big, np.array([len(pattern) for pattern in patterns])
+
+
+def reference_builds() -> tuple[np.ndarray, np.ndarray]:
+    """Return the attack and defense of every legal stat allocation that can attack."""
+    builds = [(attack, defense) for _, attack, defense in stat_allocations() if attack > 0]
+    return np.array([b[0] for b in builds]), np.array([b[1] for b in builds])
+
+
+def fight_metrics(max_health: np.ndarray, attack: np.ndarray, big: np.ndarray, lengths: np.ndarray,
+                  build_attack: np.ndarray, build_defense: np.ndarray,
+                  player_health: int = PLAYER_HEALTH) -> tuple[np.ndarray, np.ndarray]:
+    """Return (turns to kill, health lost), each of shape (candidates, builds), for fights between
+    every candidate enemy and every build.
+
+    Candidate i has max_health[i], attack[i] and the attack pattern given by the first lengths[i]
+    entries of big[i]. This is Enemy.fight_outcome, vectorized over candidates and builds.
+    """
+    turns_to_kill = -(-max_health[:, None] // build_attack[None, :])
+    enemy_turns = turns_to_kill - 1
+
+    # Damage of each pattern position against each build: Enemy.deal_damage, then the combat formula
+    per_turn = np.where(big, attack[:, None], -(-attack[:, None] // 2))
+    damage = np.maximum(per_turn[:, None, :] - build_defense[None, :, None], 1)
+    damage = np.where(np.arange(big.shape[1]) < lengths[:, None, None], damage, 0)
+    prefix = np.concatenate([np.zeros(damage.shape[:2] + (1,), dtype=damage.dtype),
+                             np.cumsum(damage, axis=2)], axis=2)
+
+    cycle_damage = np.take_along_axis(prefix, np.broadcast_to(lengths[:, None, None], damage.shape[:2] + (1,)),
+                                      axis=2)[..., 0]
+    full_cycles, remainder = np.divmod(enemy_turns, lengths[:, None])
+    total = full_cycles * cycle_damage + np.take_along_axis(prefix, remainder[..., None], axis=2)[..., 0]
+    return turns_to_kill, np.minimum(total, player_health)
+
+
+def _check_against_fight_outcome(samples: int = 500, seed: int = 0) -> bool:
+    """Return whether fight_metrics agrees with Enemy.fight_outcome on random enemies and builds.
+
+    >>> _check_against_fight_outcome()
+    True
+    """
+    from game_entities import Enemy
+
+    rng = np.random.default_rng(seed)
+    patterns, big, lengths = pattern_table()
+    build_attack, build_defense = reference_builds()
+    health = rng.integers(1, 101, samples)
+    attack = rng.integers(1, 21, samples)
+    pattern = rng.integers(0, len(patterns), samples)
+    turns, loss = fight_metrics(health, attack, big[pattern], lengths[pattern], build_attack, build_defense)
+
+    for i in range(samples):
+        for j in range(len(build_attack)):
+            enemy = Enemy("x", int(health[i]), int(health[i]), int(attack[i]), patterns[pattern[i]], [])
+            outcome = enemy.fight_outcome(int(build_attack[j]), int(build_defense[j]), PLAYER_HEALTH)
+            if outcome.damage_taken != loss[i, j] or (outcome.player_survives and outcome.player_turns != turns[i, j]):
+                return False
+    return True
+
+
+def enemy_metrics(enemy: dict) -> tuple[float, float]:
+    """Return the median (turns to kill, health lost) of the given enemy's game data entry.
+
+    >>> enemy_metrics({"max_health": 8, "attack": 3, "attack_pattern": ["small", "big"]})
+    (2.0, 1.5)
+    """
+    patterns, big, lengths = pattern_table()
+    index = patterns.index(enemy['attack_pattern'])
+    turns, loss = fight_metrics(np.array([enemy['max_health']]), np.array([enemy['attack']]),
+                                big[index:index + 1], lengths[index:index + 1], *reference_builds())
+    return float(np.median(turns)), float(np.median(loss))
+
+
+@dataclass
+class Candidate:
+    """The best candidate found for one enemy.
+
+    Instance Attributes:
+        - score: The candidate's score; lower is better.
+        - max_health: The candidate's max_health.
+        - attack: The candidate's attack.
+        - attack_pattern: The candidate's attack_pattern.
+    """
+    score: float
+    max_health: int
+    attack: int
+    attack_pattern: list[str]
+
+
+def _search_chunk(enemy: dict, target: dict, start: int, stop: int) -> Candidate:
+    """Score candidates start to stop of the search space for enemy against target, returning the best."""
+    patterns, big, lengths = pattern_table()
+    shape = (len(HEALTH_RANGE), len(ATTACK_RANGE), len(patterns))
+    health_i, attack_i, pattern_i = np.unravel_index(np.arange(start, stop), shape)
+    health = np.asarray(HEALTH_RANGE)[health_i]
+    attack = np.asarray(ATTACK_RANGE)[attack_i]
+
+    turns, loss = fight_metrics(health, attack, big[pattern_i], lengths[pattern_i], *reference_builds())
+    target_turns, target_loss = target['turns_to_kill'], target['hp_loss']
+    error = ((np.median(turns, axis=1) - target_turns) / max(target_turns, 1)) ** 2 + \
+        ((np.median(loss, axis=1) - target_loss) / max(target_loss, 1)) ** 2
+    change = np.abs(health - enemy['max_health']) / enemy['max_health'] + \
+        np.abs(attack - enemy['attack']) / max(enemy['attack'], 1) + \
+        (pattern_i != patterns.index(enemy['attack_pattern']))
+    score = error + CHANGE_WEIGHT * change
+
+    best = int(np.argmin(score))
+    return Candidate(float(score[best]), int(health[best]), int(attack[best]), patterns[pattern_i[best]])
+
+
+@dataclass
+class TuningResult:
+    """The result of tuning the enemies of a game data file.
+
+    Instance Attributes:
+        - enemies: The proposed enemies section of the game data.
+        - before: The (turns to kill, health lost) of each tuned enemy before tuning.
+        - after: The same metrics after tuning.
+        - targets: The target metrics of each tuned enemy.
+        - candidates: The number of candidate configurations scored.
+        - seconds: The time taken by the search.
+    """
+    enemies: list[dict]
+    before: dict[str, tuple[float, float]] = field(default_factory=dict)
+    after: dict[str, tuple[float, float]] = field(default_factory=dict)
+    targets: dict[str, dict] = field(default_factory=dict)
+    candidates: int = 0
+    seconds: float = 0.0
+
+
+def tune(enemies: list[dict], targets: dict[str, dict], workers: Optional[int] = None,
+         chunk_size: int = CHUNK_SIZE) -> TuningResult:
+    """Return the enemies with the stats of each enemy named in targets tuned to meet its targets.
+
+    Raises ValueError if targets names an enemy that is not in enemies.
+    """
+    by_name = {enemy['name']: enemy for enemy in enemies}
+    unknown = set(targets) - set(by_name)
+    if unknown:
+        raise ValueError(f"Unknown enemies in targets: {', '.join(sorted(unknown))}")
+
+    space = len(HEALTH_RANGE) * len(ATTACK_RANGE) * len(pattern_table()[0])
+    jobs = [(name, start, min(start + chunk_size, space)) for name in targets for start in range(0, space, chunk_size)]
+    result = TuningResult([dict(enemy) for enemy in enemies], targets=dict(targets))
+
+    start_time = perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        chunks = pool.map(_search_chunk, [by_name[name] for name, _, _ in jobs], [targets[name] for name, _, _ in jobs],
+                          [job[1] for job in jobs], [job[2] for job in jobs])
+        best = {}
+        for (name, _, _), candidate in zip(jobs, chunks):
+            if name not in best or candidate.score < best[name].score:
+                best[name] = candidate
+    result.seconds = perf_counter() - start_time
+    result.candidates = space * len(targets)
+
+    for enemy in result.enemies:
+        if enemy['name'] in best:
+            result.before[enemy['name']] = enemy_metrics(enemy)
+            candidate = best[enemy['name']]
+            enemy.update(max_health=candidate.max_health, current_health=candidate.max_health,
+                         attack=candidate.attack, attack_pattern=candidate.attack_pattern)
+            result.after[enemy['name']] = enemy_metrics(enemy)
+    return result
+
+
+def replace_enemies(game_data_text: str, enemies: list[dict]) -> str:
+    """Return game_data_text with its top-level "enemies" list replaced by enemies.
+
+    The rest of the file is left exactly as it was, so that a diff shows only the tuned stats.
+    """
+    start = game_data_text.index('\n  "enemies": [') + 1
+    end = game_data_text.index('\n  ]', start) + len('\n  ]')
+    section = '"enemies": ' + json.dumps(enemies, indent=2, ensure_ascii=False).replace('\n', '\n  ')
+    return game_data_text[:start] + '  ' + section + game_data_text[end:]
+
+
+def diff_report(result: TuningResult, original_text: str, proposed_text: str, proposed_name: str) -> str:
+    """Return a report of the tuning: each enemy's metrics against its targets, then a unified diff."""
+    lines = [f"Scored {result.candidates} candidates in {result.seconds:.2f} s "
+             f"({result.candidates / result.seconds:,.0f} candidates/s)", ""]
+    lines.append(f"{'enemy':<24}{'turns to kill':>22}{'HP lost':>22}")
+    for name, (turns_before, loss_before) in result.before.items():
+        turns_after, loss_after = result.after[name]
+        turns = f"{turns_before:g} -> {turns_after:g} ({result.targets[name]['turns_to_kill']:g})"
+        loss = f"{loss_before:g} -> {loss_after:g} ({result.targets[name]['hp_loss']:g})"
+        lines.append(f"{name:<24}{turns:>22}{loss:>22}")
+    lines.append("(before -> after (target), medians over every build that can attack)")
+    lines.append("")
+    lines.extend(difflib.unified_diff(original_text.splitlines(), proposed_text.splitlines(),
+                                      "game_data.json", proposed_name, lineterm=""))
+    return "\n".join(lines)
+
+
+def current_targets(enemies: list[dict]) -> dict[str, dict]:
+    """Return the current metrics of every enemy, in the targets format."""
+    targets = {}
+    for enemy in enemies:
+        turns, loss = enemy_metrics(enemy)
+        targets[enemy['name']] = {'turns_to_kill': turns, 'hp_loss': loss}
+    return targets
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    parser = argparse.ArgumentParser(description="Tune enemy stats in game_data.json to target difficulty metrics.")
+    parser.add_argument("targets", nargs="?", help="JSON file of target metrics by enemy name")
+    parser.add_argument("--game-data", default=os.path.join(script_dir, "game_data.json"))
+    parser.add_argument("--out", default=os.path.join(script_dir, "game_data.proposed.json"))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--current", action="store_true", help="print the current metrics and exit")
+    args = parser.parse_args()
+
+    with open(args.game_data, 'r', encoding='utf-8') as f:
+        original = f.read()
+    world_enemies = json.loads(original)['enemies']
+
+    if args.current or args.targets is None:
+        print(json.dumps(current_targets(world_enemies), indent=2))
+    else:
+        with open(args.targets, 'r', encoding='utf-8') as f:
+            tuning = tune(world_enemies, json.load(f), args.workers)
+        proposed = replace_enemies(original, tuning.enemies)
+        with open(args.out, 'w', encoding='utf-8') as f:
+            f.write(proposed)
+        print(diff_report(tuning, original, proposed, os.path.basename(args.out)))
+        print(f"\nProposed game data written to {args.out}")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
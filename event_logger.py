@@ -22,8 +22,10 @@ This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 
 from __future__ import annotations
+from array import array
+from bisect import bisect_left
 from dataclasses import dataclass
-from typing import Optional
+from typing import Callable, Iterator, Optional
 
 
 @dataclass
@@ -67,11 +69,22 @@ class EventList:
     # Note: You may ADD parameters/attributes/methods to this class as you see fit.
     # But do not rename or remove any existing methods/attributes in this class
 
+    # Private Instance Attributes:
+    #   - _events: every event in the list, in order, so that events can be found by position
+    #   - _by_location: the positions of the events at each location ID, in increasing order
+    #   - _by_command: the positions of the events followed by each command, in increasing order
+    _events: list[Event]
+    _by_location: dict[int, array]
+    _by_command: dict[str, array]
+
     def __init__(self) -> None:
         """Initialize a new empty event list."""
 
         self.first = None
         self.last = None
+        self._events = []
+        self._by_location = {}
+        self._by_command = {}
 
     def display_events(self) -> None:
         """Display all events in chronological order."""
@@ -100,13 +113,17 @@ class EventList:
         event in the game.
         """
         # Hint: You should update the previous node's <next_command> as needed
-        if self.is_empty():
+        self._by_location.setdefault(event.id_num, array('q')).append(len(self._events))
+        if event.next_command is not None:
+            self._by_command.setdefault(event.next_command, array('q')).append(len(self._events))
+        self._events.append(event)
+        if len(self._events) == 1:
             self.first = event
             self.last = event
             return
 
         if command is not None:
-            self.last.next_command = command
+            self._set_next_command(len(self._events) - 2, command)
 
         event.prev = self.last
         self.last.next = event
@@ -126,13 +143,123 @@ class EventList:
         # Hint: The <next_command> and <next> attributes for the new last event should be updated as needed
         if self.is_empty():
             return
+        self._by_location[self.last.id_num].pop()
+        if self.last.next_command is not None:
+            self._by_command[self.last.next_command].pop()
+        self._events.pop()
         self.last = self.last.prev
         if self.last is not None:
-            self.last.next_command = None
+            self._set_next_command(len(self._events) - 1, None)
             self.last.next = None
         else:
             self.first = None
 
+    def _set_next_command(self, position: int, command: Optional[str]) -> None:
+        """Set the next_command of the event at position, which is the last event with a next
+        command, and update the command index to match.
+        """
+        event = self._events[position]
+        if event.next_command is not None:
+            self._by_command[event.next_command].pop()
+        event.next_command = command
+        if command is not None:
+            self._by_command.setdefault(command, array('q')).append(position)
+
+    def __len__(self) -> int:
+        """Return the number of events in this list."""
+        return len(self._events)
+
+    def event_at(self, position: int) -> Event:
+        """Return the event at the given position (0 is the first event; negative positions
+        count back from the last event).
+
+        Preconditions:
+        - -len(self) <= position < len(self)
+        """
+        return self._events[position]
+
+    def last_events(self, k: int) -> list[Event]:
+        """Return the last k events of this list (or all of them, if there are fewer), in order.
+
+        >>> log = EventList()
+        >>> for loc_id in [1, 2, 3, 2]:
+        ...     log.add_event(Event(id_num=loc_id, description="A location"), "go")
+        >>> [event.id_num for event in log.last_events(2)]
+        [3, 2]
+        """
+        return self._events[max(len(self._events) - k, 0):] if k > 0 else []
+
+    def events_between(self, i: int, j: int) -> list[Event]:
+        """Return the events at positions i up to but not including j, in order."""
+        return self._events[max(i, 0):max(j, 0)]
+
+    def _positions(self, location_id: Optional[int], command: Optional[str]) -> Optional[array]:
+        """Return the positions of the events matching a single filter, or None if there is no filter."""
+        if location_id is not None:
+            return self._by_location.get(location_id, array('q'))
+        if command is not None:
+            return self._by_command.get(command, array('q'))
+        return None
+
+    def count(self, location_id: Optional[int] = None, command: Optional[str] = None) -> int:
+        """Return the number of events at the given location ID and followed by the given command.
+        A filter that is None matches every event.
+
+        >>> log = EventList()
+        >>> for loc_id in [1, 2, 1, 2, 1]:
+        ...     log.add_event(Event(id_num=loc_id, description="A location"), "go west" if loc_id == 1 else "go east")
+        >>> log.count(location_id=1), log.count(command="go east"), log.count(location_id=1, command="go east")
+        (3, 2, 2)
+        """
+        if location_id is not None and command is not None:
+            return sum(1 for _ in self.iter_matches(location_id, command))
+        positions = self._positions(location_id, command)
+        return len(self._events) if positions is None else len(positions)
+
+    def iter_matches(self, location_id: Optional[int] = None, command: Optional[str] = None,
+                     start: int = 0) -> Iterator[tuple[int, Event]]:
+        """Yield (position, event) for every event from position start on that is at the given
+        location ID and followed by the given command, in order. A filter that is None matches
+        every event.
+
+        Only matching events are visited, using the index of a single filter; with both filters,
+        the events of the smaller index are visited and checked against the other filter.
+        """
+        by_location = self._positions(location_id, None)
+        by_command = self._positions(None, command)
+        if by_location is None and by_command is None:
+            positions = range(max(start, 0), len(self._events))
+        elif by_location is None or (by_command is not None and len(by_command) < len(by_location)):
+            positions = by_command[bisect_left(by_command, start):]
+        else:
+            positions = by_location[bisect_left(by_location, start):]
+        for position in positions:
+            event = self._events[position]
+            if (location_id is None or event.id_num == location_id) and \
+                    (command is None or event.next_command == command):
+                yield position, event
+
+    def page(self, offset: int, limit: int, location_id: Optional[int] = None,
+             command: Optional[str] = None) -> list[tuple[int, Event]]:
+        """Return (position, event) for up to limit matching events (see iter_matches), skipping
+        the first offset matches. With at most one filter, this takes time proportional to limit.
+
+        >>> log = EventList()
+        >>> for loc_id in [1, 2, 1, 2, 1]:
+        ...     log.add_event(Event(id_num=loc_id, description="A location"), "go")
+        >>> [position for position, _ in log.page(1, 5, location_id=1)]
+        [2, 4]
+        """
+        if location_id is not None and command is not None:
+            matches = self.iter_matches(location_id, command)
+            for _ in zip(range(offset), matches):
+                pass
+            return [match for match, _ in zip(matches, range(limit))]
+        positions = self._positions(location_id, command)
+        if positions is None:
+            positions = range(len(self._events))
+        return [(position, self._events[position]) for position in positions[max(offset, 0):max(offset, 0) + limit]]
+
     def get_id_log(self) -> list[int]:
         """Return a list of all location IDs visited for each event in this list, in sequence."""
         node = self.first
@@ -160,15 +287,63 @@ class EventList:
         """Populate this event list from a list of dictionaries."""
         self.first = None
         self.last = None
+        self._events = []
+        self._by_location = {}
+        self._by_command = {}
         for event_data in data:
             event = Event(id_num=event_data['id_num'], description=event_data['description'])
             self.add_event(event, event_data['next_command'])
 
 
+def _time_query(label: str, query: Callable[[], object], repeats: int) -> None:
+    """Print the average time of the given query."""
+    from time import perf_counter
+
+    start = perf_counter()
+    for _ in range(repeats):
+        query()
+    print(f"  {label:<40} {(perf_counter() - start) / repeats * 1_000_000:12.1f} us")
+
+
+def benchmark(events: int = 1_000_000) -> None:
+    """Print the time of each query on a log of the given number of events, built from a random walk
+    over 20 locations and 12 commands, next to a full walk of the log with get_id_log.
+    """
+    import random
+    from time import perf_counter
+
+    rng = random.Random(111)
+    commands = [f"go {direction}" for direction in ["north", "south", "east", "west"]] + \
+        ["look", "inventory", "attack", "flee", "take t-card", "drop t-card", "score", "log"]
+    log = EventList()
+    start = perf_counter()
+    for _ in range(events):
+        log.add_event(Event(rng.randint(1, 20), "A location"), rng.choice(commands))
+    print(f"Log of {len(log)} events built in {perf_counter() - start:.2f} s")
+
+    middle = len(log) // 2
+    _time_query("full walk (get_id_log)", log.get_id_log, 3)
+    _time_query("last 10 events", lambda: log.last_events(10), 1000)
+    _time_query("events between middle and middle + 10", lambda: log.events_between(middle, middle + 10), 1000)
+    _time_query("count at location 7", lambda: log.count(location_id=7), 1000)
+    _time_query("count of 'take t-card'", lambda: log.count(command="take t-card"), 1000)
+    _time_query("last page at location 7", lambda: log.page(log.count(location_id=7) - 10, 10, 7), 1000)
+    _time_query("page of 'attack' from the middle",
+                lambda: log.page(log.count(command="attack") // 2, 10, command="attack"), 1000)
+    _time_query("first 10 'flee' at location 7 after middle",
+                lambda: list(zip(range(10), log.iter_matches(7, "flee", middle))), 1000)
+    _time_query("count of 'flee' at location 7", lambda: log.count(7, "flee"), 3)
+
+
 if __name__ == "__main__":
     # When you are ready to check your work with python_ta, uncomment the following lines.
     # (Delete the "#" and space before each line.)
     # IMPORTANT: keep this code indented inside the "if __name__ == '__main__'" block
+    import doctest
+    doctest.testmod()
+
+    benchmark()
+
     import python_ta
     python_ta.check_all(config={
         'max-line-length': 120,
@@ -0,0 +1,378 @@
+"""CSC111 Project 1: Text Adventure Game - Command Fuzzer
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a coverage-guided fuzzer for the game engine. It drives the
+real game loop (adventure.game_loop) headlessly, answering every input() prompt with a
+command generated from the current state: the location's available commands, the menu
+verbs (including drops of arbitrary items), the combat options, item names and flee
+directions, plus the occasional garbage input.
+
+Coverage is measured as the set of distinct (location, inventory, enemies remaining)
+states reached. Scripts that reach new states are kept in a corpus and preferred as
+prefixes for later runs. Any exception raised by the engine is a crash; crashing scripts
+are minimized by delta debugging before being reported. Runs are spread across a pool
+of worker processes.
+
+The same input generator drives the randomized consistency checks of other modules (such as
+the state codec's round trips), through check_random_games: it plays random games and runs a
+given check whenever a game asks for input.
+
+Usage:
+    python fuzzer.py [--runs N] [--workers N] [--seed N]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import builtins
+import os
+import random
+import sys
+import tempfile
+import traceback
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Callable, Optional, Sequence
+
+from adventure import AdventureGame, MENU, game_loop
+from event_logger import EventList
+from game_entities import Inventory, Player
+
+# The number of generated inputs appended to a corpus prefix on each run.
+INPUTS_PER_RUN = 60
+
+# The probability that a generated input is garbage rather than a plausible command.
+GARBAGE_PROBABILITY = 0.03
+
+# The prompt with which the game loop reads the command of a turn (see adventure.game_loop). Fleeing
+# asks again for an invalid direction with it too, after which the player only moves.
+TURN_PROMPT = "\nEnter action: "
+
+# Coverage state: (location ID, sorted inventory item names, sorted (location ID, enemy) pairs remaining).
+State = tuple[int, tuple[str, ...], tuple[tuple[int, str], ...]]
+
+
+class _ScriptExhausted(Exception):
+    """Raised by the fuzzer's input() replacement once a run has used up its inputs."""
+
+
+class _NullWriter:
+    """A write-only text stream that discards everything, used to silence the game during a run."""
+
+    def write(self, text: str) -> int:
+        """Discard text."""
+        return len(text)
+
+    def flush(self) -> None:
+        """Do nothing."""
+
+
+@dataclass
+class RunResult:
+    """The outcome of executing one script.
+
+    Instance Attributes:
+        - script: Every input given to the game during the run, in order.
+        - states: The coverage states reached during the run.
+        - crash: A one-line signature of the exception the engine raised, or None if it did not crash.
+        - crash_traceback: The full traceback of the crash, or None.
+    """
+    script: list[str]
+    states: set[State] = field(default_factory=set)
+    crash: Optional[str] = None
+    crash_traceback: Optional[str] = None
+
+
+def coverage_state(game: AdventureGame, player: Player) -> State:
+    """Return the coverage state of the given game."""
+    enemies = []
+    for loc_id in game.get_initial_world():
+        enemies.extend((loc_id, enemy) for enemy in game.get_location(loc_id).enemies)
+    return (game.current_location_id,
+            tuple(sorted(item.name for item in player.inventory.items)),
+            tuple(sorted(enemies)))
+
+
+def _generate_input(prompt: str, game: AdventureGame, player: Player, rng: random.Random) -> str:
+    """Return a plausible input for the given prompt in the current game state."""
+    if rng.random() < GARBAGE_PROBABILITY:
+        return rng.choice(["", "go", "take", "drop", "drop nothing", "take ", "xyzzy", "ATTACK ", "0", "-1"])
+
+    location = game.get_location()
+    if prompt.startswith("What to do? Choose from Attack"):
+        return rng.choice(["attack", "flee", "inventory", "auto"])
+    if prompt.startswith("Which item"):
+        return rng.choice([item.name for item in player.inventory.items] or ["nothing"])
+    if prompt == "":
+        # flee() asks for a direction without a prompt
+        return rng.choice([command for command in location.available_commands if command.startswith("go")]
+                          or ["go north"])
+
+    options = list(location.available_commands) + [verb for verb in MENU if verb != "quit"]
+    options.append("drop " + rng.choice(game.get_item_names()))
+    options.extend(f"drop {item.name}" for item in player.inventory.items)
+    return rng.choice(options)
+
+
+def run_script(prefix: list[str], extra_inputs: int, seed: int, game_data_file: str,
+               stats: tuple[int, int, int] = (5, 5, 0)) -> RunResult:
+    """Run the game loop headlessly, answering prompts from prefix and then with extra_inputs generated inputs.
+
+    stats gives the player's (speed, attack, defense). The run ends when the game ends or
+    the inputs run out.
+    """
+    rng = random.Random(seed)
+    game = AdventureGame(game_data_file, 1)
+    player = Player(Inventory([], 10, 0.0), speed=stats[0], attack=stats[1], defense=stats[2],
+                    skip_stats_selection=True)
+    result = RunResult(script=[])
+    remaining = list(reversed(prefix))
+    budget = [extra_inputs]
+
+    def fuzz_input(prompt: str = "") -> str:
+        """Record the current coverage state and return the next scripted or generated input."""
+        result.states.add(coverage_state(game, player))
+        if remaining:
+            command = remaining.pop()
+        elif budget[0] > 0:
+            budget[0] -= 1
+            command = _generate_input(prompt, game, player, rng)
+        else:
+            raise _ScriptExhausted
+        result.script.append(command)
+        return command
+
+    real_input, real_stdout = builtins.input, sys.stdout
+    builtins.input, sys.stdout = fuzz_input, _NullWriter()
+    with tempfile.TemporaryDirectory() as save_dir:
+        try:
+            game_loop(game, player, EventList(), os.path.join(save_dir, "fuzz.sav"))
+        except _ScriptExhausted:
+            pass
+        except Exception as error:  # the fuzzer's job is to catch every kind of engine crash
+            frame = traceback.extract_tb(error.__traceback__)[-1]
+            result.crash = f"{type(error).__name__} at {os.path.basename(frame.filename)}:{frame.lineno}"
+            result.crash_traceback = traceback.format_exc()
+        finally:
+            builtins.input, sys.stdout = real_input, real_stdout
+    result.states.add(coverage_state(game, player))
+    return result
+
+
+@dataclass
+class RandomRun:
+    """One game played by check_random_games.
+
+    Instance Attributes:
+        - number: The number of the run, from 0.
+        - game: The game being played.
+        - player: The player's character, with random stats.
+        - rng: The random number generator of every run's inputs, which checks may also draw from.
+        - save_file: The file the game saves to, in a directory deleted after the run.
+        - next_inputs: The inputs given before any generated one, last first: what is left of the
+          scripted prefix, and whatever a check adds.
+    """
+    number: int
+    game: AdventureGame
+    player: Player
+    rng: random.Random
+    save_file: str
+    next_inputs: list[str]
+
+    def restart_turn(self) -> None:
+        """Make the game loop start a new turn before reading any other command.
+
+        The game loop reads the location at the start of a turn, so a check that moves the game to
+        another state (e.g. by loading a save) must do so at TURN_PROMPT and then call this.
+        """
+        self.next_inputs.append("look")
+
+
+def check_random_games(game_data_file: str, start_run: Callable[[RandomRun], Callable[[str], list[str]]],
+                       runs: int = 200, inputs_per_run: int = 150, seed: int = 0,
+                       script: Sequence[str] = ()) -> list[str]:
+    """Play the given number of games of the real game loop with random stats and generated inputs,
+    checking each game whenever it asks for input, and return every failure found, prefixed with
+    the number of its run.
+
+    start_run is called at the start of each run, and may set up its game; it returns the check of
+    that run, which is given each prompt and returns the failures found in the current state of
+    the game. The check may also change the state (see RandomRun.restart_turn). If script is
+    given, each game first follows a random prefix of it.
+    """
+    from policy import stat_allocations
+
+    rng = random.Random(seed)
+    failures = []
+    for number in range(runs):
+        speed, attack, defense = rng.choice(stat_allocations())
+        game = AdventureGame(game_data_file, 1)
+        player = Player(Inventory([], 10, 0.0), speed, attack, defense, skip_stats_selection=True)
+        budget = [inputs_per_run]
+
+        with tempfile.TemporaryDirectory() as save_dir:
+            run = RandomRun(number, game, player, rng, os.path.join(save_dir, "check.sav"),
+                            list(reversed(script[:rng.randint(0, len(script))])))
+            check = start_run(run)
+
+            def checked_input(prompt: str = "") -> str:
+                """Check the current state of the game, then return the next scripted or generated input."""
+                if budget[0] == 0:
+                    raise _ScriptExhausted
+                budget[0] -= 1
+                failures.extend(f"run {number}: {failure}" for failure in check(prompt))
+                if run.next_inputs:
+                    return run.next_inputs.pop()
+                return _generate_input(prompt, game, player, rng)
+
+            real_input, real_stdout = builtins.input, sys.stdout
+            builtins.input, sys.stdout = checked_input, _NullWriter()
+            try:
+                game_loop(game, player, EventList(), run.save_file)
+            except _ScriptExhausted:
+                pass
+            finally:
+                builtins.input, sys.stdout = real_input, real_stdout
+    return failures
+
+
+def minimize(script: list[str], crash: str, game_data_file: str,
+             stats: tuple[int, int, int] = (5, 5, 0)) -> list[str]:
+    """Return a smallest-found subsequence of script that still causes the given crash (delta debugging)."""
+    def still_crashes(candidate: list[str]) -> bool:
+        return run_script(candidate, 0, 0, game_data_file, stats).crash == crash
+
+    chunks = 2
+    while len(script) >= 2:
+        size = len(script) // chunks
+        reduced = False
+        for start in range(0, len(script), size):
+            candidate = script[:start] + script[start + size:]
+            if still_crashes(candidate):
+                script, chunks, reduced = candidate, max(chunks - 1, 2), True
+                break
+        if not reduced:
+            if chunks >= len(script):
+                break
+            chunks = min(chunks * 2, len(script))
+    return script
+
+
+def _worker(jobs: list[tuple[list[str], int]], game_data_file: str) -> tuple[list[RunResult], float]:
+    """Run a batch of (prefix, seed) jobs and return their results and the time taken."""
+    start = perf_counter()
+    results = [run_script(prefix, INPUTS_PER_RUN, seed, game_data_file) for prefix, seed in jobs]
+    return results, perf_counter() - start
+
+
+@dataclass
+class FuzzReport:
+    """The summary of a fuzzing session.
+
+    Instance Attributes:
+        - runs: The number of scripts executed.
+        - commands: The total number of inputs given to the game.
+        - states: Every coverage state reached.
+        - crashes: For each distinct crash signature, a minimized script that reproduces it.
+        - worker_seconds: The total time spent executing scripts, summed over workers.
+        - wall_seconds: The elapsed time of the whole session.
+    """
+    runs: int = 0
+    commands: int = 0
+    states: set[State] = field(default_factory=set)
+    crashes: dict[str, list[str]] = field(default_factory=dict)
+    worker_seconds: float = 0.0
+    wall_seconds: float = 0.0
+
+    def commands_per_second_per_core(self) -> float:
+        """Return the fuzzer's throughput per worker process."""
+        return self.commands / self.worker_seconds if self.worker_seconds else 0.0
+
+
+def fuzz(game_data_file: str, runs: int = 2000, workers: Optional[int] = None, seed: int = 0,
+         batch_size: int = 25) -> FuzzReport:
+    """Fuzz the game for the given number of runs across a pool of worker processes and return a report.
+
+    Each run extends a prefix taken from the corpus. The corpus starts with the empty script
+    and grows with every script that reached a new coverage state; newer entries are
+    chosen more often, since they sit at the frontier of what has been explored.
+    """
+    workers = workers or os.cpu_count() or 1
+    rng = random.Random(seed)
+    corpus = [[]]
+    report = FuzzReport()
+    crash_scripts = {}
+    start = perf_counter()
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        while report.runs < runs:
+            pending = runs - report.runs
+            futures = []
+            while pending > 0 and len(futures) < workers:
+                jobs = []
+                for _ in range(min(batch_size, pending)):
+                    # Prefer recent corpus entries: pick the max of two uniform indices
+                    parent = corpus[max(rng.randrange(len(corpus)), rng.randrange(len(corpus)))]
+                    jobs.append((parent[:rng.randint(0, len(parent))], rng.getrandbits(32)))
+                pending -= len(jobs)
+                futures.append(pool.submit(_worker, jobs, game_data_file))
+
+            for future in futures:
+                results, seconds = future.result()
+                report.worker_seconds += seconds
+                for result in results:
+                    report.runs += 1
+                    report.commands += len(result.script)
+                    if not result.states <= report.states:
+                        report.states |= result.states
+                        corpus.append(result.script)
+                    if result.crash is not None and result.crash not in crash_scripts:
+                        crash_scripts[result.crash] = result.script
+
+    for crash, script in crash_scripts.items():
+        report.crashes[crash] = minimize(script, crash, game_data_file)
+    report.wall_seconds = perf_counter() - start
+    return report
+
+
+def print_report(report: FuzzReport) -> None:
+    """Print a fuzzing report, including the throughput benchmark figure."""
+    print(f"Runs: {report.runs}, commands: {report.commands}, states covered: {len(report.states)}")
+    print(f"Throughput: {report.commands_per_second_per_core():.0f} commands/s per core "
+          f"({report.commands / report.wall_seconds:.0f} commands/s overall)")
+    if not report.crashes:
+        print("No crashes found.")
+    for crash, script in report.crashes.items():
+        print(f"\nCRASH {crash}\n  minimized script ({len(script)} inputs): {script}")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Fuzz the UofT Adventure engine.")
+    parser.add_argument("--runs", type=int, default=2000)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+    print_report(fuzz(data_file, args.runs, args.workers, args.seed))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
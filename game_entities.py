@@ -19,8 +19,10 @@ please consult our Course Syllabus.
 This file is Copyright (c) 2026 CSC111 Teaching Team
 """
 from __future__ import annotations
+from bisect import bisect_left
 from dataclasses import dataclass
 from math import ceil
+from typing import Optional
 
 
 @dataclass
@@ -35,6 +37,8 @@ class Location:
         - items: A list of names of items present in this location.
         - enemies: A list of names of enemies present in this location.
         - visited: A boolean indicating whether the player has visited this location.
+        - version: A counter bumped whenever the items, enemies or commands of this location change,
+          so that cached renderings of it can be invalidated.
 
     Representation Invariants:
         - self.id_num >= -1
@@ -55,6 +59,7 @@ class Location:
     items: list[str]
     enemies: list[str]
     visited: bool = False
+    version: int = 0
 
 
 @dataclass
@@ -123,6 +128,7 @@ class Inventory:
             print(f"Added {item.name} to inventory.")
             current_location.items.remove(item.name)
             current_location.available_commands.pop(f"take {item.name}", 0)
+            current_location.version += 1
         else:
             print(f"Your inventory is full. Drop an item to take {item.name}.")
 
@@ -137,6 +143,7 @@ class Inventory:
         self.current_weight -= item.weight
         print(f"Dropped {item.name}.")
         current_location.items.append(item.name)
+        current_location.version += 1
         return current_location
 
 
@@ -328,6 +335,80 @@ class Enemy:
         self.current_health -= damage
         return self.current_health > 0
 
+    def fight_outcome(self, attack: int, defense: int, health: int, first_turn: int = 1,
+                      max_enemy_turns: Optional[int] = None) -> Optional[FightOutcome]:
+        """Return the outcome of a fight against this enemy, from its current health, in which the
+        player attacks on every turn. Return None if the player can never defeat it (attack is 0)
+        and the fight is not cut short.
+
+        The outcome is computed in closed form rather than turn by turn: the player's killing
+        blow ends the fight, each earlier turn is answered by an enemy attack (reduced by
+        defense, but always at least 1), and the enemy's damage repeats with its attack_pattern.
+        The enemy's first attack is its attack on turn first_turn (as numbered by combat, e.g.
+        to resume a fight), and if max_enemy_turns is given, the fight is cut short after that
+        many enemy attacks (e.g. when the player runs out of steps) unless it ended before.
+
+        >>> barista = Enemy("Barista", 8, 8, 3, ["small", "big"], [])
+        >>> barista.fight_outcome(attack=3, defense=0, health=10)
+        FightOutcome(player_turns=3, enemy_turns=2, damage_taken=5, player_survives=True, cut_short=False)
+        >>> barista.fight_outcome(attack=1, defense=0, health=10)
+        FightOutcome(player_turns=4, enemy_turns=4, damage_taken=10, player_survives=False, cut_short=False)
+        >>> barista.fight_outcome(attack=3, defense=0, health=10, first_turn=2)
+        FightOutcome(player_turns=3, enemy_turns=2, damage_taken=5, player_survives=True, cut_short=False)
+        >>> barista.fight_outcome(attack=1, defense=0, health=10, max_enemy_turns=3)
+        FightOutcome(player_turns=3, enemy_turns=3, damage_taken=7, player_survives=True, cut_short=True)
+        >>> barista.fight_outcome(attack=0, defense=5, health=10) is None
+        True
+        """
+        if attack <= 0 and max_enemy_turns is None:
+            return None
+
+        # prefix[r] is the damage taken over the first r enemy turns of a pattern cycle
+        prefix = [0]
+        for turn in range(first_turn, first_turn + len(self.attack_pattern)):
+            prefix.append(prefix[-1] + max(self.deal_damage(turn) - defense, 1))
+        cycle_damage = prefix[-1]
+        cycle_length = len(self.attack_pattern)
+
+        # The enemy attacks between the player's blows, up to the killing blow (if there is one)
+        enemy_turns = max(ceil(self.current_health / attack), 1) - 1 if attack > 0 else max_enemy_turns
+        if max_enemy_turns is not None and max_enemy_turns < enemy_turns:
+            enemy_turns = max_enemy_turns
+        full_cycles, remainder = divmod(enemy_turns, cycle_length)
+        damage_taken = full_cycles * cycle_damage + prefix[remainder]
+        if damage_taken < health:
+            cut_short = attack <= 0 or enemy_turns == max_enemy_turns
+            player_turns = enemy_turns if cut_short else enemy_turns + 1
+            return FightOutcome(player_turns, enemy_turns, damage_taken, True, cut_short)
+
+        # The player dies first: find the enemy turn on which the damage reaches their health
+        full_cycles = (health - 1) // cycle_damage
+        death_turn = full_cycles * cycle_length + bisect_left(prefix, health - full_cycles * cycle_damage)
+        return FightOutcome(death_turn, death_turn, health, False)
+
+
+@dataclass
+class FightOutcome:
+    """The outcome of a fight in which the player attacks on every turn (see Enemy.fight_outcome).
+
+    Instance Attributes:
+        - player_turns: The number of turns the player takes.
+        - enemy_turns: The number of times the enemy attacks; each costs the player steps.
+        - damage_taken: The total damage the player takes, capped at their health.
+        - player_survives: Whether the player is still alive at the end of the fight.
+        - cut_short: Whether the fight was cut short before either side was defeated.
+
+    Representation Invariants:
+        - self.enemy_turns in {self.player_turns - 1, self.player_turns}
+        - self.damage_taken >= 0
+        - not (self.cut_short and not self.player_survives)
+    """
+    player_turns: int
+    enemy_turns: int
+    damage_taken: int
+    player_survives: bool
+    cut_short: bool = False
+
 
 @dataclass
 class Puzzle(Location):
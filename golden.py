@@ -0,0 +1,400 @@
+"""CSC111 Project 1: Text Adventure Game - Golden Transcript Regression Tests
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module checks the engine against stored golden outputs of a corpus of
+walkthroughs, so that any change in behaviour is caught without anyone eyeballing id logs.
+
+The corpus is the shipped walkthroughs of simulation.py, plus random variations of them: each
+plays a prefix of a shipped walkthrough with random stats and random commands mixed in.
+Blessing the corpus runs every walkthrough through the simulation and stores, per walkthrough,
+its commands and stats, its events (location ID and command), its outcome, score and steps,
+the digest of its final game state and its rendered transcript (everything it printed).
+
+Checking re-runs every stored walkthrough, headlessly and in parallel across worker processes,
+and reports for each one that changed its first divergent event with the events before it,
+the outcome fields and digest that changed, and the first hunk of the transcript diff. With
+--cross-check, each walkthrough is also played through the interactive game loop, and the
+digest of its final state (without the event log, which the two loops keep differently) is
+compared to the simulation's. The check fails if any walkthrough diverged, if the two loops
+ended any walkthrough differently, or if no golden outputs are stored (they are committed in
+golden/, so a missing file means a broken checkout, not a passing check).
+
+Usage:
+    python golden.py --bless [--random N] [--seed S]    (store the golden outputs)
+    python golden.py [--workers N] [--cross-check]      (check the engine against them)
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import contextlib
+import difflib
+import gzip
+import io
+import json
+import os
+import random
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, dataclass, field
+from time import perf_counter
+from typing import Optional
+
+from sim_cache import DEFAULT_STATS
+
+# Where the golden outputs are stored, one JSON object per walkthrough.
+GOLDEN_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "golden", "transcripts.jsonl.gz")
+
+# Number of random walkthroughs blessed alongside the shipped ones, by default.
+DEFAULT_RANDOM_WALKTHROUGHS = 2000
+
+# Number of walkthroughs run by a worker process at a time.
+BATCH_SIZE = 100
+
+# Number of matching events shown before the first divergent event.
+CONTEXT_EVENTS = 2
+
+# Most lines of transcript diff shown per walkthrough.
+MAX_DIFF_LINES = 12
+
+# Commands mixed into random walkthroughs. Menu commands that read further input (log, pack,
+# drop) or depend on files outside the game data (hint, save) are left out.
+_EXTRA_COMMANDS = ["go north", "go south", "go east", "go west", "look", "inventory", "stats", "score",
+                   "attack", "flee", "take t-card", "take stale bread", "drop lucky mug"]
+
+
+@dataclass
+class Walkthrough:
+    """A named list of commands, played with the given (speed, attack, defense) stats.
+
+    Instance Attributes:
+        - name: The name of the walkthrough.
+        - commands: The commands, including answers to prompts inside combat.
+        - stats: The player's (speed, attack, defense).
+    """
+    name: str
+    commands: list[str]
+    stats: tuple[int, int, int] = DEFAULT_STATS
+
+
+@dataclass
+class Transcript:
+    """Everything observable about one run of a walkthrough.
+
+    Instance Attributes:
+        - walkthrough: The walkthrough that was run.
+        - events: The (location ID, command chosen there) of every event, in order.
+        - outcome: How the game ended (see AdventureGameSimulation.get_outcome).
+        - score: The player's final score.
+        - steps: The number of steps taken.
+        - digest: The digest of the final game state, including the event log.
+        - world_digest: The digest of the final game state without the event log.
+        - lines: Every line the run printed.
+    """
+    walkthrough: Walkthrough
+    events: list[tuple[int, Optional[str]]]
+    outcome: str
+    score: int
+    steps: int
+    digest: str
+    world_digest: str
+    lines: list[str]
+
+    def id_log(self) -> list[int]:
+        """Return the location IDs of every event, in order."""
+        return [loc_id for loc_id, _ in self.events]
+
+
+def stats_inputs(stats: tuple[int, int, int]) -> list[str]:
+    """Return the answers that allocate the given (speed, attack, defense) when a new player is created.
+
+    >>> stats_inputs((5, 5, 0))
+    ['1', '5', '2', '5']
+    """
+    inputs = []
+    for choice, points in enumerate(stats, start=1):
+        if points > 0:
+            inputs.extend([str(choice), str(points)])
+    return inputs
+
+
+def generate_corpus(random_walkthroughs: int, seed: int = 0) -> list[Walkthrough]:
+    """Return the shipped walkthroughs followed by the given number of random variations of them."""
+    from policy import stat_allocations
+    from simulation import WALKTHROUGHS
+
+    corpus = [Walkthrough(name, list(commands)) for name, commands in WALKTHROUGHS.items()]
+    rng = random.Random(seed)
+    allocations = stat_allocations()
+    for i in range(random_walkthroughs):
+        base = rng.choice(list(WALKTHROUGHS.values()))
+        commands = []
+        for command in base[:rng.randint(1, len(base))]:
+            if rng.random() < 0.1:
+                commands.append(rng.choice(_EXTRA_COMMANDS))
+            commands.append(command)
+        corpus.append(Walkthrough(f"random-{i:05d}", commands, rng.choice(allocations)))
+    return corpus
+
+
+def run_walkthrough(game_data_file: str, walkthrough: Walkthrough) -> Transcript:
+    """Run walkthrough through the simulation and return its transcript."""
+    from simulation import AdventureGameSimulation
+
+    speed, attack, defense = walkthrough.stats
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        sim = AdventureGameSimulation(game_data_file, 1, walkthrough.commands, speed, attack, defense)
+        sim.run()
+    return Transcript(walkthrough, sim.get_events(), sim.get_outcome(), sim.get_score(), sim.get_steps(),
+                      sim.get_state_digest(), sim.get_state_digest(include_log=False),
+                      output.getvalue().splitlines())
+
+
+def interactive_digest(game_data_file: str, walkthrough: Walkthrough) -> str:
+    """Play walkthrough through the interactive game loop, allocating its stats when the player is
+    created, and return the digest of its final state without the event log.
+    """
+    from unittest.mock import patch
+    from adventure import game_loop, start_game
+
+    inputs = iter(stats_inputs(walkthrough.stats) + walkthrough.commands)
+
+    def scripted_input(prompt: str = "") -> str:
+        try:
+            return next(inputs)
+        except StopIteration:
+            raise EOFError from None  # like a player closing the console
+
+    with tempfile.TemporaryDirectory() as save_dir, patch('builtins.input', side_effect=scripted_input), \
+            contextlib.redirect_stdout(io.StringIO()):
+        save_file = os.path.join(save_dir, "golden.sav")
+        game, player, game_log = start_game(game_data_file, save_file)
+        with contextlib.suppress(EOFError):
+            game_loop(game, player, game_log, save_file)
+    return game.state_digest(player)
+
+
+def _event_line(position: int, event: tuple[int, Optional[str]]) -> str:
+    """Return how the event at position is shown in a divergence report."""
+    return f"#{position + 1} location {event[0]}, command {event[1]}"
+
+
+def first_divergence(golden: Transcript, actual: Transcript) -> list[str]:
+    """Return a minimal report of how actual differs from golden: the first divergent event with the
+    events before it, the outcome fields that changed, and the first hunk of the transcript diff.
+    Return an empty list if they do not differ.
+
+    >>> w = Walkthrough("w", ["go east"])
+    >>> golden = Transcript(w, [(1, "go east"), (2, None)], "quit", 0, 1, "ab", "a", ["OISE", "ROM"])
+    >>> actual = Transcript(w, [(1, "go east"), (3, None)], "quit", 0, 1, "cd", "c", ["OISE", "Vic"])
+    >>> for line in first_divergence(golden, actual):
+    ...     print(line)
+    first divergent event: #2
+          #1 location 1, command go east
+        - #2 location 2, command None
+        + #2 location 3, command None
+    digest: golden ab, now cd
+    transcript, first difference:
+        @@ -1,2 +1,2 @@
+         OISE
+        -ROM
+        +Vic
+    """
+    report = []
+    position = next((i for i, (a, b) in enumerate(zip(golden.events, actual.events)) if a != b),
+                    min(len(golden.events), len(actual.events)))
+    if golden.events != actual.events:
+        report.append(f"first divergent event: #{position + 1}")
+        for i in range(max(position - CONTEXT_EVENTS, 0), position):
+            report.append("      " + _event_line(i, golden.events[i]))
+        report.append("    - " + (_event_line(position, golden.events[position])
+                                  if position < len(golden.events) else "(no more events)"))
+        report.append("    + " + (_event_line(position, actual.events[position])
+                                  if position < len(actual.events) else "(no more events)"))
+
+    for name in ("outcome", "score", "steps", "digest"):
+        if getattr(golden, name) != getattr(actual, name):
+            report.append(f"{name}: golden {getattr(golden, name)}, now {getattr(actual, name)}")
+
+    if golden.lines != actual.lines:
+        diff = list(difflib.unified_diff(golden.lines, actual.lines, lineterm="", n=1))[2:]
+        hunk_end = next((i for i in range(1, len(diff)) if diff[i].startswith("@@")), len(diff))
+        report.append("transcript, first difference:")
+        report.extend("    " + line for line in diff[:min(hunk_end, MAX_DIFF_LINES)])
+    return report
+
+
+def _from_data(data: dict) -> Transcript:
+    """Return the transcript stored as data by write_golden."""
+    walkthrough = data['walkthrough']
+    return Transcript(Walkthrough(walkthrough['name'], walkthrough['commands'], tuple(walkthrough['stats'])),
+                      [tuple(event) for event in data['events']], data['outcome'], data['score'],
+                      data['steps'], data['digest'], data['world_digest'], data['lines'])
+
+
+def write_golden(filename: str, transcripts: list[Transcript]) -> None:
+    """Store transcripts as the golden outputs in filename, replacing any stored before.
+
+    The file is committed, so it carries no timestamp: blessing unchanged outputs rewrites it byte for byte.
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(filename)), exist_ok=True)
+    with io.TextIOWrapper(gzip.GzipFile(filename, 'wb', mtime=0), encoding='utf-8') as f:
+        for transcript in transcripts:
+            f.write(json.dumps(asdict(transcript), separators=(',', ':')) + "\n")
+
+
+def read_golden(filename: str) -> list[Transcript]:
+    """Return the golden outputs stored in filename."""
+    with gzip.open(filename, 'rt', encoding='utf-8') as f:
+        return [_from_data(json.loads(line)) for line in f]
+
+
+@dataclass
+class GoldenResult:
+    """The result of checking one walkthrough against its golden output.
+
+    Instance Attributes:
+        - name: The name of the walkthrough.
+        - divergence: How the walkthrough now differs from its golden output (see first_divergence).
+        - loops_differ: Whether the interactive game loop ended the walkthrough in a different
+          state than the simulation (always False unless cross-checked).
+    """
+    name: str
+    divergence: list[str]
+    loops_differ: bool = False
+
+
+def _bless_batch(game_data_file: str, walkthroughs: list[Walkthrough]) -> list[Transcript]:
+    """Run a batch of walkthroughs in this process and return their transcripts."""
+    return [run_walkthrough(game_data_file, walkthrough) for walkthrough in walkthroughs]
+
+
+def _check_batch(game_data_file: str, goldens: list[Transcript], cross_check: bool) -> list[GoldenResult]:
+    """Check a batch of walkthroughs against their golden outputs in this process."""
+    results = []
+    for golden in goldens:
+        actual = run_walkthrough(game_data_file, golden.walkthrough)
+        result = GoldenResult(golden.walkthrough.name, first_divergence(golden, actual))
+        if cross_check:
+            result.loops_differ = actual.world_digest != interactive_digest(game_data_file, golden.walkthrough)
+        results.append(result)
+    return results
+
+
+def _batches(items: list, size: int = BATCH_SIZE) -> list[list]:
+    """Return items split into consecutive batches of at most size."""
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+
+def bless(game_data_file: str, corpus: list[Walkthrough], golden_file: str = GOLDEN_FILE,
+          workers: Optional[int] = None) -> list[Transcript]:
+    """Run every walkthrough of corpus in parallel, store their transcripts as the golden outputs
+    in golden_file, and return them.
+    """
+    transcripts = []
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for batch in pool.map(_bless_batch, [game_data_file] * len(_batches(corpus)), _batches(corpus)):
+            transcripts.extend(batch)
+    write_golden(golden_file, transcripts)
+    return transcripts
+
+
+@dataclass
+class GoldenReport:
+    """The summary of checking a corpus against its golden outputs.
+
+    Instance Attributes:
+        - results: The result of each walkthrough, in corpus order.
+        - wall_seconds: The elapsed time of the whole check.
+    """
+    results: list[GoldenResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def diverged(self) -> list[GoldenResult]:
+        """Return the results of the walkthroughs that differ from their golden outputs."""
+        return [result for result in self.results if result.divergence]
+
+    def loops_differ(self) -> list[GoldenResult]:
+        """Return the results of the walkthroughs that the two game loops ended differently."""
+        return [result for result in self.results if result.loops_differ]
+
+
+def check(game_data_file: str, golden_file: str = GOLDEN_FILE, workers: Optional[int] = None,
+          cross_check: bool = False) -> GoldenReport:
+    """Check every walkthrough stored in golden_file against its golden output, in parallel."""
+    report = GoldenReport()
+    start = perf_counter()
+    batches = _batches(read_golden(golden_file))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for results in pool.map(_check_batch, [game_data_file] * len(batches), batches,
+                                [cross_check] * len(batches)):
+            report.results.extend(results)
+    report.wall_seconds = perf_counter() - start
+    return report
+
+
+def print_report(report: GoldenReport, cross_check: bool = False) -> None:
+    """Print every divergence from the golden outputs, and a summary."""
+    for result in report.diverged():
+        print(f"{result.name}: diverged")
+        for line in result.divergence:
+            print(f"    {line}")
+    count = len(report.results)
+    print(f"Checked {count} walkthroughs in {report.wall_seconds:.2f} s: "
+          f"{len(report.diverged())} diverged from their golden outputs")
+    if cross_check:
+        differ = report.loops_differ()
+        print(f"{len(differ)} of {count} walkthroughs end in a different state in the interactive game loop"
+              + (f": {', '.join(result.name for result in differ[:10])}" if differ else ""))
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Check the engine against golden walkthrough transcripts.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--golden", default=GOLDEN_FILE, help="the golden output file")
+    parser.add_argument("--bless", action="store_true", help="store the current outputs as the golden ones")
+    parser.add_argument("--random", type=int, default=DEFAULT_RANDOM_WALKTHROUGHS,
+                        help="random walkthroughs to bless alongside the shipped ones")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cross-check", action="store_true",
+                        help="also compare the interactive game loop with the simulation")
+    args = parser.parse_args()
+
+    exit_status = 0
+    if args.bless:
+        start_time = perf_counter()
+        blessed = bless(args.game_data, generate_corpus(args.random, args.seed), args.golden, args.workers)
+        print(f"Blessed {len(blessed)} walkthroughs in {perf_counter() - start_time:.2f} s into {args.golden}")
+    elif not os.path.exists(args.golden):
+        print(f"No golden outputs in {args.golden}; store them first with: python golden.py --bless")
+        exit_status = 2
+    else:
+        golden_report = check(args.game_data, args.golden, args.workers, args.cross_check)
+        print_report(golden_report, args.cross_check)
+        if golden_report.diverged() or golden_report.loops_differ():
+            exit_status = 1
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
+
+    raise SystemExit(exit_status)
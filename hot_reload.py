@@ -0,0 +1,546 @@
+"""CSC111 Project 1: Text Adventure Game - Hot Reload of Game Data
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module lets a long-running process pick up changes to game_data.json without
+restarting its sessions.
+
+A WorldTemplate holds the parsed game data shared by every session. When the file changes,
+reload() parses it, computes a structural diff (which locations, items and enemies were
+added, removed or changed) and swaps in the new data under a lock, recording the diff as a
+new generation. No session is touched by a reload, so its cost does not depend on the
+number of sessions.
+
+Each session (an AdventureGame) remembers the generation it last saw. sync() is called at
+the start of each of its turns; if the template has moved on, it applies only the entities
+changed since then, through AdventureGame.apply_world_changes, which keeps the player's
+progress (moved items, defeated enemies). A WorldWatcher thread polls the file and reloads
+the template when it changes.
+
+The template keeps count of how many games follow each generation (a game stops following it
+when it is garbage collected), and only keeps the diffs from the oldest generation still
+followed, so a long-running process does not accumulate one diff per reload forever.
+
+Usage:
+    python hot_reload.py [--sessions N] [--turns N] [--reloads N]
+                                        Reload the world repeatedly while sessions play, then
+                                        check every session against the final world.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import itertools
+import json
+import os
+import random
+import tempfile
+import threading
+import weakref
+from collections import Counter, deque
+from dataclasses import dataclass, field
+from time import perf_counter, sleep
+from typing import Iterator, Optional, TYPE_CHECKING
+
+from world_validator import InvalidWorldError, check_world
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+    from game_entities import Player
+
+# How often a WorldWatcher checks the game data file for changes, in seconds.
+POLL_INTERVAL = 0.5
+
+
+@dataclass
+class WorldDiff:
+    """The entities that differ between two versions of the game data.
+
+    Instance Attributes:
+        - locations: The IDs of the locations added, removed or changed.
+        - items: The names of the items added, removed or changed.
+        - enemies: The names of the enemies added, removed or changed.
+    """
+    locations: set[int] = field(default_factory=set)
+    items: set[str] = field(default_factory=set)
+    enemies: set[str] = field(default_factory=set)
+
+    def is_empty(self) -> bool:
+        """Return whether no entity changed."""
+        return not (self.locations or self.items or self.enemies)
+
+    def size(self) -> int:
+        """Return the number of entities that changed."""
+        return len(self.locations) + len(self.items) + len(self.enemies)
+
+    def update(self, other: WorldDiff) -> None:
+        """Add the entities changed in other to this diff."""
+        self.locations |= other.locations
+        self.items |= other.items
+        self.enemies |= other.enemies
+
+
+@dataclass
+class WorldIndex:
+    """Parsed game data, with each entity's entry indexed by its ID or name.
+
+    Instance Attributes:
+        - data: The parsed game data file.
+        - locations: Each location's entry, by ID.
+        - items: Each item's entry, by name.
+        - enemies: Each enemy's entry, by name.
+    """
+    data: dict
+    locations: dict[int, dict]
+    items: dict[str, dict]
+    enemies: dict[str, dict]
+
+    @staticmethod
+    def from_data(data: dict) -> WorldIndex:
+        """Return the index of the given parsed game data."""
+        return WorldIndex(data,
+                          {loc['id']: loc for loc in data['locations']},
+                          {item['name']: item for item in data['items']},
+                          {enemy['name']: enemy for enemy in data['enemies']})
+
+
+def _changed_keys(old: dict, new: dict) -> set:
+    """Return the keys added, removed, or mapped to different entries between old and new."""
+    return {key for key in old.keys() | new.keys() if old.get(key) != new.get(key)}
+
+
+def diff_worlds(old: WorldIndex, new: WorldIndex) -> WorldDiff:
+    """Return the entities that differ between old and new.
+
+    >>> old = WorldIndex.from_data({'locations': [{'id': 1, 'items': []}, {'id': 2, 'items': []}],
+    ...                             'items': [{'name': 'toonie', 'weight': 0.2}], 'enemies': []})
+    >>> new = WorldIndex.from_data({'locations': [{'id': 1, 'items': ['toonie']}, {'id': 3, 'items': []}],
+    ...                             'items': [{'name': 'toonie', 'weight': 0.2}], 'enemies': [{'name': 'Goose'}]})
+    >>> diff_worlds(old, new)
+    WorldDiff(locations={1, 2, 3}, items=set(), enemies={'Goose'})
+    """
+    return WorldDiff(_changed_keys(old.locations, new.locations),
+                     _changed_keys(old.items, new.items),
+                     _changed_keys(old.enemies, new.enemies))
+
+
+class WorldTemplate:
+    """The game data shared by every session of a process, which can be reloaded while they run.
+
+    Instance Attributes:
+        - filename: The game data file.
+        - world_hash: The SHA-256 hash of the game data currently loaded.
+        - generation: The number of changes applied since the template was created.
+        - oldest_generation: The oldest generation whose diffs are kept, that of the games that
+          have been following the template the longest without syncing.
+        - last_error: The reason the last reload failed, or None if it succeeded.
+
+    Representation Invariants:
+        - self.generation == self.oldest_generation + len(self._diffs)
+        - all(self.oldest_generation <= generation <= self.generation for generation in self._followers)
+    """
+    filename: str
+    world_hash: str
+    generation: int
+    oldest_generation: int
+    last_error: Optional[str]
+
+    # Private Instance Attributes:
+    #   - _index: the current game data
+    #   - _diffs: the diffs kept; _diffs[g - oldest_generation] took generation g to g + 1
+    #   - _followers: the number of live games following each generation, for the generations followed
+    #   - _follower_keys: the key of each live game following the template
+    #   - _followed: the generation followed by the game with each key
+    #   - _released: the keys of following games that were garbage collected since the last trim
+    #   - _keys: the source of the keys of following games
+    #   - _lock: guards every attribute but last_error, as _index, _diffs, generation and world_hash change together
+    #   - _reload_lock: serializes reloads
+    _index: WorldIndex
+    _diffs: list[WorldDiff]
+    _followers: Counter
+    _follower_keys: weakref.WeakKeyDictionary
+    _followed: dict[int, int]
+    _released: deque
+    _keys: Iterator[int]
+    _lock: threading.Lock
+    _reload_lock: threading.Lock
+
+    def __init__(self, filename: str) -> None:
+        """Load the template from the game data file filename, raising InvalidWorldError if it
+        does not describe a consistent world."""
+        with open(filename, 'rb') as f:
+            contents = f.read()
+        self.filename = filename
+        self.world_hash = hashlib.sha256(contents).hexdigest()
+        self.generation = 0
+        self.last_error = None
+        data = json.loads(contents)
+        check_world(data, self.world_hash)
+        self._index = WorldIndex.from_data(data)
+        self._diffs = []
+        self.oldest_generation = 0
+        self._followers = Counter()
+        self._follower_keys = weakref.WeakKeyDictionary()
+        self._followed = {}
+        self._released = deque()
+        self._keys = itertools.count()
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()
+
+    def snapshot(self) -> tuple[WorldIndex, str, int]:
+        """Return the current game data, its hash and its generation, which change together."""
+        with self._lock:
+            return self._index, self.world_hash, self.generation
+
+    def new_game(self, initial_location_id: int = 1) -> AdventureGame:
+        """Return a new game built from the current template, following it from this generation on."""
+        from adventure import AdventureGame
+
+        index, world_hash, generation = self.snapshot()
+        game = AdventureGame(self.filename, initial_location_id, world_data=index.data, world_hash=world_hash)
+        game.world_generation = generation
+        with self._lock:
+            self._follow(game, generation)
+            self._trim()
+        return game
+
+    def _follow(self, game: AdventureGame, generation: int) -> None:
+        """Record that game now follows generation. The caller must hold the lock."""
+        key = self._follower_keys.get(game)
+        if key is None:
+            key = self._follower_keys[game] = next(self._keys)
+            # Not the lock: a game can be collected while this thread holds it
+            weakref.finalize(game, self._released.append, key)
+        else:
+            self._unfollow(self._followed[key])
+        self._followed[key] = generation
+        self._followers[generation] += 1
+
+    def _unfollow(self, generation: int) -> None:
+        """Record that one game no longer follows generation. The caller must hold the lock."""
+        self._followers[generation] -= 1
+        if not self._followers[generation]:
+            del self._followers[generation]
+
+    def _trim(self) -> None:
+        """Forget the games collected since the last trim, then drop the diffs older than the oldest
+        generation still followed. The caller must hold the lock.
+        """
+        while self._released:
+            self._unfollow(self._followed.pop(self._released.popleft()))
+        oldest = min(self._followers, default=self.generation)
+        if oldest > self.oldest_generation:
+            del self._diffs[:oldest - self.oldest_generation]
+            self.oldest_generation = oldest
+
+    def reload(self) -> Optional[WorldDiff]:
+        """Re-read the game data file and, if its content changed, make it the current template.
+
+        Return the diff applied, or None if the content did not change or could not be parsed or
+        validated (in which case last_error says why and the current template is kept).
+        """
+        with self._reload_lock:
+            try:
+                with open(self.filename, 'rb') as f:
+                    contents = f.read()
+                world_hash = hashlib.sha256(contents).hexdigest()
+                if world_hash == self.world_hash:
+                    return None
+                data = json.loads(contents)
+                check_world(data, world_hash)
+                index = WorldIndex.from_data(data)
+            except (OSError, ValueError, KeyError, TypeError, InvalidWorldError) as error:
+                self.last_error = f"{type(error).__name__}: {error}"
+                return None
+
+            diff = diff_worlds(self._index, index)
+            with self._lock:
+                self._index = index
+                self.world_hash = world_hash
+                self._diffs.append(diff)
+                self.generation += 1
+                self._trim()
+            self.last_error = None
+            return diff
+
+    def sync(self, game: AdventureGame, player: Player) -> int:
+        """Bring game up to date with the current template, returning the number of entities reconciled.
+
+        Only the entities changed since the game's generation are touched; this is O(1) when the
+        template has not changed. A game not made by new_game follows the template from its first
+        sync on; if the diffs since its generation were already dropped, every entity is reconciled.
+        """
+        if game.world_generation == self.generation:
+            return 0
+
+        with self._lock:
+            index, world_hash, generation = self._index, self.world_hash, self.generation
+            if game.world_generation < self.oldest_generation:
+                changed = WorldDiff(set(index.locations) | set(game.get_location_ids()),
+                                    set(index.items) | set(game.get_item_names()),
+                                    set(index.enemies) | set(game.get_enemy_names()))
+            else:
+                changed = WorldDiff()
+                for diff in self._diffs[game.world_generation - self.oldest_generation:
+                                        generation - self.oldest_generation]:
+                    changed.update(diff)
+            self._follow(game, generation)
+            self._trim()
+
+        game.apply_world_changes({loc_id: index.locations.get(loc_id) for loc_id in changed.locations},
+                                 {name: index.items.get(name) for name in changed.items},
+                                 {name: index.enemies.get(name) for name in changed.enemies},
+                                 player, world_hash, generation)
+        return changed.size()
+
+
+class WorldWatcher:
+    """A background thread that reloads a WorldTemplate whenever its game data file changes.
+
+    Instance Attributes:
+        - template: The template to reload.
+        - interval: The time between checks of the file, in seconds.
+        - reloads: The number of reloads that changed the template.
+        - reload_seconds: The total time taken by those reloads.
+    """
+    template: WorldTemplate
+    interval: float
+    reloads: int
+    reload_seconds: float
+
+    # Private Instance Attributes:
+    #   - _stop: set when the watcher should stop
+    #   - _thread: the watcher thread
+    #   - _signature: the (modification time, size) of the file when it was last checked
+    _stop: threading.Event
+    _thread: threading.Thread
+    _signature: Optional[tuple[int, int]]
+
+    def __init__(self, template: WorldTemplate, interval: float = POLL_INTERVAL) -> None:
+        self.template = template
+        self.interval = interval
+        self.reloads = 0
+        self.reload_seconds = 0.0
+        self._stop = threading.Event()
+        self._signature = self._stat()
+        self._thread = threading.Thread(target=self._run, name="world-watcher", daemon=True)
+        self._thread.start()
+
+    def _stat(self) -> Optional[tuple[int, int]]:
+        """Return the (modification time, size) of the template's file, or None if it is missing."""
+        try:
+            stat = os.stat(self.template.filename)
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def check(self) -> Optional[WorldDiff]:
+        """Reload the template if its file looks different since the last check, returning the diff applied."""
+        signature = self._stat()
+        if signature is None or signature == self._signature:
+            return None
+        self._signature = signature
+        start = perf_counter()
+        diff = self.template.reload()
+        if diff is not None:
+            self.reloads += 1
+            self.reload_seconds += perf_counter() - start
+        return diff
+
+    def _run(self) -> None:
+        """Check the file every interval until stopped."""
+        while not self._stop.wait(self.interval):
+            self.check()
+
+    def close(self) -> None:
+        """Stop the watcher thread."""
+        self._stop.set()
+        self._thread.join()
+
+
+@dataclass
+class StressReport:
+    """The result of a hot reload stress test.
+
+    Instance Attributes:
+        - sessions: The number of sessions played.
+        - turns: The total number of turns played.
+        - reloads: The number of reloads that changed the template.
+        - reload_seconds: The total time taken by those reloads.
+        - sync_seconds: The time taken by each sync that reconciled a session.
+        - diffs_kept: The number of diffs the template kept at the end, once every session had synced.
+        - failures: A description of every inconsistency found in a session at the end.
+    """
+    sessions: int
+    turns: int = 0
+    reloads: int = 0
+    reload_seconds: float = 0.0
+    sync_seconds: list[float] = field(default_factory=list)
+    diffs_kept: int = 0
+    failures: list[str] = field(default_factory=list)
+
+
+def _variant(data: dict, revision: int) -> dict:
+    """Return a copy of the game data with content changes that depend on revision: one location's
+    description, the attack of every enemy, one item's weight, and every other revision the
+    toonie moved from OISE to the ROM.
+    """
+    data = json.loads(json.dumps(data))
+    locations = data['locations']
+    locations[revision % len(locations)]['long_description'] += f" (revision {revision})"
+    for enemy in data['enemies']:
+        enemy['attack'] += revision % 3
+    data['items'][revision % len(data['items'])]['weight'] += 0.1 * (revision % 2)
+    if revision % 2:
+        oise, rom = locations[0], locations[1]
+        if 'toonie' in oise['items']:
+            oise['items'].remove('toonie')
+            del oise['available_commands']['take toonie']
+            rom['items'].append('toonie')
+            rom['available_commands']['take toonie'] = rom['id']
+            for item in data['items']:
+                if item['name'] == 'toonie':
+                    item['start_position'] = rom['id']
+    return data
+
+
+def _play_turn(game: AdventureGame, player: Player, rng: random.Random, defeated: set[str]) -> None:
+    """Play one random turn of game without reading input: defeat the enemy here if there is one,
+    otherwise move, take an item or drop one.
+    """
+    from adventure import _handle_combat_defeat
+
+    location = game.get_location()
+    if location.enemies:
+        name = location.enemies[-1]
+        _handle_combat_defeat(game, game.get_enemy(name))
+        defeated.add(name)
+        return
+
+    choice = rng.choice([command for command in location.available_commands
+                         if command.startswith("go") or command[len("take "):] in location.items] +
+                        [f"drop {item.name}" for item in player.inventory.items])
+    if choice.startswith("go"):
+        game.current_location_id = location.available_commands[choice]
+        game.increment_steps(player)
+    elif choice.startswith("take "):
+        game.take_item(player, game.get_item(choice[len("take "):]))
+    else:
+        game.drop_item(player, next(item for item in player.inventory.items if item.name == choice[len("drop "):]))
+
+
+def _check_session(template: WorldTemplate, game: AdventureGame, player: Player, defeated: set[str]) -> list[str]:
+    """Return every way in which a synced session is inconsistent with the template or with its own progress."""
+    failures = []
+    index, _, generation = template.snapshot()
+    if game.world_generation != generation:
+        failures.append(f"at generation {game.world_generation}, not {generation}")
+    seen = [item.name for item in player.inventory.items]
+    for loc_id, loc_data in index.locations.items():
+        location = game.get_location(loc_id)
+        if location.long_description != loc_data['long_description']:
+            failures.append(f"location {loc_id} has a stale description")
+        if defeated & set(location.enemies):
+            failures.append(f"defeated enemies {defeated & set(location.enemies)} are back at {loc_id}")
+        seen.extend(location.items)
+    duplicated = {name for name in seen if seen.count(name) > 1}
+    if duplicated:
+        failures.append(f"items {sorted(duplicated)} are duplicated")
+    for name, enemy_data in index.enemies.items():
+        if game.get_enemy(name).attack != enemy_data['attack']:
+            failures.append(f"enemy {name} has a stale attack")
+    if abs(player.inventory.current_weight - sum(item.weight for item in player.inventory.items)) > 1e-9:
+        failures.append("inventory weight is out of date")
+    return failures
+
+
+def stress_test(game_data_file: str, sessions: int = 200, turns: int = 200, reloads: int = 50,
+                threads: int = 4, seed: int = 0) -> StressReport:
+    """Play many sessions on a shared template in several threads while its game data file is
+    rewritten and reloaded by a WorldWatcher, then check every session against the final template.
+    """
+    import contextlib
+    from autosave import write_bytes_atomically
+    from game_entities import Inventory, Player
+
+    with open(game_data_file, 'r', encoding='utf-8') as f:
+        original = json.load(f)
+    report = StressReport(sessions)
+
+    with tempfile.TemporaryDirectory() as directory, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        filename = os.path.join(directory, "game_data.json")
+        write_bytes_atomically(filename, json.dumps(original).encode('utf-8'))
+        template = WorldTemplate(filename)
+        players = [(template.new_game(), Player(Inventory([], 10, 0.0), 5, 5, 0, skip_stats_selection=True), set())
+                   for _ in range(sessions)]
+
+        def play(start: int) -> None:
+            """Play every turn of every threads-th session, from start."""
+            rng = random.Random(seed + start)
+            for _ in range(turns):
+                for game, player, defeated in players[start::threads]:
+                    begin = perf_counter()
+                    if template.sync(game, player):
+                        report.sync_seconds.append(perf_counter() - begin)
+                    _play_turn(game, player, rng, defeated)
+
+        workers = [threading.Thread(target=play, args=(start,)) for start in range(threads)]
+        watcher = WorldWatcher(template, interval=0.001)
+        for worker in workers:
+            worker.start()
+        for revision in range(1, reloads + 1):
+            write_bytes_atomically(filename, json.dumps(_variant(original, revision)).encode('utf-8'))
+            sleep(0.005)
+        for worker in workers:
+            worker.join()
+        watcher.close()
+        watcher.check()  # in case the last write landed after the watcher's last check
+
+        report.reloads = watcher.reloads
+        report.reload_seconds = watcher.reload_seconds
+        report.turns = sessions * turns
+        for i, (game, player, defeated) in enumerate(players):
+            template.sync(game, player)
+            report.failures.extend(f"session {i}: {failure}"
+                                   for failure in _check_session(template, game, player, defeated))
+        report.diffs_kept = template.generation - template.oldest_generation
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Stress test hot reloading of game_data.json.")
+    parser.add_argument("--sessions", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--reloads", type=int, default=50)
+    args = parser.parse_args()
+
+    data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+    result = stress_test(data_file, args.sessions, args.turns, args.reloads)
+    print(f"{result.sessions} sessions, {result.turns} turns, {result.reloads} reloads")
+    print(f"Reload: {1000 * result.reload_seconds / max(result.reloads, 1):.3f} ms mean "
+          f"(no session is touched by a reload)")
+    print(f"Session sync: {1e6 * sum(result.sync_seconds) / max(len(result.sync_seconds), 1):.1f} us mean "
+          f"over {len(result.sync_seconds)} reconciliations")
+    print(f"{result.diffs_kept} of {result.reloads} diffs kept once every session had synced")
+    print(f"{len(result.failures)} inconsistencies" + "".join(f"\n  {failure}" for failure in result.failures[:20]))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
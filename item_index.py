@@ -0,0 +1,331 @@
+"""CSC111 Project 1: Text Adventure Game - Item Index
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the inverted index from each item to where it currently is in a
+game: at a location, in the player's inventory, or in the drop table of an enemy still guarding
+a location. Answering "where is this item?", checking whether the required items are at the
+win location, or adding up the points of the items placed at their targets then takes time
+independent of the size of the world, instead of a scan of every location.
+
+An AdventureGame builds its index the first time it is needed (see AdventureGame.get_item_index)
+and keeps it up to date on every take, drop, enemy drop and puzzle spawn. Changes that rewrite
+the whole world at once (loading a save, a hot reload, decoding a state) drop the index instead,
+so it is rebuilt from the world the next time it is needed. A game shared by several players
+(see shared_world.py) never builds one.
+
+Running this module checks that the index stays consistent with a scan of the world over random
+games, and compares the index with the scans it replaces in generated worlds of growing size.
+
+Usage:
+    python item_index.py [--runs N] [--world-sizes N ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import os
+import random
+from collections import Counter
+from typing import TYPE_CHECKING, Callable, Optional, Union
+
+from event_logger import EventList
+from game_entities import Player
+from state_codec import StateCodec
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+# The kinds of holder of an item
+LOCATION = "location"
+INVENTORY = "inventory"
+ENEMY = "enemy"
+
+# A holder of an item: (LOCATION, location ID), (ENEMY, enemy name) or INVENTORY_HOLDER
+Holder = tuple[str, Union[int, str, None]]
+
+# The holder of the items in the player's inventory
+INVENTORY_HOLDER: Holder = (INVENTORY, None)
+
+
+def at_location(loc_id: int) -> Holder:
+    """Return the holder of the items lying at the location with the given ID.
+
+    >>> at_location(12)
+    ('location', 12)
+    """
+    return LOCATION, loc_id
+
+
+def held_by_enemy(enemy_name: str) -> Holder:
+    """Return the holder of the items in the drop table of the named enemy.
+
+    >>> held_by_enemy("Giant Goose")
+    ('enemy', 'Giant Goose')
+    """
+    return ENEMY, enemy_name
+
+
+def format_holder(holder: Holder) -> str:
+    """Return a description of holder for people.
+
+    >>> format_holder(at_location(12))
+    'location 12'
+    >>> format_holder(INVENTORY_HOLDER)
+    "the player's inventory"
+    >>> format_holder(held_by_enemy("Giant Goose"))
+    'the drop table of Giant Goose'
+    """
+    kind, key = holder
+    if kind == LOCATION:
+        return f"location {key}"
+    elif kind == ENEMY:
+        return f"the drop table of {key}"
+    else:
+        return "the player's inventory"
+
+
+class ItemIndex:
+    """An inverted index from the name of each item to the holders of its copies in one game.
+
+    An item normally has one copy, but nothing in the game data forbids placing an item twice,
+    so every copy is indexed. The items in the drop table of an enemy are indexed only while the
+    enemy guards a location.
+
+    Instance Attributes:
+        - placed_points: The total target points of the items lying at their target locations.
+
+    Representation Invariants:
+        - all(holders != [] for holders in self._holders.values())
+    """
+    # Private Instance Attributes:
+    #   - _holders: the holder of each copy of each item that is anywhere in the game
+    #   - _targets: the holder at which each item of the game scores, and the points it scores there
+
+    placed_points: int
+    _holders: dict[str, list[Holder]]
+    _targets: dict[str, tuple[Holder, int]]
+
+    def __init__(self, game: AdventureGame, player: Player) -> None:
+        """Index the items of game and of the inventory of its player, by scanning the whole world."""
+        self.placed_points = 0
+        self._holders = {}
+        self._targets = {}
+        for name in game.get_item_names():
+            item = game.get_item(name)
+            self._targets[name] = (at_location(item.target_position), item.target_points)
+        for loc_id in game.get_location_ids():
+            location = game.get_location(loc_id)
+            for name in location.items:
+                self.add(name, at_location(loc_id))
+            for enemy_name in location.enemies:
+                enemy = game.get_enemy(enemy_name)
+                for name in enemy.items if enemy is not None else []:
+                    self.add(name, held_by_enemy(enemy_name))
+        for item in player.inventory.items:
+            self.add(item.name, INVENTORY_HOLDER)
+
+    def add(self, item_name: str, holder: Holder) -> None:
+        """Record that holder now holds a copy of the named item."""
+        self._holders.setdefault(item_name, []).append(holder)
+        self.placed_points += self._points(item_name, holder)
+
+    def remove(self, item_name: str, holder: Holder) -> None:
+        """Record that holder no longer holds a copy of the named item.
+
+        Preconditions:
+            - self.is_at(item_name, holder)
+        """
+        holders = self._holders[item_name]
+        holders.remove(holder)
+        if not holders:
+            del self._holders[item_name]
+        self.placed_points -= self._points(item_name, holder)
+
+    def move(self, item_name: str, source: Holder, destination: Holder) -> None:
+        """Record that a copy of the named item moved from source to destination.
+
+        Preconditions:
+            - self.is_at(item_name, source)
+        """
+        self.remove(item_name, source)
+        self.add(item_name, destination)
+
+    def _points(self, item_name: str, holder: Holder) -> int:
+        """Return the points scored by a copy of the named item held by holder."""
+        target, points = self._targets.get(item_name, (None, 0))
+        return points if holder == target else 0
+
+    def is_at(self, item_name: str, holder: Holder) -> bool:
+        """Return whether holder holds a copy of the named item."""
+        return holder in self._holders.get(item_name, ())
+
+    def holders(self, item_name: str) -> list[Holder]:
+        """Return the holder of each copy of the named item, or [] if it is nowhere in the game."""
+        return list(self._holders.get(item_name, ()))
+
+    def where(self, item_name: str) -> Optional[Holder]:
+        """Return the holder of the named item (of its first copy, if there are several), or None
+        if it is nowhere in the game (e.g. it was used up in combat, or not spawned yet).
+        """
+        holders = self._holders.get(item_name)
+        return holders[0] if holders else None
+
+    def differences(self, other: ItemIndex) -> list[str]:
+        """Return every way in which this index differs from other, ignoring the order of the copies."""
+        failures = []
+        for name in sorted(self._holders.keys() | other._holders.keys()):
+            mine, theirs = Counter(self._holders.get(name, ())), Counter(other._holders.get(name, ()))
+            if mine != theirs:
+                failures.append(f"{name} is indexed at {sorted(mine.elements())}, not {sorted(theirs.elements())}")
+        if self.placed_points != other.placed_points:
+            failures.append(f"{self.placed_points} points are indexed as placed, not {other.placed_points}")
+        return failures
+
+
+def check_item_index(game_data_file: str, runs: int = 200, inputs_per_run: int = 150, seed: int = 0) -> list[str]:
+    """Play the given number of games with random stats and random commands (see
+    fuzzer.check_random_games), and return every case in which a game's item index differs from
+    one built by scanning its world.
+
+    Each game first follows a random prefix of the winning walkthrough, so that enemies are
+    defeated, the stale bread is used up and the T-Card puzzle is solved, and then plays random
+    commands. The index is checked whenever the game asks for input. Now and then the game is
+    also saved, loaded back from an earlier save, or rewound to a state encoded earlier in the run
+    (see state_codec.py), so that the index is rebuilt after those changes too.
+    """
+    # Imported here because adventure imports this module, and fuzzer and simulation import adventure
+    from adventure import AdventureGame
+    from fuzzer import TURN_PROMPT, RandomRun, check_random_games
+    from simulation import WIN_WALKTHROUGH
+
+    codec = StateCodec(AdventureGame(game_data_file, 1))
+
+    def start_run(run: RandomRun) -> Callable[[str], list[str]]:
+        """Return the item index check of run."""
+        game, player, rng = run.game, run.player, run.rng
+        checkpoints = []
+
+        def check(prompt: str) -> list[str]:
+            """Check the game's item index, then now and then save, load or rewind the game between turns."""
+            failures = game.get_item_index(player).differences(ItemIndex(game, player))
+            checkpoints.append(codec.encode(game, player))
+            if prompt != TURN_PROMPT:
+                return failures
+            if rng.random() < 0.03:
+                game.save_game(run.save_file, player, EventList())
+            elif rng.random() < 0.03 and os.path.exists(run.save_file):
+                game.load_game(run.save_file, player, EventList())
+                run.restart_turn()
+            elif rng.random() < 0.03:
+                codec.decode(rng.choice(checkpoints), game, player)
+                run.restart_turn()
+            return failures
+
+        return check
+
+    return check_random_games(game_data_file, start_run, runs, inputs_per_run, seed, WIN_WALKTHROUGH)
+
+
+def _scan_holders(game: AdventureGame, player: Player, item_name: str) -> list[Holder]:
+    """Return the holders of the named item found by scanning the whole world, as done before the index."""
+    holders = [at_location(loc_id) for loc_id in game.get_location_ids()
+               if item_name in game.get_location(loc_id).items]
+    holders += [INVENTORY_HOLDER for item in player.inventory.items if item.name == item_name]
+    return holders
+
+
+def _scan_placed_points(game: AdventureGame) -> int:
+    """Return the points of the items at their target locations by scanning the whole world, as
+    AdventureGame.get_score did before the index.
+    """
+    points = 0
+    for loc_id in game.get_location_ids():
+        for name in game.get_location(loc_id).items:
+            item = game.get_item(name)
+            if item and item.target_position == loc_id:
+                points += item.target_points
+    return points
+
+
+def benchmark(game_data_file: str = "game_data.json", world_sizes: tuple[int, ...] = (1_000, 10_000, 100_000),
+              queries: int = 200) -> None:
+    """Print the time to find where an item is and to add up the placed points, by scanning the world
+    and with the index, in generated worlds of the given numbers of locations (see
+    world_validator.generate_world) in which the player has taken and dropped some items.
+    """
+    import contextlib
+    import io
+    from time import perf_counter
+    from adventure import AdventureGame
+    from game_entities import Inventory
+    from world_validator import generate_world
+
+    for size in world_sizes:
+        game = AdventureGame(game_data_file, 1, world_data=generate_world(size))
+        player = Player(Inventory([], 10, 0.0), 5, 5, 0, skip_stats_selection=True)
+        rng = random.Random(size)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for loc_id in rng.sample(game.get_location_ids(), min(size, 2000)):
+                game.current_location_id = loc_id
+                location = game.get_location()
+                if location.items and not location.enemies:
+                    game.take_item(player, game.get_item(location.items[0]))
+                if player.inventory.items and rng.random() < 0.5:
+                    game.drop_item(player, rng.choice(player.inventory.items))
+        names = [rng.choice(game.get_item_names()) for _ in range(queries)]
+        scans = max(queries * 1000 // size, 3)
+
+        start = perf_counter()
+        expected = [_scan_holders(game, player, name) for name in names[:scans]]
+        scan_where = (perf_counter() - start) / scans
+        start = perf_counter()
+        for _ in range(3):
+            points = _scan_placed_points(game)
+        scan_points = (perf_counter() - start) / 3
+
+        start = perf_counter()
+        index = game.get_item_index(player)
+        build = perf_counter() - start
+        start = perf_counter()
+        found = [index.holders(name) for name in names]
+        index_where = (perf_counter() - start) / queries
+        assert [sorted(holders) for holders in found[:scans]] == [sorted(holders) for holders in expected]
+        assert index.placed_points == points
+        print(f"{size:>8} locations: where {scan_where * 1e6:10.1f} us scanned, {index_where * 1e6:6.2f} us "
+              f"indexed; placed points {scan_points * 1e3:8.2f} ms scanned, O(1) indexed; "
+              f"index built in {build * 1e3:.1f} ms")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Check the item index and compare it with scanning the world.")
+    parser.add_argument("--game-data", default="game_data.json")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--world-sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    index_failures = check_item_index(args.game_data, runs=args.runs, seed=args.seed)
+    print(f"Item index over random command streams: {len(index_failures)} failures")
+    for failure in index_failures[:10]:
+        print("   ", failure)
+    benchmark(args.game_data, tuple(args.world_sizes))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
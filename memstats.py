@@ -0,0 +1,342 @@
+"""CSC111 Project 1: Text Adventure Game - Memory Accounting
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module measures what a hosted session costs in memory. It walks the object graph of
+a session's AdventureGame, Player and EventList, counting every object once (with sys.getsizeof)
+in the first category it is reached from:
+    - world overlay: the session's own locations, items and enemies, and its initial world,
+    - inventory: the player, their inventory and stats,
+    - event log: the events and indexes of the session's log,
+    - caches: the render cache, open hint tables and move distances,
+    - other: the rest of the game object.
+Objects shared by every session (such as the description strings of the game data, which each
+game built from the same parsed data refers to rather than copies) are not charged to any of
+them: they are found by walking a reference session first, as anything a session has in common
+with a different session is shared. Sizes can also be measured with tracemalloc, which counts
+the allocations made while building something and so checks the walk.
+
+memstats(manager) reports the memory of every resident session of a SessionManager (see
+sessions.py), which the admin "memstats" command prints (see admin.py) and dump_memstats writes
+as JSON. Running this module benchmarks the bytes per session and per event, and compares them
+with the entries recorded for earlier versions of the engine in memstats_history.json.
+
+Usage:
+    python memstats.py [--sessions N] [--tracemalloc] [--record]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import gc
+import json
+import os
+import sys
+import tracemalloc
+import types
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Iterable
+
+from autosave import write_bytes_atomically
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+    from event_logger import EventList
+    from game_entities import Player
+    from sessions import SessionManager
+
+# The categories memory is reported in, in the order objects are assigned to them.
+WORLD = "world overlay"
+INVENTORY = "inventory"
+EVENT_LOG = "event log"
+CACHES = "caches"
+OTHER = "other"
+CATEGORIES = (WORLD, INVENTORY, EVENT_LOG, CACHES, OTHER)
+
+# The category of each attribute of AdventureGame; any other attribute counts as OTHER.
+GAME_ATTRIBUTE_CATEGORIES = {
+    '_locations': WORLD,
+    '_items': WORLD,
+    '_enemies': WORLD,
+    '_initial_world': WORLD,
+    'world_clock': WORLD,
+    'render_cache': CACHES,
+    'item_index': CACHES,
+    '_hint_tables': CACHES,
+    '_distances': CACHES,
+}
+
+# The file recording the benchmark's results for each version of the engine.
+HISTORY_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "memstats_history.json")
+
+# The relative growth in bytes per session or per event over the last recorded entry reported as a regression.
+REGRESSION_THRESHOLD = 0.10
+
+# Objects that are part of the program rather than of any session's data.
+_PROGRAM_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType, types.MethodType,
+                  types.CodeType)
+
+
+@dataclass
+class MemoryReport:
+    """The memory of one or more sessions, by category.
+
+    Instance Attributes:
+        - sessions: The number of sessions measured.
+        - events: The number of events in their logs.
+        - bytes: The number of bytes in each category.
+        - objects: The number of objects in each category.
+
+    Representation Invariants:
+        - set(self.bytes) == set(self.objects) == set(CATEGORIES)
+    """
+    sessions: int = 0
+    events: int = 0
+    bytes: dict[str, int] = field(default_factory=lambda: dict.fromkeys(CATEGORIES, 0))
+    objects: dict[str, int] = field(default_factory=lambda: dict.fromkeys(CATEGORIES, 0))
+
+    def total(self) -> int:
+        """Return the number of bytes over every category."""
+        return sum(self.bytes.values())
+
+    def bytes_per_session(self) -> float:
+        """Return the average number of bytes of a session, or 0.0 if no session was measured."""
+        return self.total() / self.sessions if self.sessions else 0.0
+
+    def bytes_per_event(self) -> float:
+        """Return the average number of bytes of the event log per event, or 0.0 if there are no events."""
+        return self.bytes[EVENT_LOG] / self.events if self.events else 0.0
+
+    def add(self, other: MemoryReport) -> None:
+        """Add the sessions measured by other to this report.
+
+        >>> report = MemoryReport(1, 10, {**dict.fromkeys(CATEGORIES, 0), EVENT_LOG: 1000})
+        >>> report.add(report)
+        >>> report.total(), report.bytes_per_event()
+        (2000, 100.0)
+        """
+        self.sessions += other.sessions
+        self.events += other.events
+        for category in CATEGORIES:
+            self.bytes[category] += other.bytes[category]
+            self.objects[category] += other.objects[category]
+
+    def to_data(self) -> dict:
+        """Return this report as a dictionary of plain values, for a machine-readable dump."""
+        return {'sessions': self.sessions, 'events': self.events, 'total_bytes': self.total(),
+                'bytes_per_session': round(self.bytes_per_session(), 1),
+                'bytes_per_event': round(self.bytes_per_event(), 1),
+                'bytes': dict(self.bytes), 'objects': dict(self.objects)}
+
+    def format(self) -> str:
+        """Return this report as a table of categories."""
+        lines = [f"{'category':<16}{'bytes':>14}{'objects':>11}{'per session':>14}"]
+        for category in CATEGORIES:
+            per_session = self.bytes[category] / self.sessions if self.sessions else 0.0
+            lines.append(f"{category:<16}{self.bytes[category]:>14,}{self.objects[category]:>11,}{per_session:>14,.0f}")
+        lines.append(f"{'total':<16}{self.total():>14,}{sum(self.objects.values()):>11,}"
+                     f"{self.bytes_per_session():>14,.0f}")
+        lines.append(f"{self.sessions} sessions, {self.events} events, {self.bytes_per_event():.0f} bytes per event")
+        return "\n".join(lines)
+
+
+def _walk(roots: Iterable[Any], seen: set[int]) -> tuple[int, int]:
+    """Return the total size and number of the objects reachable from roots that are not in seen,
+    not reached through an object in seen, and not part of the program, adding their ids to seen.
+    """
+    size = count = 0
+    stack = list(roots)
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen or obj is None or isinstance(obj, (bool, *_PROGRAM_TYPES)) or \
+                (type(obj) is int and -5 <= obj <= 256):  # None, booleans and small ints are shared by every object
+            continue
+        seen.add(id(obj))
+        size += sys.getsizeof(obj)
+        count += 1
+        stack.extend(gc.get_referents(obj))
+    return size, count
+
+
+def shared_ids(*roots: Any) -> set[int]:
+    """Return the ids of every object reachable from roots, to be left out of later measurements."""
+    seen = set()
+    _walk(roots, seen)
+    return seen
+
+
+def measure_session(game: AdventureGame, player: Player, game_log: EventList,
+                    shared: Iterable[int] = ()) -> MemoryReport:
+    """Return the memory of one session, by category, leaving out the objects whose ids are in shared.
+
+    The objects must not be changed while they are measured.
+    """
+    report = MemoryReport(sessions=1, events=len(game_log))
+    seen = set(shared)
+    attributes = vars(game)
+    roots = {category: [value for name, value in attributes.items() if GAME_ATTRIBUTE_CATEGORIES.get(name) == category]
+             for category in (WORLD, CACHES)}
+    roots[INVENTORY] = [player]
+    roots[EVENT_LOG] = [game_log]
+    roots[OTHER] = [game] + [value for name, value in attributes.items() if name not in GAME_ATTRIBUTE_CATEGORIES]
+    for category in CATEGORIES:
+        report.bytes[category], report.objects[category] = _walk(roots[category], seen)
+    return report
+
+
+def measure_allocation(build: Callable[[], Any]) -> tuple[int, Any]:
+    """Return the number of bytes allocated by build() and still held once it returns, measured
+    with tracemalloc, and what build() returned.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        gc.collect()
+        start = tracemalloc.get_traced_memory()[0]
+        built = build()
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0] - start, built
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+
+
+def memstats(manager: SessionManager, session_ids: Iterable[str] = ()) -> MemoryReport:
+    """Return the memory of the resident sessions of manager with the given IDs, or of all of
+    them if no ID is given. Hibernated sessions are not measured (see the manager's spill store).
+    """
+    wanted = set(session_ids)
+    report = MemoryReport()
+    shared = shared_ids(*manager.new_session_state())
+    for session in manager.resident_sessions():
+        if not wanted or session.session_id in wanted:
+            report.add(measure_session(session.game, session.player, session.game_log, shared))
+    return report
+
+
+def memstats_data(manager: SessionManager, session_ids: Iterable[str] = ()) -> dict:
+    """Return memstats(manager, session_ids) and the state of the manager's memory budget and
+    spill store, as a dictionary of plain values.
+    """
+    return {'resident': memstats(manager, session_ids).to_data(),
+            'resident_sessions': manager.resident_count(),
+            'hibernated_sessions': len(manager.store),
+            'estimated_resident_bytes': manager.resident_bytes,
+            'memory_budget': manager.memory_budget,
+            'spill_live_bytes': manager.store.live_bytes,
+            'spill_file_bytes': manager.store.size()}
+
+
+def dump_memstats(manager: SessionManager, filename: str, session_ids: Iterable[str] = ()) -> None:
+    """Write memstats_data(manager, session_ids) to filename as JSON."""
+    write_bytes_atomically(filename, json.dumps(memstats_data(manager, session_ids), indent=2).encode('utf-8'))
+
+
+def read_history(filename: str = HISTORY_FILE) -> list[dict]:
+    """Return the benchmark results recorded in filename, oldest first, or [] if there is none."""
+    try:
+        with open(filename, 'r') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return []
+
+
+def benchmark(game_data_file: str, sessions: int = 1000, max_turns: int = 200, check_tracemalloc: bool = False,
+              seed: int = 0) -> dict:
+    """Open the given number of sessions, play up to max_turns random turns in each, and return the
+    bytes per session and per event measured by memstats, printing the full report.
+
+    If check_tracemalloc, the sessions are also measured with tracemalloc, for comparison.
+    """
+    import contextlib
+    import random
+    import tempfile
+    from scheduler import run_command
+    from sessions import SessionManager
+
+    rng = random.Random(seed)
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        manager = SessionManager(game_data_file, os.path.join(temp_dir, "sessions.spill"),
+                                 idle_timeout=float('inf'), memory_budget=2 ** 62)
+
+        def play() -> None:
+            for i in range(sessions):
+                session_id = f"s{i}"
+                manager.open(session_id, (rng.randint(1, 5), rng.randint(1, 5), rng.randint(0, 4)))
+                with manager.use(session_id) as session:
+                    for _ in range(rng.randint(0, max_turns)):
+                        location = session.game.get_location()
+                        run_command(session, rng.choice([command for command in location.available_commands
+                                                         if command.startswith("go")]), "")
+
+        traced, _ = measure_allocation(play) if check_tracemalloc else (None, play())
+        report = memstats(manager)
+        manager.shutdown()
+
+    fixed = (report.total() - report.bytes[EVENT_LOG]) / report.sessions
+    print(report.format())
+    print(f"bytes per session without its log: {fixed:,.0f}; bytes per event: {report.bytes_per_event():.1f}")
+    if traced is not None:
+        print(f"tracemalloc: {traced:,} bytes held by the sessions ({traced / report.sessions:,.0f} per session), "
+              f"against {report.total():,} from the object walk")
+    return {'bytes_per_session': round(fixed), 'bytes_per_event': round(report.bytes_per_event(), 1),
+            'bytes': {category: round(size / report.sessions) for category, size in report.bytes.items()}}
+
+
+def compare_with_history(result: dict, history: list[dict]) -> list[str]:
+    """Return a line for each of bytes per session and per event that grew by more than
+    REGRESSION_THRESHOLD since the last entry of history.
+
+    >>> compare_with_history({'bytes_per_session': 1200, 'bytes_per_event': 100},
+    ...                      [{'engine': 'abc', 'bytes_per_session': 1000, 'bytes_per_event': 100}])
+    ['bytes_per_session grew 20% since engine abc (1000 -> 1200)']
+    """
+    if not history:
+        return []
+    last = history[-1]
+    return [f"{key} grew {result[key] / last[key] - 1:.0%} since engine {last['engine']} ({last[key]} -> {result[key]})"
+            for key in ('bytes_per_session', 'bytes_per_event')
+            if last[key] and result[key] > last[key] * (1 + REGRESSION_THRESHOLD)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    import time
+    from sim_cache import engine_version
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Benchmark the memory of hosted sessions.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--tracemalloc", action="store_true", help="also measure the sessions with tracemalloc")
+    parser.add_argument("--record", action="store_true", help=f"record the result in {HISTORY_FILE}")
+    args = parser.parse_args()
+
+    benchmark_result = benchmark(args.game_data, args.sessions, check_tracemalloc=args.tracemalloc)
+    past = read_history()
+    for regression in compare_with_history(benchmark_result, past):
+        print("REGRESSION:", regression)
+    if args.record:
+        entry = {'engine': engine_version()[:12], 'recorded': time.strftime("%Y-%m-%d"), **benchmark_result}
+        past = [old for old in past if old['engine'] != entry['engine']] + [entry]
+        write_bytes_atomically(HISTORY_FILE, (json.dumps(past, indent=2) + "\n").encode('utf-8'))
+        print(f"Recorded for engine {entry['engine']} in {HISTORY_FILE}")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
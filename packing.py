@@ -0,0 +1,158 @@
+"""CSC111 Project 1: Text Adventure Game - Inventory Packing
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the knapsack solver behind the `pack` command, which
+chooses the best set of items to carry under the inventory's weight limit.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from itertools import combinations
+from math import ceil, floor
+
+from game_entities import Item
+
+# Item weights are given to one decimal place, so scaling by 10 makes every weight an integer.
+WEIGHT_SCALE = 10
+
+# Value added for each point of healing or damage an item provides in combat.
+COMBAT_STRENGTH_VALUE = 5
+
+# Flat value for any item usable in combat (e.g. stale bread has 0 strength but beats the Goose).
+COMBAT_USE_VALUE = 10
+
+# Value of an item required to win; larger than any possible sum of the other values.
+REQUIRED_VALUE = 1_000_000
+
+
+def item_value(item: Item, required: bool) -> int:
+    """Return how much the player should want to carry the given item.
+
+    The value combines the item's target points, its combat utility and whether
+    it is one of the items required to win.
+
+    >>> bread = Item("stale bread", "", 3, 4, 0, 0.5, 2, 0)
+    >>> item_value(bread, False)
+    10
+    >>> item_value(bread, True)
+    1000010
+    """
+    value = item.target_points
+    if item.combat_use != 0:
+        value += COMBAT_USE_VALUE + COMBAT_STRENGTH_VALUE * item.strength
+    if required:
+        value += REQUIRED_VALUE
+    return value
+
+
+def scaled_weight(weight: float) -> int:
+    """Return the given weight as an integer number of 1/WEIGHT_SCALE units, rounded up.
+
+    Rounding up guarantees a set that fits in scaled units also fits in real units.
+
+    >>> scaled_weight(0.2)
+    2
+    >>> scaled_weight(3)
+    30
+    """
+    return ceil(round(weight * WEIGHT_SCALE, 6))
+
+
+def best_pack(weights: list[int], values: list[int], capacity: int) -> list[int]:
+    """Return the indices of the subset with the largest total value whose total weight is at most capacity.
+
+    Uses the standard 0/1 knapsack dynamic program, which runs in O(len(weights) * capacity)
+    time. The returned indices are in increasing order.
+
+    Preconditions:
+        - len(weights) == len(values)
+        - all(w >= 0 for w in weights)
+        - capacity >= 0
+
+    >>> best_pack([3, 4, 5], [30, 50, 60], 8)
+    [0, 2]
+    >>> best_pack([10], [5], 3)
+    []
+    """
+    best = [0] * (capacity + 1)
+    # taken[i][c] records whether item i was taken to reach the best value at capacity c
+    taken = []
+
+    for weight, value in zip(weights, values):
+        row = bytearray(capacity + 1)
+        for c in range(capacity, weight - 1, -1):
+            candidate = best[c - weight] + value
+            if candidate > best[c]:
+                best[c] = candidate
+                row[c] = 1
+        taken.append(row)
+
+    chosen = []
+    c = capacity
+    for i in range(len(weights) - 1, -1, -1):
+        if taken[i][c]:
+            chosen.append(i)
+            c -= weights[i]
+    chosen.reverse()
+    return chosen
+
+
+def brute_force_pack(weights: list[int], values: list[int], capacity: int) -> int:
+    """Return the best total value achievable under capacity by trying every subset.
+
+    Only practical for a handful of items; used to check best_pack.
+
+    >>> import random
+    >>> rng = random.Random(111)
+    >>> for _ in range(200):
+    ...     n = rng.randint(0, 8)
+    ...     ws = [rng.randint(0, 12) for _ in range(n)]
+    ...     vs = [rng.randint(0, 40) for _ in range(n)]
+    ...     cap = rng.randint(0, 30)
+    ...     chosen = best_pack(ws, vs, cap)
+    ...     assert sum(ws[i] for i in chosen) <= cap
+    ...     assert sum(vs[i] for i in chosen) == brute_force_pack(ws, vs, cap)
+    """
+    best = 0
+    for size in range(len(weights) + 1):
+        for subset in combinations(range(len(weights)), size):
+            if sum(weights[i] for i in subset) <= capacity:
+                best = max(best, sum(values[i] for i in subset))
+    return best
+
+
+def choose_items(candidates: list[Item], weight_limit: float, required: set[str]) -> list[Item]:
+    """Return the items from candidates that should be carried to get the most value under weight_limit.
+
+    >>> light = Item("t-card", "", -1, 8, 50, 0.1, 0, 0)
+    >>> heavy = Item("redbull", "", 7, 8, 100, 5, 1, 5)
+    >>> mug = Item("lucky mug", "", -1, 4, 5, 1.5, 1, 3)
+    >>> [item.name for item in choose_items([light, heavy, mug], 5, {"lucky mug"})]
+    ['t-card', 'lucky mug']
+    """
+    weights = [scaled_weight(item.weight) for item in candidates]
+    values = [item_value(item, item.name in required) for item in candidates]
+    capacity = floor(round(weight_limit * WEIGHT_SCALE, 6))
+    return [candidates[i] for i in best_pack(weights, values, capacity)]
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,184 @@
+"""CSC111 Project 1: Text Adventure Game - Production Launcher
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module is the production entry point for the game. Unlike running
+adventure.py directly, it does not run python_ta when just playing and only
+imports the game modules once it is about to start the game.
+
+Usage:
+    python play.py                      Play the game.
+    python play.py --profile            Print an import-time breakdown and the time to the first prompt.
+    python play.py --bench [--budget-ms N] [--runs N]
+                                        Measure the median time to the first prompt and exit with
+                                        status 1 if it exceeds the budget.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+import os
+import sys
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+GAME_DATA_FILE = os.path.join(SCRIPT_DIR, "game_data.json")
+SAVE_FILE = "save_game.sav"
+
+# Default budget for the time from process start to the first input prompt.
+DEFAULT_BUDGET_MS = 500.0
+
+# Printed by the probe process once the game first asks for input.
+FIRST_PROMPT_MARKER = "__FIRST_PROMPT__"
+
+
+def play() -> None:
+    """Start the game, importing the engine only now."""
+    from adventure import run_game
+    run_game(GAME_DATA_FILE, SAVE_FILE)
+
+
+def play_recorded(record_file: str) -> None:
+    """Start the game, recording every input of the session to record_file (see replay.py)."""
+    from replay import record_game
+    record_game(GAME_DATA_FILE, SAVE_FILE, record_file)
+
+
+def _probe() -> None:
+    """Start the game and exit as soon as it first asks for input.
+
+    Run in a child process by time_to_first_prompt, which measures how long this takes.
+    """
+    import builtins
+
+    def first_prompt(prompt: str = "") -> str:
+        """Report that the game is ready for input and stop."""
+        sys.stdout.write(f"\n{FIRST_PROMPT_MARKER}\n")
+        sys.stdout.flush()
+        raise SystemExit(0)
+
+    builtins.input = first_prompt
+    play()
+
+
+def _run_probe(importtime: bool = False) -> tuple[float, str]:
+    """Run the probe in a fresh interpreter and return (milliseconds to first prompt, stderr).
+
+    The measured time covers interpreter start-up, every import and game initialization.
+    """
+    import subprocess
+    import time
+
+    args = [sys.executable]
+    if importtime:
+        args += ["-X", "importtime"]
+    args += [os.path.abspath(__file__), "--probe"]
+
+    start = time.perf_counter()
+    result = subprocess.run(args, capture_output=True, text=True, cwd=SCRIPT_DIR, check=False)
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    if FIRST_PROMPT_MARKER not in result.stdout:
+        raise RuntimeError(f"The game did not reach its first prompt:\n{result.stderr}")
+    return elapsed_ms, result.stderr
+
+
+def time_to_first_prompt(runs: int = 5) -> float:
+    """Return the median time, in milliseconds, from process start to the game's first prompt."""
+    times = sorted(_run_probe()[0] for _ in range(runs))
+    return times[len(times) // 2]
+
+
+def import_breakdown(stderr: str) -> list[tuple[str, int, int]]:
+    """Return (module, self microseconds, cumulative microseconds) for each import in -X importtime output.
+
+    The result is sorted by cumulative time, slowest first.
+
+    >>> sample = '''import time: self [us] | cumulative | imported package
+    ... import time:       120 |        120 |   _io
+    ... import time:       300 |        900 | json'''
+    >>> import_breakdown(sample)
+    [('json', 300, 900), ('_io', 120, 120)]
+    """
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "imported package" in line:
+            continue
+        self_us, cumulative_us, module = line[len("import time:"):].split("|")
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    rows.sort(key=lambda row: row[2], reverse=True)
+    return rows
+
+
+def profile_startup(top: int = 15) -> None:
+    """Print the slowest imports and the time to the first prompt of a cold start."""
+    elapsed_ms, stderr = _run_probe(importtime=True)
+    rows = import_breakdown(stderr)
+
+    print(f"{'module':<40}{'self (ms)':>12}{'cumulative (ms)':>18}")
+    for module, self_us, cumulative_us in rows[:top]:
+        print(f"{module:<40}{self_us / 1000:>12.2f}{cumulative_us / 1000:>18.2f}")
+    print(f"\nTotal import time: {sum(row[1] for row in rows) / 1000:.2f} ms over {len(rows)} modules")
+    print(f"Time to first prompt (with -X importtime overhead): {elapsed_ms:.1f} ms")
+
+
+def benchmark(budget_ms: float = DEFAULT_BUDGET_MS, runs: int = 5) -> bool:
+    """Print the median time to first prompt and return whether it is within budget_ms."""
+    median_ms = time_to_first_prompt(runs)
+    within_budget = median_ms <= budget_ms
+    print(f"Time to first prompt: {median_ms:.1f} ms (median of {runs}, budget {budget_ms:.1f} ms) - "
+          f"{'OK' if within_budget else 'OVER BUDGET'}")
+    return within_budget
+
+
+def main(argv: list[str]) -> int:
+    """Run the launcher with the given command-line arguments and return the exit status."""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Launch the UofT Adventure.")
+    parser.add_argument("--profile", action="store_true", help="print a cold-start profile")
+    parser.add_argument("--bench", action="store_true", help="check the time to first prompt against a budget")
+    parser.add_argument("--budget-ms", type=float, default=DEFAULT_BUDGET_MS)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--record", metavar="FILE", help="record the session to FILE for replay.py")
+    parser.add_argument("--probe", action="store_true", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.probe:
+        _probe()
+    elif args.profile:
+        profile_startup()
+    elif args.bench:
+        return 0 if benchmark(args.budget_ms, args.runs) else 1
+    elif args.record:
+        play_recorded(args.record)
+    else:
+        play()
+    return 0
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 1:
+        # Fast path: skip argparse, doctest and python_ta entirely when just playing
+        play()
+    else:
+        # Run after main, so that --probe exits at the first prompt before doctest is even imported
+        exit_status = main(sys.argv[1:])
+
+        import doctest
+        doctest.testmod()
+
+        import python_ta
+        python_ta.check_all(config={
+            'max-line-length': 120,
+            'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+        })
+
+        sys.exit(exit_status)
@@ -0,0 +1,609 @@
+"""CSC111 Project 1: Text Adventure Game - Hint Tables
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module precomputes, for every legal stat allocation, the best next action from
+every state of the shipped world that the player can reach, and stores it in a hint table
+file. The game memory-maps the table for the player's stats and answers the 'hint' command
+with a single hash lookup, without searching at runtime.
+
+A state is the player's location, their inventory (a bitset over item names), the items at
+each location (one bitset per location), the enemies remaining (a bitset over enemies) and
+the player's health. The best action is the first action of a winning path with the fewest
+steps (and, among those, the fewest commands), found by exploring every reachable state and
+running Dijkstra's algorithm backwards from the winning states.
+
+The model of the game is deliberately narrow: fights are resolved with Enemy.fight_outcome
+(the player attacks every turn), except that stale bread is always used on the Giant Goose;
+healing items, fleeing and drops that cannot help win are not modelled. States outside the
+model have no hint.
+
+A hint table file is a header, a JSON metadata block (the world it was built for and the
+orderings its bitsets use) and an open-addressing hash table of fixed-size slots, each
+holding a 64-bit state key, an action index and the number of steps to win.
+
+Usage:
+    python policy.py [--workers N]      Build the hint tables for every stat allocation.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+import heapq
+import json
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Optional, TYPE_CHECKING
+
+from autosave import write_bytes_atomically
+from game_entities import Enemy, FightOutcome, Player
+from packing import WEIGHT_SCALE, scaled_weight
+from puzzles import BREAD, GOOSE, PUZZLE_ITEM, PUZZLE_LOCATION_ID, PUZZLE_REWARD, PUZZLE_REWARD_LOCATION_ID
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+HINT_TABLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "hint_tables")
+
+# The first bytes of every hint table file.
+MAGIC = b"UCAH"
+FORMAT_VERSION = 1
+
+# Magic number, format version, speed, attack, defense, slot count, entry count, metadata length.
+_HEADER = struct.Struct("<4sBBBBIII")
+
+# State key (0 marks an empty slot), action index, steps to win.
+_SLOT = struct.Struct("<QHH")
+
+# Every stat allocation spends exactly this many points, with no stat above MAX_STAT.
+STAT_POINTS = 10
+MAX_STAT = 5
+
+# Path costs are steps * _STEP_COST + commands, so that fewer steps always wins and
+# fewer commands breaks ties (take and drop cost no steps).
+_STEP_COST = 1024
+
+# (location ID, inventory bits, item bits of each location, enemies remaining bits, health)
+State = tuple[int, int, tuple[int, ...], int, int]
+
+
+class HintTableError(Exception):
+    """Raised when a hint table file is damaged or in an unknown format."""
+
+
+def stat_allocations() -> list[tuple[int, int, int]]:
+    """Return every legal (speed, attack, defense) allocation.
+
+    >>> len(stat_allocations())
+    21
+    >>> (5, 5, 0) in stat_allocations() and (4, 4, 2) in stat_allocations()
+    True
+    """
+    return [(speed, attack, STAT_POINTS - speed - attack)
+            for speed in range(MAX_STAT + 1)
+            for attack in range(MAX_STAT + 1)
+            if 0 <= STAT_POINTS - speed - attack <= MAX_STAT]
+
+
+def hint_table_path(stats: tuple[int, int, int], directory: str = HINT_TABLE_DIR) -> str:
+    """Return the path of the hint table file for the given (speed, attack, defense).
+
+    >>> os.path.basename(hint_table_path((5, 5, 0)))
+    'policy_5_5_0.tbl'
+    """
+    return os.path.join(directory, "policy_{}_{}_{}.tbl".format(*stats))
+
+
+def state_key(state: State) -> int:
+    """Return the 64-bit hash of the given state. The result is never 0, which marks an empty slot.
+
+    >>> state_key((1, 0, (1, 2), 15, 10)) == state_key((1, 0, (1, 2), 15, 10))
+    True
+    >>> state_key((1, 0, (1, 2), 15, 10)) == state_key((1, 0, (2, 1), 15, 10))
+    False
+    """
+    location_id, inventory, location_items, enemies, health = state
+    data = struct.pack(f"<HQ{len(location_items)}QQH", location_id, inventory, *location_items, enemies, health)
+    return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little') or 1
+
+
+def _bits(indices: dict[str, int], names: list[str]) -> Optional[int]:
+    """Return the bitset of the given names, or None if any of them is not in indices."""
+    result = 0
+    for name in names:
+        if name not in indices:
+            return None
+        result |= 1 << indices[name]
+    return result
+
+
+class WorldModel:
+    """The shipped world reduced to what matters for finding the fastest win, for one stat allocation.
+
+    Instance Attributes:
+        - stats: The player's (speed, attack, defense).
+        - location_ids: Every location ID, in the order of a state's item bitsets.
+        - item_names: Every item name, in bit order.
+        - enemies: (location ID, enemy name) of every enemy in the world, in bit order.
+        - actions: Every action that appears in the model; actions are stored by index.
+        - start: The state at the start of a new game.
+
+    Representation Invariants:
+        - len(self.item_names) <= 64
+        - len(self.enemies) <= 64
+    """
+    stats: tuple[int, int, int]
+    location_ids: list[int]
+    item_names: list[str]
+    enemies: list[tuple[int, str]]
+    actions: list[str]
+    start: State
+
+    # Private Instance Attributes:
+    #   - _location_index: location ID -> position in location_ids
+    #   - _exits: location ID -> its (command, destination) pairs
+    #   - _weights: the scaled weight of each item, by bit
+    #   - _weight_limit: the scaled inventory weight limit
+    #   - _enemy_objects: the Enemy of each enemy bit, at full health
+    #   - _enemy_drops: the item bits dropped by each enemy
+    #   - _required: the bits of the items that must be at the win location
+    #   - _bread: the bit of the stale bread (0 if the world has none)
+    #   - _puzzle_item: the bit of the item that solves the T-Card puzzle
+    #   - _puzzle_reward: the bit of the item the puzzle spawns
+    #   - _win_index: the position of the win location in location_ids
+    #   - _action_ids: action -> index in actions
+    #   - _fights: (enemy bit, health) -> the fight's outcome
+    _location_index: dict[int, int]
+    _exits: dict[int, list[tuple[str, int]]]
+    _weights: list[int]
+    _weight_limit: int
+    _enemy_objects: list[Enemy]
+    _enemy_drops: list[int]
+    _required: int
+    _bread: int
+    _puzzle_item: int
+    _puzzle_reward: int
+    _win_index: int
+    _action_ids: dict[str, int]
+    _fights: dict[tuple[int, int], Optional[FightOutcome]]
+
+    def __init__(self, game: AdventureGame, stats: tuple[int, int, int], required_items: list[str],
+                 win_location_id: int, weight_limit: float = 10, health: int = 10) -> None:
+        """Build the model of a freshly loaded game for a player with the given stats."""
+        self.stats = stats
+        self.location_ids = sorted(game.get_initial_world())
+        self.item_names = sorted(game.get_item_names())
+        item_index = {name: bit for bit, name in enumerate(self.item_names)}
+        self._location_index = {loc_id: i for i, loc_id in enumerate(self.location_ids)}
+
+        self._exits = {}
+        location_items = []
+        self.enemies = []
+        for loc_id in self.location_ids:
+            location = game.get_location(loc_id)
+            self._exits[loc_id] = [(command, dest) for command, dest in location.available_commands.items()
+                                   if command.startswith("go")]
+            location_items.append(_bits(item_index, location.items))
+            self.enemies.extend((loc_id, name) for name in location.enemies)
+
+        self._weights = [scaled_weight(game.get_item(name).weight) for name in self.item_names]
+        self._weight_limit = round(weight_limit * WEIGHT_SCALE)
+        self._enemy_objects = [game.get_enemy(name) for _, name in self.enemies]
+        self._enemy_drops = [_bits(item_index, enemy.items) for enemy in self._enemy_objects]
+        self._required = _bits(item_index, required_items)
+        self._win_index = self._location_index[win_location_id]
+        self._bread = 1 << item_index[BREAD] if BREAD in item_index else 0
+        self._puzzle_item = 1 << item_index[PUZZLE_ITEM]
+        self._puzzle_reward = 1 << item_index[PUZZLE_REWARD]
+        self.actions = []
+        self._action_ids = {}
+        self._fights = {}
+        self.start = (game.current_location_id, 0, tuple(location_items), (1 << len(self.enemies)) - 1, health)
+
+    def _action(self, action: str) -> int:
+        """Return the index of the given action, adding it if it is new."""
+        if action not in self._action_ids:
+            self._action_ids[action] = len(self.actions)
+            self.actions.append(action)
+        return self._action_ids[action]
+
+    def _fight(self, enemy_bit: int, health: int) -> Optional[FightOutcome]:
+        """Return the outcome of attacking the given enemy every turn with the given health."""
+        if (enemy_bit, health) not in self._fights:
+            _, attack, defense = self.stats
+            self._fights[(enemy_bit, health)] = self._enemy_objects[enemy_bit].fight_outcome(attack, defense, health)
+        return self._fights[(enemy_bit, health)]
+
+    def _arrive(self, state: State, dest: int) -> Optional[tuple[State, int]]:
+        """Return the state after moving to dest and fighting its enemies, and the steps it took.
+
+        Return None if the player would not survive.
+        """
+        _, inventory, location_items, enemies, health = state
+        step_cost = 6 - self.stats[0]
+        steps = step_cost
+        dest_index = self._location_index[dest]
+        items = list(location_items)
+        for bit in reversed(range(len(self.enemies))):
+            if self.enemies[bit][0] != dest or not enemies >> bit & 1:
+                continue
+            if self._enemy_objects[bit].name == GOOSE and inventory & self._bread:
+                inventory &= ~self._bread
+            else:
+                outcome = self._fight(bit, health)
+                if outcome is None or not outcome.player_survives:
+                    return None
+                health -= outcome.damage_taken
+                steps += outcome.enemy_turns * step_cost
+            enemies &= ~(1 << bit)
+            items[dest_index] |= self._enemy_drops[bit]
+        return (dest, inventory, tuple(items), enemies, health), steps
+
+    def successors(self, state: State) -> list[tuple[int, Optional[State], int]]:
+        """Return (action index, next state, steps) for every modelled action from state.
+
+        The next state is None when the action wins the game.
+        """
+        location_id, inventory, location_items, enemies, health = state
+        index = self._location_index[location_id]
+        result = []
+
+        for command, dest in self._exits[location_id]:
+            arrival = self._arrive(state, dest)
+            if arrival is not None:
+                result.append((self._action(command), arrival[0], arrival[1]))
+
+        weight = sum(self._weights[bit] for bit in range(len(self.item_names)) if inventory >> bit & 1)
+        for bit, name in enumerate(self.item_names):
+            mask = 1 << bit
+            if location_items[index] & mask and weight + self._weights[bit] <= self._weight_limit:
+                items = list(location_items)
+                items[index] &= ~mask
+                result.append((self._action(f"take {name}"),
+                               (location_id, inventory | mask, tuple(items), enemies, health), 0))
+            elif inventory & mask:
+                if self._is_winning_drop(state, mask):
+                    result.append((self._action(f"drop {name}"), None, 0))
+                else:
+                    drop = self._drop(state, mask)
+                    if drop is not None:
+                        result.append((self._action(f"drop {name}"), drop, 0))
+        return result
+
+    def _is_winning_drop(self, state: State, mask: int) -> bool:
+        """Return whether dropping the item with the given bit mask in state wins the game."""
+        location_items = state[2][self._win_index]
+        return state[0] == self.location_ids[self._win_index] and \
+            (location_items | mask) & self._required == self._required
+
+    def _drop(self, state: State, mask: int) -> Optional[State]:
+        """Return the state after dropping the item with the given bit mask.
+
+        Only drops that can help win are modelled: required items at the win location and the
+        T-Card at the puzzle location. Return None for any other drop.
+        """
+        location_id, inventory, location_items, enemies, health = state
+        index = self._location_index[location_id]
+        items = list(location_items)
+        items[index] |= mask
+        if location_id == PUZZLE_LOCATION_ID and mask == self._puzzle_item:
+            reward_index = self._location_index[PUZZLE_REWARD_LOCATION_ID]
+            if not (items[reward_index] | inventory) & self._puzzle_reward:
+                items[reward_index] |= self._puzzle_reward
+        elif index != self._win_index or not mask & self._required:
+            return None
+        return location_id, inventory & ~mask, tuple(items), enemies, health
+
+
+def solve(model: WorldModel) -> tuple[dict[State, tuple[int, int]], int]:
+    """Explore every state reachable in model and return the best (action index, steps to win) of
+    each state from which the game can be won, and the number of states explored.
+    """
+    index = {model.start: 0}
+    states = [model.start]
+    edges = []
+    for state in states:  # states grows as new states are discovered
+        out = []
+        for action, next_state, steps in model.successors(state):
+            if next_state is None:
+                target = -1
+            else:
+                target = index.setdefault(next_state, len(states))
+                if target == len(states):
+                    states.append(next_state)
+            out.append((action, target, steps * _STEP_COST + 1))
+        edges.append(out)
+
+    # Dijkstra's algorithm on the reversed graph, from the winning actions
+    reverse = [[] for _ in states]
+    distance = [float('inf')] * len(states)
+    for source, out in enumerate(edges):
+        for _, target, cost in out:
+            if target == -1:
+                distance[source] = min(distance[source], cost)
+            else:
+                reverse[target].append((source, cost))
+    heap = [(cost, source) for source, cost in enumerate(distance) if cost != float('inf')]
+    heapq.heapify(heap)
+    while heap:
+        cost, target = heapq.heappop(heap)
+        if cost > distance[target]:
+            continue
+        for source, edge_cost in reverse[target]:
+            if cost + edge_cost < distance[source]:
+                distance[source] = cost + edge_cost
+                heapq.heappush(heap, (cost + edge_cost, source))
+
+    policy = {}
+    for source, out in enumerate(edges):
+        if distance[source] == float('inf'):
+            continue
+        best = min(out, key=lambda edge: edge[2] + (0 if edge[1] == -1 else distance[edge[1]]))
+        policy[states[source]] = (best[0], distance[source] // _STEP_COST)
+    return policy, len(states)
+
+
+def optimal_route(model: WorldModel, policy: dict[State, tuple[int, int]]) -> Optional[tuple[list[str], State]]:
+    """Return the actions of the fastest win from model.start under policy, and the state in
+    which the winning action is taken, or None if a new game cannot be won.
+    """
+    state = model.start
+    route = []
+    while state in policy:
+        action = policy[state][0]
+        next_state = next(target for index, target, _ in model.successors(state) if index == action)
+        route.append(model.actions[action])
+        if next_state is None:
+            return route, state
+        state = next_state
+    return None
+
+
+def encode_table(model: WorldModel, policy: dict[State, tuple[int, int]], world_hash: str) -> bytes:
+    """Return the contents of a hint table file holding the given policy for model."""
+    slot_count = 8
+    while slot_count < 2 * len(policy):  # keep the load factor at or below 1/2
+        slot_count *= 2
+    mask = slot_count - 1
+
+    slots = bytearray(slot_count * _SLOT.size)
+    for state, (action, steps) in policy.items():
+        key = state_key(state)
+        slot = key & mask
+        while _SLOT.unpack_from(slots, slot * _SLOT.size)[0] != 0:
+            slot = (slot + 1) & mask
+        _SLOT.pack_into(slots, slot * _SLOT.size, key, action, min(steps, 0xFFFF))
+
+    metadata = json.dumps({'world': world_hash, 'locations': model.location_ids, 'items': model.item_names,
+                           'enemies': model.enemies, 'actions': model.actions},
+                          separators=(',', ':')).encode('utf-8')
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, *model.stats, slot_count, len(policy), len(metadata))
+    return header + metadata + bytes(slots)
+
+
+class HintTable:
+    """A hint table file, memory-mapped so that opening it reads only the header and metadata.
+
+    Instance Attributes:
+        - stats: The (speed, attack, defense) the table was built for.
+        - world_hash: The SHA-256 hash of the game data file the table was built for.
+        - entry_count: The number of states with a hint.
+        - slot_count: The number of slots in the hash table.
+
+    Representation Invariants:
+        - self.slot_count is a power of two
+        - self.entry_count <= self.slot_count // 2
+    """
+    stats: tuple[int, int, int]
+    world_hash: str
+    entry_count: int
+    slot_count: int
+
+    # Private Instance Attributes:
+    #   - _map: the memory-mapped file
+    #   - _slots_offset: the position of the first slot in the file
+    #   - _location_ids, _item_index, _enemies, _actions: the orderings the table was built with
+    _map: mmap.mmap
+    _slots_offset: int
+    _location_ids: list[int]
+    _item_index: dict[str, int]
+    _enemies: list[tuple[int, str]]
+    _actions: list[str]
+
+    def __init__(self, filename: str) -> None:
+        """Open the hint table file filename.
+
+        Raises HintTableError if it is not a valid hint table, and OSError if it cannot be read.
+        """
+        with open(filename, 'rb') as f:
+            try:
+                self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError as error:  # empty file
+                raise HintTableError(f"{filename} is empty.") from error
+
+        if len(self._map) < _HEADER.size:
+            raise HintTableError(f"{filename} is truncated.")
+        magic, version, speed, attack, defense, self.slot_count, self.entry_count, metadata_length = \
+            _HEADER.unpack_from(self._map)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            raise HintTableError(f"{filename} is not a version {FORMAT_VERSION} hint table.")
+        self._slots_offset = _HEADER.size + metadata_length
+        if len(self._map) != self._slots_offset + self.slot_count * _SLOT.size:
+            raise HintTableError(f"{filename} is truncated.")
+
+        metadata = json.loads(self._map[_HEADER.size:self._slots_offset].decode('utf-8'))
+        self.stats = (speed, attack, defense)
+        self.world_hash = metadata['world']
+        self._location_ids = metadata['locations']
+        self._item_index = {name: bit for bit, name in enumerate(metadata['items'])}
+        self._enemies = [(loc_id, name) for loc_id, name in metadata['enemies']]
+        self._actions = metadata['actions']
+
+    def close(self) -> None:
+        """Unmap the file."""
+        self._map.close()
+
+    def lookup(self, key: int) -> Optional[tuple[str, int]]:
+        """Return the best action and the steps to win from the state with the given key,
+        or None if the table has no hint for it.
+        """
+        mask = self.slot_count - 1
+        slot = key & mask
+        while True:
+            slot_key, action, steps = _SLOT.unpack_from(self._map, self._slots_offset + slot * _SLOT.size)
+            if slot_key == key:
+                return self._actions[action], steps
+            if slot_key == 0:
+                return None
+            slot = (slot + 1) & mask
+
+    def game_state(self, game: AdventureGame, player: Player) -> Optional[State]:
+        """Return the current state of game in this table's bit orderings, or None if the game
+        holds an item this table does not know about.
+        """
+        location_items = []
+        for loc_id in self._location_ids:
+            items = _bits(self._item_index, game.get_location(loc_id).items)
+            if items is None:
+                return None
+            location_items.append(items)
+        inventory = _bits(self._item_index, [item.name for item in player.inventory.items])
+        if inventory is None:
+            return None
+        enemies = 0
+        for bit, (loc_id, name) in enumerate(self._enemies):
+            if name in game.get_location(loc_id).enemies:
+                enemies |= 1 << bit
+        return game.current_location_id, inventory, tuple(location_items), enemies, player.current_health
+
+    def hint(self, game: AdventureGame, player: Player) -> Optional[tuple[str, int]]:
+        """Return the best action and the steps to win in the current state of game, or None."""
+        state = self.game_state(game, player)
+        return None if state is None else self.lookup(state_key(state))
+
+
+def open_hint_table(stats: tuple[int, int, int], world_hash: str,
+                    directory: str = HINT_TABLE_DIR) -> Optional[HintTable]:
+    """Return the hint table for the given stats, or None if it has not been built, cannot be
+    read, or was built for a different game data file than world_hash.
+    """
+    try:
+        table = HintTable(hint_table_path(stats, directory))
+    except (OSError, HintTableError):
+        return None
+    if table.world_hash != world_hash:
+        table.close()
+        return None
+    return table
+
+
+@dataclass
+class BuildReport:
+    """The result of building the hint table for one stat allocation.
+
+    Instance Attributes:
+        - stats: The (speed, attack, defense) the table was built for.
+        - states: The number of reachable states explored.
+        - entries: The number of states with a hint.
+        - table_bytes: The size of the table file.
+        - seconds: The time taken to build and write the table.
+        - steps_to_win: The fewest steps to win a new game, or None if it cannot be won.
+    """
+    stats: tuple[int, int, int]
+    states: int
+    entries: int
+    table_bytes: int
+    seconds: float
+    steps_to_win: Optional[int]
+
+
+def build_table(game_data_file: str, stats: tuple[int, int, int], directory: str = HINT_TABLE_DIR) -> BuildReport:
+    """Build the hint table for the given stats and write it to directory."""
+    from adventure import AdventureGame, REQUIRED_ITEMS, WIN_LOCATION_ID
+
+    start = perf_counter()
+    game = AdventureGame(game_data_file, 1)
+    model = WorldModel(game, stats, REQUIRED_ITEMS, WIN_LOCATION_ID)
+    policy, states = solve(model)
+    contents = encode_table(model, policy, game.world_hash)
+    write_bytes_atomically(hint_table_path(stats, directory), contents)
+    best = policy.get(model.start)
+    return BuildReport(stats, states, len(policy), len(contents), perf_counter() - start,
+                       None if best is None else best[1])
+
+
+def build_all(game_data_file: str, directory: str = HINT_TABLE_DIR,
+              workers: Optional[int] = None) -> list[BuildReport]:
+    """Build the hint tables for every stat allocation across a pool of worker processes."""
+    # Imported here because the game imports this module when the first hint is asked for, and the process pool
+    # alone takes tens of milliseconds to import
+    from concurrent.futures import ProcessPoolExecutor
+
+    os.makedirs(directory, exist_ok=True)
+    allocations = stat_allocations()
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(build_table, [game_data_file] * len(allocations), allocations,
+                             [directory] * len(allocations)))
+
+
+def lookup_microseconds(game_data_file: str, stats: tuple[int, int, int] = (5, 5, 0), repeats: int = 10_000) -> float:
+    """Return the mean time, in microseconds, of a hint for a new game with the given stats,
+    including computing the state key from the live game.
+    """
+    from adventure import AdventureGame
+    from game_entities import Inventory
+
+    game = AdventureGame(game_data_file, 1)
+    player = Player(Inventory([], 10, 0.0), speed=stats[0], attack=stats[1], defense=stats[2],
+                    skip_stats_selection=True)
+    table = game.get_hint_table(player)
+    if table is None:
+        return float('nan')
+    start = perf_counter()
+    for _ in range(repeats):
+        table.hint(game, player)
+    return (perf_counter() - start) / repeats * 1_000_000
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Build the hint tables behind the 'hint' command.")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    data_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), "game_data.json")
+    build_start = perf_counter()
+    reports = build_all(data_file, workers=args.workers)
+    build_seconds = perf_counter() - build_start
+
+    print(f"{'stats':<10}{'states':>10}{'hints':>10}{'bytes':>12}{'seconds':>10}{'steps to win':>14}")
+    for report in reports:
+        print(f"{'/'.join(map(str, report.stats)):<10}{report.states:>10}{report.entries:>10}"
+              f"{report.table_bytes:>12}{report.seconds:>10.2f}"
+              f"{'-' if report.steps_to_win is None else report.steps_to_win:>14}")
+    print(f"\n{len(reports)} tables, {sum(r.entries for r in reports)} hints, "
+          f"{sum(r.table_bytes for r in reports)} bytes in {HINT_TABLE_DIR}")
+    print(f"Build time: {build_seconds:.2f} s wall, {sum(r.seconds for r in reports):.2f} s across workers")
+    print(f"Hint lookup: {lookup_microseconds(data_file):.1f} us")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,42 @@
+"""CSC111 Project 1: Text Adventure Game - Puzzle Constants
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module names the entities of the shipped world's special rules, for the tools
+that reason about the world without playing it (the hint tables in policy.py, the
+unwinnable-state detector in winnability.py and the shared world in shared_world.py). It
+imports nothing, so that any module can use it without slowing down the game's start.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+
+# The T-Card puzzle, as implemented by adventure.handle_t_card_puzzle.
+PUZZLE_LOCATION_ID = 8
+PUZZLE_ITEM = "t-card"
+PUZZLE_REWARD = "usb stick"
+PUZZLE_REWARD_LOCATION_ID = 12
+
+# Stale bread defeats the Giant Goose outright (see adventure._handle_combat_inventory).
+BREAD = "stale bread"
+GOOSE = "Giant Goose"
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,128 @@
+"""CSC111 Project 1: Text Adventure Game - Rendering Cache
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains a bounded, least-recently-used cache for the text blocks
+printed each turn (location descriptions, visible items and available actions).
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+from collections import OrderedDict
+from time import perf_counter
+from typing import Callable, Hashable
+
+
+class RenderCache:
+    """A bounded cache of rendered text blocks with least-recently-used eviction.
+
+    Keys should include the version of whatever was rendered (e.g. (location ID, location version, part))
+    so that a stale block is never returned after the underlying object changes.
+
+    Instance Attributes:
+        - max_entries: The maximum number of blocks kept before the least recently used is evicted.
+        - hits: The number of lookups answered from the cache.
+        - misses: The number of lookups that had to render the block.
+        - evictions: The number of blocks evicted to stay within max_entries.
+        - render_seconds: The total time spent rendering blocks on misses.
+
+    Representation Invariants:
+        - self.max_entries > 0
+        - len(self._blocks) <= self.max_entries
+
+    >>> cache = RenderCache(max_entries=2)
+    >>> cache.get_or_render((1, 0), lambda: "OISE")
+    'OISE'
+    >>> cache.get_or_render((1, 0), lambda: "never rendered")
+    'OISE'
+    >>> cache.get_or_render((2, 0), lambda: "ROM")
+    'ROM'
+    >>> cache.get_or_render((3, 0), lambda: "Vic")
+    'Vic'
+    >>> (1, 0) in cache, (2, 0) in cache, cache.hits, cache.misses, cache.evictions
+    (False, True, 1, 3, 1)
+    """
+    max_entries: int
+    hits: int
+    misses: int
+    evictions: int
+    render_seconds: float
+
+    # Private Instance Attributes:
+    #   - _blocks: the cached blocks, ordered from least to most recently used.
+    _blocks: OrderedDict[Hashable, str]
+
+    def __init__(self, max_entries: int = 256) -> None:
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.render_seconds = 0.0
+        self._blocks = OrderedDict()
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._blocks
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    def get_or_render(self, key: Hashable, render: Callable[[], str]) -> str:
+        """Return the block cached under key, calling render to build and cache it on a miss."""
+        block = self._blocks.get(key)
+        if block is not None:
+            self._blocks.move_to_end(key)
+            self.hits += 1
+            return block
+
+        start = perf_counter()
+        block = render()
+        self.render_seconds += perf_counter() - start
+        self.misses += 1
+
+        self._blocks[key] = block
+        if len(self._blocks) > self.max_entries:
+            self._blocks.popitem(last=False)
+            self.evictions += 1
+        return block
+
+    def clear(self) -> None:
+        """Remove every cached block, keeping the counters."""
+        self._blocks.clear()
+
+    def hit_rate(self) -> float:
+        """Return the fraction of lookups answered from the cache, or 0.0 if there were none."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self) -> dict[str, float]:
+        """Return the cache counters as a dictionary."""
+        return {
+            'entries': len(self._blocks),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hit_rate(),
+            'render_seconds': self.render_seconds
+        }
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
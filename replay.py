@@ -0,0 +1,570 @@
+"""CSC111 Project 1: Text Adventure Game - Session Recording and Replay
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module records interactive sessions and replays them against the engine, so that
+real player traffic can be replayed against new engine builds as a load and regression test.
+
+A recording captures every raw input the game reads, wherever it is read: the save file
+prompt, the stat allocation, main loop commands, combat moves, item choices and flee
+directions, each with the time it was entered. It also keeps the save file the session
+started from (if there was one) and, once the session ends, its outcome: how it ended, the
+steps, score, health and location at the end, and a digest of the final game state.
+
+A recording is a compact binary stream, written as the session goes, so a crashed session
+still leaves a readable recording:
+    - header: the magic number, the format version, the SHA-256 hash of game_data.json, and
+      the length and contents of the starting save file (length 0 if there was none),
+    - one record per input: a tag byte, the milliseconds since the previous input and the
+      length of the input (both as varints), and the input as UTF-8,
+    - an end record: a tag byte, and the length and contents of the outcome as JSON.
+
+Replaying feeds the recorded inputs back into the engine, either at their original pace or
+as fast as possible, and reports every way in which the replayed outcome diverges from the
+recorded one. Sessions are replayed across a pool of worker processes; in paced replays, each
+worker also runs its sessions concurrently on threads, since they spend most of their time
+waiting for the next input.
+
+Usage:
+    python play.py --record FILE             (record a session while playing)
+    python replay.py FILE_OR_DIR... [--paced] [--speed X] [--workers N] [--game-data FILE]
+    python replay.py --synthesize N DIR      (record N scripted sessions, for load tests)
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import builtins
+import contextlib
+import hashlib
+import json
+import os
+import random
+import tempfile
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from time import monotonic, perf_counter, sleep
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from adventure import AdventureGame, LEGACY_SAVE_FILE, REQUIRED_ITEMS, WIN_LOCATION_ID, game_loop, start_game
+from autosave import Autosaver
+from event_logger import EventList
+from game_entities import Player
+from winnability import unwinnable_reason
+
+# The first bytes of every recording.
+MAGIC = b"UCAR"
+FORMAT_VERSION = 1
+
+# Record tags.
+_INPUT = 0
+_END = 1
+
+# The extension of recording files, used when replaying every recording in a directory.
+RECORDING_EXTENSION = ".rec"
+
+# The number of sessions a worker process replays at a time.
+BATCH_SIZE = 16
+
+
+class RecordingError(Exception):
+    """Raised when a recording cannot be read."""
+
+
+class _InputsExhausted(Exception):
+    """Raised when a replayed session asks for input after its recorded inputs have run out."""
+
+
+class _NullWriter:
+    """A write-only text stream that discards everything, used to silence replayed sessions."""
+
+    def write(self, text: str) -> int:
+        """Discard text."""
+        return len(text)
+
+    def flush(self) -> None:
+        """Do nothing."""
+
+
+def _write_varint(stream: BinaryIO, value: int) -> None:
+    """Write the non-negative integer value to stream as a little-endian base-128 varint."""
+    while value >= 0x80:
+        stream.write(bytes([value & 0x7F | 0x80]))
+        value >>= 7
+    stream.write(bytes([value]))
+
+
+def _read_varint(contents: bytes, pos: int) -> tuple[int, int]:
+    """Return the varint at position pos of contents and the position after it.
+
+    >>> _read_varint(bytes([0xAC, 0x02, 0x05]), 0)
+    (300, 2)
+    """
+    value = shift = 0
+    while True:
+        if pos >= len(contents):
+            raise RecordingError("the recording is truncated")
+        byte = contents[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+@dataclass
+class SessionOutcome:
+    """How a session ended.
+
+    Instance Attributes:
+        - outcome: "win", "dead", "out of steps", "unwinnable", "quit", or "interrupted" if
+          the session ended by an error or by running out of input.
+        - steps: The number of steps taken.
+        - score: The player's score.
+        - health: The player's health.
+        - location_id: The player's location.
+        - inputs: The number of inputs read.
+        - digest: A digest of the final game state (see AdventureGame.state_digest).
+    """
+    outcome: str
+    steps: int
+    score: int
+    health: int
+    location_id: int
+    inputs: int
+    digest: str
+
+
+def session_outcome(game: AdventureGame, player: Player, game_log: EventList, inputs: int,
+                    interrupted: bool = False) -> SessionOutcome:
+    """Return the outcome of a session that read the given number of inputs."""
+    if all(item in game.get_location(WIN_LOCATION_ID).items for item in REQUIRED_ITEMS):
+        outcome = "win"
+    elif player.current_health <= 0:
+        outcome = "dead"
+    elif game.steps >= game.max_steps:
+        outcome = "out of steps"
+    elif interrupted:
+        outcome = "interrupted"
+    elif unwinnable_reason(game, player, REQUIRED_ITEMS, WIN_LOCATION_ID) is not None:
+        outcome = "unwinnable"
+    else:
+        outcome = "quit"
+    return SessionOutcome(outcome, game.steps, game.get_score(player), player.current_health,
+                          game.current_location_id, inputs, game.state_digest(player, game_log))
+
+
+class SessionRecorder:
+    """Records every input of a session to a recording file, as it is read.
+
+    Instance Attributes:
+        - filename: The recording file.
+        - inputs: The number of inputs recorded so far.
+    """
+    filename: str
+    inputs: int
+
+    # Private Instance Attributes:
+    #   - _file: the open recording file.
+    #   - _read_input: the function that reads the inputs being recorded.
+    #   - _clock: the clock timing the inputs, in seconds.
+    #   - _last_time: the time of the previous input, or of the start of the session.
+    _file: BinaryIO
+    _read_input: Callable[[str], str]
+    _clock: Callable[[], float]
+    _last_time: float
+
+    def __init__(self, filename: str, world_hash: str, start_save: bytes = b"",
+                 read_input: Optional[Callable[[str], str]] = None, clock: Callable[[], float] = monotonic) -> None:
+        """Start a recording in filename of a session in the world whose game data has the given
+        hash, starting from the save file contents start_save (empty if there is no save file).
+
+        Inputs are read with read_input, or with the current input() if it is None, and timed with clock.
+        """
+        self.filename = filename
+        self.inputs = 0
+        self._read_input = read_input or builtins.input
+        self._clock = clock
+        self._file = open(filename, 'wb')
+        self._file.write(MAGIC + bytes([FORMAT_VERSION]) + bytes.fromhex(world_hash))
+        _write_varint(self._file, len(start_save))
+        self._file.write(start_save)
+        self._file.flush()
+        self._last_time = clock()
+
+    def input(self, prompt: str = "") -> str:
+        """Read an input with this recorder's input function, record it and return it."""
+        text = self._read_input(prompt)
+        now = self._clock()
+        encoded = text.encode()
+        self._file.write(bytes([_INPUT]))
+        _write_varint(self._file, round((now - self._last_time) * 1000))
+        _write_varint(self._file, len(encoded))
+        self._file.write(encoded)
+        self._file.flush()
+        self._last_time = now
+        self.inputs += 1
+        return text
+
+    def finish(self, outcome: Optional[SessionOutcome]) -> None:
+        """Record the outcome of the session, if it got as far as having one, and close the recording."""
+        if outcome is not None:
+            encoded = json.dumps(asdict(outcome), separators=(',', ':')).encode()
+            self._file.write(bytes([_END]))
+            _write_varint(self._file, len(encoded))
+            self._file.write(encoded)
+        self._file.close()
+
+
+def _starting_save(save_file: str) -> bytes:
+    """Return the contents of the save file a new session would offer to continue, or b"" if none."""
+    for filename in (save_file, LEGACY_SAVE_FILE):
+        if os.path.exists(filename):
+            with open(filename, 'rb') as f:
+                return f.read()
+    return b""
+
+
+@contextlib.contextmanager
+def _reading_input(read_input: Callable[[str], str]) -> Iterator[None]:
+    """Make input() call read_input for the duration of the with block."""
+    real_input = builtins.input
+    builtins.input = read_input
+    try:
+        yield
+    finally:
+        builtins.input = real_input
+
+
+def play_session(game_data_file: str, save_file: str, inputs_read: Callable[[], int]) -> Optional[SessionOutcome]:
+    """Play a whole session like adventure.run_game and return its outcome, or None if it ended
+    before the game started. inputs_read returns the number of inputs read so far.
+
+    Running out of input (EOFError, or _InputsExhausted in a replay) or a keyboard interrupt
+    ends the session as "interrupted".
+    """
+    try:
+        game, player, game_log = start_game(game_data_file, save_file)
+    except (EOFError, KeyboardInterrupt, _InputsExhausted):
+        return None
+    autosaver = Autosaver(save_file, encode=game.encode_save_data)
+    interrupted = False
+    try:
+        game_loop(game, player, game_log, save_file, autosaver)
+    except (EOFError, KeyboardInterrupt, _InputsExhausted):
+        interrupted = True
+    finally:
+        autosaver.close()
+    return session_outcome(game, player, game_log, inputs_read(), interrupted)
+
+
+def record_game(game_data_file: str, save_file: str, record_file: str) -> Optional[SessionOutcome]:
+    """Play an interactive game on the console like adventure.run_game, recording it to record_file."""
+    with open(game_data_file, 'rb') as f:
+        world_hash = hashlib.sha256(f.read()).hexdigest()
+    recorder = SessionRecorder(record_file, world_hash, _starting_save(save_file))
+    outcome = None
+    try:
+        with _reading_input(recorder.input):
+            outcome = play_session(game_data_file, save_file, lambda: recorder.inputs)
+    finally:
+        recorder.finish(outcome)
+    return outcome
+
+
+@dataclass
+class Recording:
+    """A recorded session.
+
+    Instance Attributes:
+        - name: The name of the recording (its file name).
+        - world_hash: The SHA-256 hash of the game data file the session was played in.
+        - start_save: The contents of the save file the session started from, or b"" if none.
+        - inputs: Every input of the session, as (seconds since the start of the session, input).
+        - outcome: The outcome of the session, or None if it was not recorded.
+    """
+    name: str
+    world_hash: str
+    start_save: bytes = b""
+    inputs: list[tuple[float, str]] = field(default_factory=list)
+    outcome: Optional[SessionOutcome] = None
+
+
+def read_recording(filename: str) -> Recording:
+    """Return the recording stored in filename.
+
+    Raises RecordingError if it is not a recording. A recording cut short by a crash is read
+    up to its last complete input.
+    """
+    with open(filename, 'rb') as f:
+        contents = f.read()
+    if not contents.startswith(MAGIC) or len(contents) < len(MAGIC) + 33:
+        raise RecordingError(f"{filename} is not a recording")
+    if contents[len(MAGIC)] != FORMAT_VERSION:
+        raise RecordingError(f"{filename} has unsupported format version {contents[len(MAGIC)]}")
+    pos = len(MAGIC) + 1
+    recording = Recording(os.path.basename(filename), contents[pos:pos + 32].hex())
+    save_length, pos = _read_varint(contents, pos + 32)
+    recording.start_save = contents[pos:pos + save_length]
+    pos += save_length
+
+    elapsed = 0.0
+    try:
+        while pos < len(contents):
+            tag = contents[pos]
+            if tag == _INPUT:
+                delay, pos = _read_varint(contents, pos + 1)
+                length, pos = _read_varint(contents, pos)
+                if pos + length > len(contents):
+                    break
+                elapsed += delay / 1000
+                recording.inputs.append((elapsed, contents[pos:pos + length].decode()))
+            elif tag == _END:
+                length, pos = _read_varint(contents, pos + 1)
+                if pos + length > len(contents):
+                    break
+                recording.outcome = SessionOutcome(**json.loads(contents[pos:pos + length]))
+            else:
+                raise RecordingError(f"{filename} has an unknown record tag {tag}")
+            pos += length
+    except RecordingError as error:
+        if "truncated" not in str(error):
+            raise
+    return recording
+
+
+# The input feed of the session replayed on each thread.
+_feeds = threading.local()
+
+
+def _replayed_input(prompt: str = "") -> str:
+    """Return the next input of the session being replayed on this thread, waiting for it if paced."""
+    feed = _feeds.feed
+    if not feed:
+        raise _InputsExhausted
+    due, text = feed.pop()
+    if _feeds.start is not None:
+        delay = _feeds.start + due - perf_counter()
+        if delay > 0:
+            sleep(delay)
+    return text
+
+
+@dataclass
+class ReplayResult:
+    """The result of replaying one recording.
+
+    Instance Attributes:
+        - name: The name of the recording.
+        - inputs: The number of recorded inputs.
+        - seconds: The time taken to replay the session.
+        - outcome: The outcome of the replayed session, or None if it ended before the game started.
+        - divergences: Every way in which the replayed outcome differs from the recorded one.
+        - world_changed: Whether the game data differs from the one the session was recorded in.
+    """
+    name: str
+    inputs: int
+    seconds: float
+    outcome: Optional[SessionOutcome]
+    divergences: list[str] = field(default_factory=list)
+    world_changed: bool = False
+
+
+def compare_outcomes(recorded: Optional[SessionOutcome], replayed: Optional[SessionOutcome]) -> list[str]:
+    """Return every way in which replayed differs from recorded (nothing if no outcome was recorded).
+
+    >>> a = SessionOutcome("win", 18, 50, 10, 1, 40, "ab")
+    >>> compare_outcomes(a, SessionOutcome("quit", 18, 50, 7, 1, 40, "cd"))
+    ['outcome: recorded win, replayed quit', 'health: recorded 10, replayed 7', 'digest: recorded ab, replayed cd']
+    """
+    if recorded is None:
+        return []
+    if replayed is None:
+        return ["the replayed session ended before the game started"]
+    return [f"{name}: recorded {value}, replayed {getattr(replayed, name)}"
+            for name, value in asdict(recorded).items() if getattr(replayed, name) != value]
+
+
+def replay(recording: Recording, game_data_file: str, paced: bool = False, speed: float = 1.0) -> ReplayResult:
+    """Replay recording in the world of game_data_file and compare its outcome to the recorded one.
+
+    If paced, every input is given at its original time, divided by speed; otherwise inputs are
+    given as fast as the engine reads them. The caller makes input() read the recorded inputs
+    and discards the output (see _replay_batch).
+    """
+    _feeds.feed = [(due / speed, text) for due, text in reversed(recording.inputs)]
+    start = perf_counter()
+    _feeds.start = start if paced else None
+    with tempfile.TemporaryDirectory() as save_dir:
+        save_file = os.path.join(save_dir, "replay.sav")
+        if recording.start_save:
+            with open(save_file, 'wb') as f:
+                f.write(recording.start_save)
+        outcome = play_session(game_data_file, save_file, lambda: len(recording.inputs) - len(_feeds.feed))
+    seconds = perf_counter() - start
+
+    result = ReplayResult(recording.name, len(recording.inputs), seconds, outcome,
+                          compare_outcomes(recording.outcome, outcome))
+    with open(game_data_file, 'rb') as f:
+        result.world_changed = hashlib.sha256(f.read()).hexdigest() != recording.world_hash
+    return result
+
+
+def _replay_batch(filenames: list[str], game_data_file: str, paced: bool, speed: float) -> list[ReplayResult]:
+    """Replay a batch of recordings in this process, concurrently on threads if paced."""
+    recordings = [read_recording(filename) for filename in filenames]
+    with _reading_input(_replayed_input), contextlib.redirect_stdout(_NullWriter()):
+        if not paced:
+            return [replay(recording, game_data_file) for recording in recordings]
+        with ThreadPoolExecutor(max_workers=len(recordings)) as pool:
+            return list(pool.map(lambda r: replay(r, game_data_file, True, speed), recordings))
+
+
+@dataclass
+class ReplayReport:
+    """The summary of replaying many recordings.
+
+    Instance Attributes:
+        - results: The result of each recording, in the order given.
+        - wall_seconds: The elapsed time of the whole replay.
+    """
+    results: list[ReplayResult] = field(default_factory=list)
+    wall_seconds: float = 0.0
+
+    def inputs(self) -> int:
+        """Return the total number of inputs replayed."""
+        return sum(result.inputs for result in self.results)
+
+    def diverged(self) -> list[ReplayResult]:
+        """Return the results of the recordings whose replay diverged."""
+        return [result for result in self.results if result.divergences]
+
+
+def replay_all(filenames: list[str], game_data_file: str, workers: Optional[int] = None, paced: bool = False,
+               speed: float = 1.0) -> ReplayReport:
+    """Replay every recording in filenames across a pool of worker processes and return a report."""
+    report = ReplayReport()
+    start = perf_counter()
+    batches = [filenames[i:i + BATCH_SIZE] for i in range(0, len(filenames), BATCH_SIZE)]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_replay_batch, batch, game_data_file, paced, speed) for batch in batches]
+        for future in futures:
+            report.results.extend(future.result())
+    report.wall_seconds = perf_counter() - start
+    return report
+
+
+def print_report(report: ReplayReport) -> None:
+    """Print the divergences and throughput of a replay."""
+    for result in report.diverged():
+        note = " (game data changed since recording)" if result.world_changed else ""
+        print(f"{result.name}: diverged{note}")
+        for divergence in result.divergences:
+            print(f"    {divergence}")
+    count = len(report.results)
+    seconds = report.wall_seconds or 1e-9
+    slowest = max((result.seconds for result in report.results), default=0.0)
+    print(f"Replayed {count} sessions ({report.inputs()} inputs) in {report.wall_seconds:.2f} s: "
+          f"{count / seconds:.1f} sessions/s, {report.inputs() / seconds:.0f} inputs/s, "
+          f"slowest session {slowest:.3f} s")
+    print(f"{len(report.diverged())} of {count} sessions diverged from their recorded outcomes")
+
+
+def synthesize(directory: str, sessions: int, game_data_file: str, seed: int = 0) -> list[str]:
+    """Record the given number of scripted sessions into directory and return their file names.
+
+    Each session allocates random stats and plays a prefix of a shipped walkthrough, with
+    random commands mixed in and random think times of up to two seconds, so that the
+    recordings exercise combat, fleeing and item prompts like real traffic.
+    """
+    from simulation import WALKTHROUGHS
+
+    rng = random.Random(seed)
+    os.makedirs(directory, exist_ok=True)
+    with open(game_data_file, 'rb') as f:
+        world_hash = hashlib.sha256(f.read()).hexdigest()
+    filenames = []
+    for i in range(sessions):
+        speed = rng.randint(3, 5)  # slower players cannot win within the step limit
+        attack = rng.randint(max(0, 5 - speed), 5)
+        script = ["1", str(speed), "2", str(attack), "3", str(10 - speed - attack)]
+        if speed + attack == 10:
+            del script[4:]
+        for command in rng.choice(list(WALKTHROUGHS.values())):
+            if rng.random() < 0.1:
+                script.append(rng.choice(["look", "score", "flee", "go north", "go south", "attack", "hint"]))
+            script.append(command)
+        script.reverse()
+        clock = [0.0]
+
+        def scripted_input(prompt: str = "") -> str:
+            clock[0] += rng.uniform(0.0, 2.0)
+            if not script:
+                raise EOFError  # like a player closing the console
+            return script.pop()
+
+        filename = os.path.join(directory, f"session_{i:05d}{RECORDING_EXTENSION}")
+        with tempfile.TemporaryDirectory() as save_dir, contextlib.redirect_stdout(_NullWriter()):
+            recorder = SessionRecorder(filename, world_hash, read_input=scripted_input, clock=lambda: clock[0])
+            outcome = None
+            try:
+                with _reading_input(recorder.input):
+                    outcome = play_session(game_data_file, os.path.join(save_dir, "synth.sav"),
+                                           lambda: recorder.inputs)
+            finally:
+                recorder.finish(outcome)
+        filenames.append(filename)
+    return filenames
+
+
+def _recording_files(paths: list[str]) -> list[str]:
+    """Return the recording files among paths, including those in directories among paths."""
+    filenames = []
+    for path in paths:
+        if os.path.isdir(path):
+            filenames.extend(os.path.join(path, name) for name in sorted(os.listdir(path))
+                             if name.endswith(RECORDING_EXTENSION))
+        else:
+            filenames.append(path)
+    return filenames
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Replay recorded sessions against the engine.")
+    parser.add_argument("paths", nargs="*", help="recording files, or directories of recordings")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--paced", action="store_true", help="give inputs at their recorded times")
+    parser.add_argument("--speed", type=float, default=1.0, help="speed-up factor for paced replays")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--synthesize", type=int, metavar="N", help="record N scripted sessions into the directory")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    if args.synthesize is not None:
+        if len(args.paths) != 1:
+            parser.error("--synthesize takes exactly one directory")
+        created = synthesize(args.paths[0], args.synthesize, args.game_data, args.seed)
+        print(f"Recorded {len(created)} sessions into {args.paths[0]}")
+    else:
+        print_report(replay_all(_recording_files(args.paths), args.game_data, args.workers, args.paced, args.speed))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
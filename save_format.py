@@ -0,0 +1,289 @@
+"""CSC111 Project 1: Text Adventure Game - Compact Save Format
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the compact save file format. Compared to the original
+pretty-printed JSON saves, a compact save:
+    - stores the event log as location IDs and indices into a table of distinct commands,
+      instead of repeating every event's description text,
+    - stores only the locations whose items or enemies differ from game_data.json,
+    - is zlib-compressed, behind a header holding a magic number, a format version and a checksum.
+
+Save data is passed around in the same dictionary shape as AdventureGame.to_save_data returns
+(the shape of the original JSON saves), so the rest of the game does not depend on which
+format a file uses. load_save_data reads either format. The final save of a decided game also
+has an 'outcome' key (see AdventureGame.get_outcome), which both formats keep.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import json
+import struct
+import zlib
+from typing import Optional
+
+from autosave import CorruptSaveError, parse_json_save, write_bytes_atomically
+
+# The first bytes of every compact save file.
+MAGIC = b"UCAS"
+
+# The original pretty-printed JSON saves are format version 1.
+JSON_FORMAT_VERSION = 1
+COMPACT_FORMAT_VERSION = 2
+
+# Magic number, format version, CRC-32 of the compressed body.
+_HEADER = struct.Struct(">4sBI")
+
+# For each location ID: (items, enemies) as loaded from game_data.json.
+Baseline = dict[int, tuple[list[str], list[str]]]
+
+
+class WorldMismatchError(Exception):
+    """Raised when an intact compact save file was made with a different game_data.json than the
+    one being played (e.g. before it was edited or hot reloaded), so it cannot be loaded.
+    """
+
+
+def is_compact(contents: bytes) -> bool:
+    """Return whether the given save file contents use the compact format.
+
+    >>> is_compact(b'UCAS' + bytes(5))
+    True
+    >>> is_compact(b'{"location_id": 1}')
+    False
+    """
+    return contents.startswith(MAGIC)
+
+
+def encode_compact(data: dict, baseline: Baseline, world_hash: str = "") -> bytes:
+    """Return the given save data (as returned by AdventureGame.to_save_data) in the compact format.
+
+    baseline gives the items and enemies of each location as loaded from the game data file;
+    only locations that differ from it are stored. world_hash identifies that game data file.
+    """
+    location_items = {}
+    location_enemies = {}
+    for loc_id, (items, enemies) in baseline.items():
+        current_items = data['location_items'].get(str(loc_id), items)
+        current_enemies = data['location_enemies'].get(str(loc_id), enemies)
+        if current_items != items:
+            location_items[str(loc_id)] = current_items
+        if current_enemies != enemies:
+            location_enemies[str(loc_id)] = current_enemies
+
+    command_ids = {}
+    ids = []
+    commands = []
+    for event in data['log']:
+        ids.append(event['id_num'])
+        command = event['next_command']
+        if command is None:
+            commands.append(-1)
+        else:
+            commands.append(command_ids.setdefault(command, len(command_ids)))
+
+    player = data['player']
+    body = {
+        'world': world_hash,
+        'location_id': data['location_id'],
+        'steps': data['steps'],
+        'player': [player['speed'], player['attack'], player['defense'], player['max_health'],
+                   player['current_health'], player['points'], player['inventory']],
+        'visited': data['visited_locations'],
+        'items': location_items,
+        'enemies': location_enemies,
+        'commands': list(command_ids),
+        'log_ids': ids,
+        'log_commands': commands
+    }
+    if data.get('outcome') is not None:
+        body['outcome'] = data['outcome']
+    compressed = zlib.compress(json.dumps(body, separators=(',', ':')).encode('utf-8'))
+    return _HEADER.pack(MAGIC, COMPACT_FORMAT_VERSION, zlib.crc32(compressed)) + compressed
+
+
+def decode_compact(contents: bytes, baseline: Baseline, descriptions: dict[int, str],
+                   world_hash: str = "") -> dict:
+    """Return the save data stored in the given compact save file contents.
+
+    The result has the same shape as AdventureGame.to_save_data. Event descriptions are
+    restored from descriptions, which maps each location ID to its brief description.
+
+    Raises CorruptSaveError if the contents are damaged or use an unknown format version, and
+    WorldMismatchError if they were saved against a different game data file than world_hash.
+    """
+    if len(contents) < _HEADER.size:
+        raise CorruptSaveError("Save file is truncated.")
+    magic, version, checksum = _HEADER.unpack_from(contents)
+    compressed = contents[_HEADER.size:]
+    if magic != MAGIC:
+        raise CorruptSaveError("Save file is not in the compact format.")
+    if version != COMPACT_FORMAT_VERSION:
+        raise CorruptSaveError(f"Save file format version {version} is not supported.")
+    if zlib.crc32(compressed) != checksum:
+        raise CorruptSaveError("Save file failed its checksum; it may have been modified or partially written.")
+
+    try:
+        body = json.loads(zlib.decompress(compressed).decode('utf-8'))
+    except (zlib.error, UnicodeDecodeError, json.JSONDecodeError) as error:
+        raise CorruptSaveError(f"Save file is damaged: {error}") from error
+
+    if world_hash and body['world'] and body['world'] != world_hash:
+        raise WorldMismatchError("Save file was made with a different version of game_data.json, "
+                                 "which has been edited or reloaded since.")
+
+    speed, attack, defense, max_health, current_health, points, inventory = body['player']
+    commands = body['commands']
+    log = [{'id_num': id_num,
+            'description': descriptions.get(id_num, "Unknown location."),
+            'next_command': None if command == -1 else commands[command]}
+           for id_num, command in zip(body['log_ids'], body['log_commands'])]
+
+    data = {
+        'location_id': body['location_id'],
+        'steps': body['steps'],
+        'player': {
+            'inventory': inventory,
+            'speed': speed,
+            'attack': attack,
+            'defense': defense,
+            'max_health': max_health,
+            'current_health': current_health,
+            'points': points
+        },
+        'visited_locations': body['visited'],
+        'location_items': {str(loc_id): body['items'].get(str(loc_id), list(items))
+                           for loc_id, (items, _) in baseline.items()},
+        'location_enemies': {str(loc_id): body['enemies'].get(str(loc_id), list(enemies))
+                             for loc_id, (_, enemies) in baseline.items()},
+        'log': log
+    }
+    if 'outcome' in body:
+        data['outcome'] = body['outcome']
+    return data
+
+
+def migrate_json_save(data: dict) -> dict:
+    """Return the given format version 1 (JSON) save data upgraded to the current save data shape.
+
+    Version 1 saves may predate the 'steps' field and carry a 'checksum' key; both are normalized here.
+
+    >>> migrate_json_save({'location_id': 1, 'checksum': 'abc'})
+    {'location_id': 1, 'steps': 0}
+    """
+    migrated = {key: value for key, value in data.items() if key != 'checksum'}
+    migrated.setdefault('steps', 0)
+    return migrated
+
+
+def load_save_data(filename: str, baseline: Baseline, descriptions: dict[int, str],
+                   world_hash: str = "") -> dict:
+    """Return the save data stored in filename, which may be in either the JSON or the compact format.
+
+    Raises CorruptSaveError if the file cannot be read as either format, and WorldMismatchError
+    if it is a compact save made with a different game data file than world_hash.
+    """
+    with open(filename, 'rb') as f:
+        contents = f.read()
+    if is_compact(contents):
+        return decode_compact(contents, baseline, descriptions, world_hash)
+    return migrate_json_save(parse_json_save(contents, filename))
+
+
+def write_compact_save(filename: str, data: dict, baseline: Baseline, world_hash: str = "") -> None:
+    """Atomically write the given save data to filename in the compact format."""
+    write_bytes_atomically(filename, encode_compact(data, baseline, world_hash))
+
+
+def upgrade_save_file(filename: str, baseline: Baseline, descriptions: dict[int, str],
+                      world_hash: str = "", new_filename: Optional[str] = None) -> None:
+    """Rewrite the save file filename (in either format) in the compact format.
+
+    The result is written to new_filename, or over filename if new_filename is None.
+    """
+    data = load_save_data(filename, baseline, descriptions, world_hash)
+    write_compact_save(new_filename or filename, data, baseline, world_hash)
+
+
+def _benchmark_session(label: str, data: dict, baseline: Baseline, descriptions: dict[int, str],
+                       repeats: int) -> None:
+    """Print the size and save/load time of the given save data in both formats."""
+    from time import perf_counter
+    from autosave import encode_json_save
+
+    start = perf_counter()
+    for _ in range(repeats):
+        json_bytes = encode_json_save(data)
+    json_save = (perf_counter() - start) / repeats
+    start = perf_counter()
+    for _ in range(repeats):
+        parse_json_save(json_bytes)
+    json_load = (perf_counter() - start) / repeats
+
+    start = perf_counter()
+    for _ in range(repeats):
+        compact_bytes = encode_compact(data, baseline)
+    compact_save = (perf_counter() - start) / repeats
+    start = perf_counter()
+    for _ in range(repeats):
+        decode_compact(compact_bytes, baseline, descriptions)
+    compact_load = (perf_counter() - start) / repeats
+
+    print(f"{label} ({len(data['log'])} events)")
+    print(f"  json:    {len(json_bytes):>10} bytes  save {json_save * 1000:8.2f} ms  load {json_load * 1000:8.2f} ms")
+    print(f"  compact: {len(compact_bytes):>10} bytes  save {compact_save * 1000:8.2f} ms  "
+          f"load {compact_load * 1000:8.2f} ms")
+
+
+def benchmark(game_data_file: str = "game_data.json", long_session_events: int = 100_000) -> None:
+    """Print bytes on disk and save/load times of both formats for a short and a very long session.
+
+    The short session is the winning walkthrough; the long session is a random walk around the map.
+    """
+    import random
+    from adventure import AdventureGame, update_game_log
+    from event_logger import EventList
+    from game_entities import Inventory, Player
+
+    game = AdventureGame(game_data_file, 1)
+    baseline = game.get_initial_world()
+    descriptions = {loc_id: game.get_location(loc_id).brief_description for loc_id in baseline}
+    player = Player(Inventory([], 10, 0.0), skip_stats_selection=True)
+
+    short_log = EventList()
+    for loc_id, command in [(1, "go east"), (2, "go east"), (3, "attack"), (3, "attack"), (3, "take stale bread"),
+                            (3, "go south"), (6, "go south"), (11, "inventory"), (11, "take t-card"), (11, None)]:
+        update_game_log(short_log, game.get_location(loc_id), command)
+    _benchmark_session("Short session", game.to_save_data(player, short_log), baseline, descriptions, 200)
+
+    rng = random.Random(111)
+    long_log = EventList()
+    location = game.get_location()
+    for _ in range(long_session_events):
+        command = rng.choice([c for c in location.available_commands if c.startswith("go")])
+        update_game_log(long_log, location, command)
+        location = game.get_location(location.available_commands[command])
+    _benchmark_session("Long session", game.to_save_data(player, long_log), baseline, descriptions, 3)
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    benchmark()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,540 @@
+"""CSC111 Project 1: Text Adventure Game - Fair Command Scheduler
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module schedules the commands of many hosted sessions onto the game engine, so
+that a client flooding commands (a replay script or a bot) cannot starve interactive players.
+
+Each session has its own bounded queue of commands, run in the order they were submitted. A
+session whose queue is full has further commands rejected with QueueFullError, and one whose
+queue is above a high-water mark is reported as throttled, so that its client can slow down.
+
+Sessions take turns by deficit round robin: every session waiting for the engine is in a ring,
+and each time round it is credited a quantum of engine time; it runs its next command once its
+credit covers the estimated cost of that command (a moving average of past commands with the
+same verb), and then goes to the back of the ring. A session flooding cheap commands thus gets
+the same share of the engine as each interactive player, and one issuing expensive commands a
+smaller number of them. Expensive commands (such as save and log) wait in a separate slow lane
+with its own ring and its own worker, which helps with the interactive lane whenever the slow
+lane is empty. As a command cannot be interrupted once it runs, this keeps interactive commands
+from waiting for an expensive command to finish.
+
+Queue depths, the number of rejected commands and the time commands wait before they run are
+available from metrics(). Running this module load tests the scheduler: interactive players
+take turns with a think time between them while a bot floods commands, and their latency is
+compared with no bot and with a first-come, first-served queue.
+
+Usage:
+    python scheduler.py [--players N] [--seconds N] [--seed N]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import math
+import os
+import queue
+import random
+import threading
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from time import perf_counter, sleep
+from typing import Any, Callable, Optional
+
+from sessions import Session, SessionManager, percentile
+
+# The verbs of the commands that run in the slow lane.
+SLOW_COMMANDS = frozenset({"save", "log", "pack", "hint"})
+
+# The names of the two lanes.
+INTERACTIVE_LANE = "interactive"
+SLOW_LANE = "slow"
+
+# The number of commands a session may have queued before further commands are rejected.
+DEFAULT_QUEUE_LIMIT = 32
+
+# The fraction of a session's queue limit at or above which it is throttled.
+HIGH_WATER_FRACTION = 0.75
+
+# The engine time a waiting session is credited each time round the ring, in seconds.
+QUANTUM = 0.0002
+
+# The weight of the latest run of a verb in the moving average of its cost.
+COST_SMOOTHING = 0.2
+
+# The number of recent waits kept per lane to compute wait-time percentiles.
+WAIT_SAMPLES = 10_000
+
+
+class QueueFullError(Exception):
+    """Raised by CommandScheduler.submit when a session's queue is full. The client should wait for
+    its earlier commands to finish before submitting more.
+    """
+
+
+def command_lane(command: str) -> str:
+    """Return the lane in which command waits.
+
+    >>> command_lane("save"), command_lane("go north")
+    ('slow', 'interactive')
+    """
+    return SLOW_LANE if command.split(" ", 1)[0] in SLOW_COMMANDS else INTERACTIVE_LANE
+
+
+@dataclass
+class _Command:
+    """A command waiting to run.
+
+    Instance Attributes:
+        - command: The command.
+        - future: The future to complete with the command's result.
+        - submitted: The time the command was submitted.
+    """
+    command: str
+    future: Future
+    submitted: float
+
+
+@dataclass
+class _Lane:
+    """The sessions waiting for the engine whose next command is in one lane.
+
+    Instance Attributes:
+        - ring: The waiting sessions, in the order they are visited.
+        - dispatched: The number of commands run from this lane.
+        - waits: The time each recent command waited before it ran, in seconds.
+    """
+    ring: deque[str] = field(default_factory=deque)
+    dispatched: int = 0
+    waits: deque[float] = field(default_factory=lambda: deque(maxlen=WAIT_SAMPLES))
+
+
+@dataclass
+class SchedulerMetrics:
+    """A snapshot of a scheduler's queues.
+
+    Instance Attributes:
+        - queued: The number of commands queued, over all sessions.
+        - sessions_waiting: The number of sessions with a command queued.
+        - max_queue_depth: The number of commands queued by the session with the most.
+        - throttled: The number of sessions at or above their high-water mark.
+        - rejected: The number of commands rejected because a session's queue was full.
+        - dispatched: The number of commands run from each lane.
+        - lane_depths: The number of sessions whose next command waits in each lane.
+        - wait_p50: The median wait of recent commands in each lane before they ran, in seconds.
+        - wait_p99: The 99th percentile wait of recent commands in each lane, in seconds.
+    """
+    queued: int
+    sessions_waiting: int
+    max_queue_depth: int
+    throttled: int
+    rejected: int
+    dispatched: dict[str, int]
+    lane_depths: dict[str, int]
+    wait_p50: dict[str, float]
+    wait_p99: dict[str, float]
+
+
+class CommandScheduler:
+    """Runs the commands of many sessions on worker threads, fairly across sessions.
+
+    Commands are run by calling handler(session_id, command), whose return value (or exception)
+    completes the future returned by submit. A session's commands run one at a time, in order.
+
+    Instance Attributes:
+        - queue_limit: The number of commands a session may have queued.
+        - rejected: The number of commands rejected because a session's queue was full.
+
+    Representation Invariants:
+        - self.queue_limit > 0
+        - all(0 < len(commands) <= self.queue_limit for commands in self._queues.values())
+    """
+    queue_limit: int
+    rejected: int
+
+    # Private Instance Attributes:
+    #   - _handler: runs one command of one session
+    #   - _queues: the commands queued by each session with any, oldest first; a running command
+    #       is no longer in it, so a session whose only command is running has no entry
+    #   - _lanes: the lane named by each lane name
+    #   - _deficits: the engine time each waiting session has been credited and not yet used
+    #   - _costs: the estimated cost of a command with each verb, in seconds
+    #   - _running: the sessions with a command running
+    #   - _closed: whether close has been called
+    #   - _condition: guards every attribute above, and wakes workers when a command is submitted
+    #   - _workers: the worker threads
+    _handler: Callable[[str, str], Any]
+    _queues: dict[str, deque[_Command]]
+    _lanes: dict[str, _Lane]
+    _deficits: dict[str, float]
+    _costs: dict[str, float]
+    _running: set[str]
+    _closed: bool
+    _condition: threading.Condition
+    _workers: list[threading.Thread]
+
+    def __init__(self, handler: Callable[[str, str], Any], workers: int = 1, slow_workers: int = 1,
+                 queue_limit: int = DEFAULT_QUEUE_LIMIT) -> None:
+        """Start a scheduler running commands with handler on the given numbers of worker threads for
+        the interactive lane and for the slow lane.
+        """
+        self.queue_limit = queue_limit
+        self.rejected = 0
+        self._handler = handler
+        self._queues = {}
+        self._lanes = {INTERACTIVE_LANE: _Lane(), SLOW_LANE: _Lane()}
+        self._deficits = {}
+        self._costs = {}
+        self._running = set()
+        self._closed = False
+        self._condition = threading.Condition()
+        self._workers = [threading.Thread(target=self._work, args=((INTERACTIVE_LANE,),), daemon=True)
+                         for _ in range(workers)]
+        self._workers += [threading.Thread(target=self._work, args=((SLOW_LANE, INTERACTIVE_LANE),), daemon=True)
+                          for _ in range(slow_workers)]
+        for worker in self._workers:
+            worker.start()
+
+    def submit(self, session_id: str, command: str) -> Future:
+        """Queue command for the session with the given ID and return a future of its result.
+
+        Raise QueueFullError if the session already has queue_limit commands queued.
+        """
+        with self._condition:
+            if self._closed:
+                raise RuntimeError("the scheduler is closed")
+            commands = self._queues.setdefault(session_id, deque())
+            if len(commands) >= self.queue_limit:
+                self.rejected += 1
+                raise QueueFullError(f"session {session_id} has {len(commands)} commands queued")
+            commands.append(_Command(command, Future(), perf_counter()))
+            if len(commands) == 1 and session_id not in self._running:
+                self._enter_ring(session_id)
+                self._condition.notify_all()
+            return commands[-1].future
+
+    def queue_depth(self, session_id: str) -> int:
+        """Return the number of commands queued by the session with the given ID."""
+        with self._condition:
+            return len(self._queues.get(session_id, ()))
+
+    def throttled(self, session_id: str) -> bool:
+        """Return whether the session with the given ID has reached its high-water mark, so that its
+        client should stop submitting until some of its commands have run.
+        """
+        return self.queue_depth(session_id) >= self.queue_limit * HIGH_WATER_FRACTION
+
+    def metrics(self) -> SchedulerMetrics:
+        """Return a snapshot of the scheduler's queues and of recent wait times."""
+        with self._condition:
+            depths = [len(commands) for commands in self._queues.values()]
+            lanes = {name: (len(lane.ring), lane.dispatched, list(lane.waits)) for name, lane in self._lanes.items()}
+            rejected = self.rejected
+        return SchedulerMetrics(
+            queued=sum(depths), sessions_waiting=len(depths), max_queue_depth=max(depths, default=0),
+            throttled=sum(depth >= self.queue_limit * HIGH_WATER_FRACTION for depth in depths), rejected=rejected,
+            dispatched={name: dispatched for name, (_, dispatched, _) in lanes.items()},
+            lane_depths={name: depth for name, (depth, _, _) in lanes.items()},
+            wait_p50={name: percentile(waits, 0.5) if waits else 0.0 for name, (_, _, waits) in lanes.items()},
+            wait_p99={name: percentile(waits, 0.99) if waits else 0.0 for name, (_, _, waits) in lanes.items()})
+
+    def close(self) -> None:
+        """Stop accepting commands, and return once every queued command has run."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        for worker in self._workers:
+            worker.join()
+
+    def _enter_ring(self, session_id: str) -> None:
+        """Put the waiting session at the back of the ring of the lane of its next command."""
+        self._lanes[command_lane(self._queues[session_id][0].command)].ring.append(session_id)
+
+    def _cost(self, command: str) -> float:
+        """Return the estimated cost of command, in seconds."""
+        return self._costs.get(command.split(" ", 1)[0], QUANTUM)
+
+    def _next(self, lanes: tuple[str, ...]) -> Optional[tuple[str, _Command, _Lane]]:
+        """Take the next command to run from the first of the given lanes with a session waiting,
+        returning its session ID, the command and its lane, or None if no session is waiting in them.
+        """
+        lane = next((self._lanes[name] for name in lanes if self._lanes[name].ring), None)
+        if lane is None:
+            return None
+
+        cost = self._cost(self._queues[lane.ring[0]][0].command)
+        if self._deficits.get(lane.ring[0], 0.0) < cost:
+            # Rather than going round the ring one quantum at a time, find how many full rounds it
+            # takes until some session can afford its next command, and the first such session in
+            # the ring, then credit every session what it would have been credited on the way there
+            costs = [self._cost(self._queues[session_id][0].command) for session_id in lane.ring]
+            rounds = [max(math.ceil((session_cost - self._deficits.get(session_id, 0.0)) / QUANTUM), 0)
+                      for session_id, session_cost in zip(lane.ring, costs)]
+            needed = min(rounds)
+            position = rounds.index(needed)
+            for i, session_id in enumerate(lane.ring):
+                credit = (needed + 1 if i < position else needed) * QUANTUM
+                if credit:
+                    self._deficits[session_id] = self._deficits.get(session_id, 0.0) + credit
+            lane.ring.rotate(-position)
+            cost = costs[position]
+
+        session_id = lane.ring.popleft()
+        lane.dispatched += 1
+        self._deficits[session_id] = self._deficits.get(session_id, 0.0) - cost
+        commands = self._queues[session_id]
+        command = commands.popleft()
+        if not commands:
+            del self._queues[session_id]
+        self._running.add(session_id)
+        return session_id, command, lane
+
+    def _work(self, lanes: tuple[str, ...]) -> None:
+        """Run commands from the given lanes, in order of preference, until the scheduler is closed
+        and no command is left.
+        """
+        while True:
+            with self._condition:
+                taken = self._next(lanes)
+                while taken is None:
+                    if self._closed and not self._queues:
+                        return
+                    self._condition.wait()
+                    taken = self._next(lanes)
+            session_id, command, lane = taken
+
+            started = perf_counter()
+            if command.future.set_running_or_notify_cancel():
+                try:
+                    command.future.set_result(self._handler(session_id, command.command))
+                except Exception as error:  # the error belongs to whoever submitted the command
+                    command.future.set_exception(error)
+            finished = perf_counter()
+
+            with self._condition:
+                lane.waits.append(started - command.submitted)
+                verb = command.command.split(" ", 1)[0]
+                self._costs[verb] = self._cost(command.command) * (1 - COST_SMOOTHING) + \
+                    (finished - started) * COST_SMOOTHING
+                self._running.discard(session_id)
+                if session_id in self._queues:
+                    self._enter_ring(session_id)
+                    self._condition.notify_all()
+                else:
+                    self._deficits.pop(session_id, None)
+                    if self._closed and not self._queues:
+                        self._condition.notify_all()
+
+
+class FifoScheduler:
+    """Runs the commands of every session on one worker thread in the order they were submitted,
+    with no limit on how many are queued: the naive server the load test compares against.
+    """
+    # Private Instance Attributes:
+    #   - _handler: runs one command of one session
+    #   - _commands: the commands waiting to run, with their session IDs, or None to stop the worker
+    #   - _worker: the worker thread
+    _handler: Callable[[str, str], Any]
+    _commands: queue.Queue
+    _worker: threading.Thread
+
+    def __init__(self, handler: Callable[[str, str], Any]) -> None:
+        """Start a scheduler running commands with handler."""
+        self._handler = handler
+        self._commands = queue.Queue()
+        self._worker = threading.Thread(target=self._work, name="fifo-scheduler", daemon=True)
+        self._worker.start()
+
+    def submit(self, session_id: str, command: str) -> Future:
+        """Queue command for the session with the given ID and return a future of its result."""
+        future = Future()
+        self._commands.put((session_id, command, future))
+        return future
+
+    def close(self) -> None:
+        """Return once every queued command has run."""
+        self._commands.put(None)
+        self._worker.join()
+
+    def _work(self) -> None:
+        """Run commands until close is called."""
+        while (entry := self._commands.get()) is not None:
+            session_id, command, future = entry
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(self._handler(session_id, command))
+                except Exception as error:  # the error belongs to whoever submitted the command
+                    future.set_exception(error)
+
+
+def run_command(session: Session, command: str, save_file: str) -> None:
+    """Run command in session without reading input: a "go" or "take" command available at the
+    player's location, "save" (to save_file), "log" (printing every event) or "look".
+    """
+    game, player = session.game, session.player
+    location = game.get_location()
+    if command == "save":
+        game.save_game(save_file, player, session.game_log)
+    elif command == "log":
+        session.game_log.display_events()
+    elif command == "look":
+        print(location.long_description)
+    elif command in location.available_commands:
+        from adventure import update_game_log
+
+        update_game_log(session.game_log, location, command)
+        if command.startswith("go"):
+            game.current_location_id = location.available_commands[command]
+        elif not location.enemies:
+            game.take_item(player, game.get_item(command[len("take "):]))
+        game.steps = 0  # keep the game going for the whole test
+
+
+def _random_command(session: Session, rng: random.Random) -> str:
+    """Return a random "go" or "take" command available at the player's location."""
+    location = session.game.get_location()
+    return rng.choice([command for command in location.available_commands
+                       if command.startswith("go") or command[len("take "):] in location.items])
+
+
+def _player(scheduler: CommandScheduler | FifoScheduler, manager: SessionManager, session_id: str,
+            seconds: float, think_time: float, seed: int, latencies: list[float]) -> None:
+    """Play as an interactive player for the given number of seconds: submit one command, wait for
+    it, think, and repeat, recording the latency of every command.
+    """
+    rng = random.Random(seed)
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        with manager.use(session_id) as session:
+            command = _random_command(session, rng)
+        started = perf_counter()
+        scheduler.submit(session_id, command).result()
+        latencies.append(perf_counter() - started)
+        sleep(think_time)
+
+
+def _bot(scheduler: CommandScheduler | FifoScheduler, session_id: str, seconds: float, seed: int,
+         completed: list[int]) -> None:
+    """Flood commands as a bot for the given number of seconds: moves back and forth, with a save
+    and a log in every 20 commands, as fast as the scheduler accepts them. When the bot's queue is
+    full it waits for its oldest command; it never has more than 10,000 commands outstanding.
+    """
+    rng = random.Random(seed)
+    pending = deque()
+    deadline = perf_counter() + seconds
+    while perf_counter() < deadline:
+        roll = rng.randrange(20)
+        command = "save" if roll == 0 else "log" if roll == 1 else rng.choice(["go east", "go west", "look"])
+        try:
+            pending.append(scheduler.submit(session_id, command))
+        except QueueFullError:
+            pending.popleft().result()
+            completed[0] += 1
+            continue
+        while len(pending) >= 10_000 or (pending and pending[0].done()):
+            pending.popleft().result()
+            completed[0] += 1
+    for future in pending:
+        future.cancel()
+
+
+@dataclass
+class LoadTestResult:
+    """The outcome of one load test.
+
+    Instance Attributes:
+        - label: A description of the test.
+        - latencies: The latency of every interactive command, in seconds.
+        - bot_commands: The number of the bot's commands that ran.
+        - metrics: The scheduler's metrics at the end of the test, or None for a FIFO scheduler.
+    """
+    label: str
+    latencies: list[float]
+    bot_commands: int
+    metrics: Optional[SchedulerMetrics]
+
+
+def load_test(game_data_file: str, players: int = 20, seconds: float = 3.0, fair: bool = True, bot: bool = True,
+              think_time: float = 0.005, seed: int = 0) -> LoadTestResult:
+    """Play the given number of interactive players for the given number of seconds, alongside a
+    flooding bot if bot is True, through a CommandScheduler if fair is True or a FifoScheduler
+    otherwise, and return their latencies.
+    """
+    import contextlib
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as temp_dir, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        manager = SessionManager(game_data_file, os.path.join(temp_dir, "sessions.spill"))
+        session_ids = [f"player {i}" for i in range(players)] + ["bot"]
+        for session_id in session_ids:
+            manager.open(session_id)
+
+        def handler(session_id: str, command: str) -> None:
+            with manager.use(session_id) as session:
+                run_command(session, command, os.path.join(temp_dir, f"{session_id}.sav"))
+
+        scheduler = CommandScheduler(handler) if fair else FifoScheduler(handler)
+        latencies = [[] for _ in range(players)]
+        completed = [0]
+        threads = [threading.Thread(target=_player, args=(scheduler, manager, session_ids[i], seconds, think_time,
+                                                          seed * 1000 + i, latencies[i]))
+                   for i in range(players)]
+        if bot:
+            threads.append(threading.Thread(target=_bot, args=(scheduler, "bot", seconds, seed, completed)))
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        metrics = scheduler.metrics() if fair else None
+        scheduler.close()
+        manager.shutdown()
+
+    label = f"{'fair' if fair else 'FIFO'} scheduler, {'with' if bot else 'no'} bot"
+    return LoadTestResult(label, [latency for player in latencies for latency in player], completed[0], metrics)
+
+
+def print_load_test(result: LoadTestResult) -> None:
+    """Print the interactive latency of a load test, the bot's throughput and the scheduler's metrics."""
+    print(f"{result.label:<26} {len(result.latencies):>6} interactive commands: "
+          f"p50 {percentile(result.latencies, 0.5) * 1000:7.2f} ms, "
+          f"p99 {percentile(result.latencies, 0.99) * 1000:8.2f} ms; bot ran {result.bot_commands} commands")
+    if result.metrics is not None:
+        metrics = result.metrics
+        waits = ", ".join(f"{lane} p50 {metrics.wait_p50[lane] * 1000:.2f} ms / "
+                          f"p99 {metrics.wait_p99[lane] * 1000:.2f} ms" for lane in metrics.dispatched)
+        print(f"{'':<26} waits: {waits}; queued at the end {metrics.queued} (deepest {metrics.max_queue_depth}), "
+              f"{metrics.throttled} throttled, {metrics.rejected} rejected")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Load test the fair command scheduler.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--players", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for fair_, bot_ in [(True, False), (True, True), (False, True)]:
+        print_load_test(load_test(args.game_data, args.players, args.seconds, fair_, bot_, seed=args.seed))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
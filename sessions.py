@@ -0,0 +1,913 @@
+"""CSC111 Project 1: Text Adventure Game - Session Hibernation
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module keeps many hosted game sessions in a bounded amount of memory. A session
+that has been idle for longer than a timeout is hibernated by a periodic background sweep: its
+game state is encoded with StateCodec (see state_codec.py), its event log is packed, and both
+are appended to a spill file on disk, after which its AdventureGame, Player and EventList are
+freed. Encoding, decoding and spill file I/O happen outside the manager's lock, so that moving
+one session in or out of memory does not hold up turns in any other. The next time the
+session is used it is rehydrated transparently, into a new game built from the game data that
+was parsed once at startup. A connection that shows activity (e.g. a keystroke) can ask for its
+session to be prefetched, so that it is rehydrated on a background thread before its command
+arrives. Only what StateCodec encodes survives hibernation: in particular a session's world
+clock (see world_clock.py) is not restored, and must be set again on the rehydrated game.
+
+Resident sessions are also kept under a global memory budget. Each is charged an estimate of
+its size (the measured size of a new session, plus a measured cost per logged event), and when
+the total goes over the budget the least recently used sessions are hibernated first.
+
+A session whose spill fails (e.g. the disk is full) stays resident, as the least recently used,
+so that it is the first tried again; a failed sweep is logged and the sweeper keeps running.
+
+Running this module benchmarks the manager: it opens many sessions, of which only a few stay
+active, and reports the memory they hold against keeping every session resident, and the
+latency of a turn on a resident, a hibernated and a prefetched session.
+
+Usage:
+    python sessions.py [--sessions N] [--active N] [--budget-mb N] [--seed N]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import contextlib
+import json
+import logging
+import os
+import random
+import struct
+import threading
+import time
+import tracemalloc
+import zlib
+from collections import Counter, OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import BinaryIO, Callable, Iterator, Optional
+
+from adventure import AdventureGame, update_game_log
+from event_logger import Event, EventList
+from game_entities import Inventory, Player
+from state_codec import StateCodec
+
+# The number of seconds a session may be idle before it is hibernated.
+DEFAULT_IDLE_TIMEOUT = 300.0
+
+# The number of seconds between two sweeps of the idle sessions.
+DEFAULT_SWEEP_INTERVAL = 10.0
+
+# The estimated size of all resident sessions, in bytes, above which the least recently used are hibernated.
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# The weight limit of a player's inventory, which the state codec does not store.
+WEIGHT_LIMIT = 10
+
+# The number of garbage bytes below which a spill file is never compacted.
+COMPACT_MIN_BYTES = 1024 * 1024
+
+
+def pack_log(game_log: EventList) -> bytes:
+    """Return the events of game_log as a compressed byte string, with each distinct description stored once.
+
+    >>> log = EventList()
+    >>> for loc_id, command in [(1, "go east"), (2, "go west"), (1, None)]:
+    ...     log.add_event(Event(loc_id, f"Location {loc_id}", command))
+    >>> unpack_log(pack_log(log)).to_data() == log.to_data()
+    True
+    """
+    descriptions = {}
+    events = [[event['id_num'], descriptions.setdefault(event['description'], len(descriptions)),
+               event['next_command']] for event in game_log.to_data()]
+    return zlib.compress(json.dumps([list(descriptions), events], separators=(',', ':')).encode('utf-8'), 1)
+
+
+def unpack_log(packed: bytes) -> EventList:
+    """Return the event log packed by pack_log. Events with the same description share one string."""
+    descriptions, events = json.loads(zlib.decompress(packed))
+    game_log = EventList()
+    for id_num, description, next_command in events:
+        game_log.add_event(Event(id_num, descriptions[description], next_command))
+    return game_log
+
+
+class SpillStore:
+    """An append-only file of byte records, each stored under a key, with an index in memory of
+    where the latest record of each key is.
+
+    A record that is replaced or deleted becomes garbage; once the file is more than half
+    garbage it is rewritten with only the live records. The file is scratch space for one
+    process, so it starts empty and is deleted when the store is closed. Every method may be
+    called from any thread.
+
+    Instance Attributes:
+        - path: The spill file.
+        - live_bytes: The total size of the latest record of every key.
+        - garbage_bytes: The total size of the records that were replaced or deleted.
+        - compactions: The number of times the file was rewritten.
+
+    Representation Invariants:
+        - self.live_bytes == sum(length for _, length in self._index.values())
+    """
+    path: str
+    live_bytes: int
+    garbage_bytes: int
+    compactions: int
+
+    # Private Instance Attributes:
+    #   - _file: the spill file, open for reading and writing
+    #   - _index: the offset and length of the latest record of every key
+    #   - _lock: guards the file and every attribute of the store
+    _file: BinaryIO
+    _index: dict[str, tuple[int, int]]
+    _lock: threading.RLock
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self.path = path
+        self.live_bytes = 0
+        self.garbage_bytes = 0
+        self.compactions = 0
+        self._file = open(path, 'w+b')
+        self._index = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        """Return the number of keys in this store."""
+        with self._lock:
+            return len(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        """Return whether a record is stored under key."""
+        with self._lock:
+            return key in self._index
+
+    def put(self, key: str, record: bytes) -> None:
+        """Store record under key, replacing any record already there."""
+        with self._lock:
+            self._discard(key)
+            offset = self._file.seek(0, os.SEEK_END)
+            self._file.write(record)
+            self._index[key] = (offset, len(record))
+            self.live_bytes += len(record)
+
+    def get(self, key: str) -> Optional[bytes]:
+        """Return the record stored under key, or None if there is none."""
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            offset, length = entry
+            self._file.seek(offset)
+            return self._file.read(length)
+
+    def delete(self, key: str) -> None:
+        """Delete the record stored under key, if there is one."""
+        with self._lock:
+            self._discard(key)
+            if self.garbage_bytes > max(self.live_bytes, COMPACT_MIN_BYTES):
+                self.compact()
+
+    def _discard(self, key: str) -> None:
+        """Remove key from the index, counting its record as garbage."""
+        entry = self._index.pop(key, None)
+        if entry is not None:
+            self.live_bytes -= entry[1]
+            self.garbage_bytes += entry[1]
+
+    def compact(self) -> None:
+        """Rewrite the file with only the latest record of every key, in their current order."""
+        with self._lock:
+            index = {}
+            with open(self.path + '.tmp', 'w+b') as new_file:
+                for key, (offset, length) in sorted(self._index.items(), key=lambda entry: entry[1][0]):
+                    self._file.seek(offset)
+                    index[key] = (new_file.tell(), length)
+                    new_file.write(self._file.read(length))
+            self._file.close()
+            os.replace(self.path + '.tmp', self.path)
+            self._file = open(self.path, 'r+b')
+            self._index = index
+            self.garbage_bytes = 0
+            self.compactions += 1
+
+    def size(self) -> int:
+        """Return the size of the spill file, in bytes."""
+        with self._lock:
+            return self._file.seek(0, os.SEEK_END)
+
+    def close(self) -> None:
+        """Close and delete the spill file."""
+        with self._lock:
+            self._file.close()
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(self.path)
+
+
+@dataclass
+class Session:
+    """One hosted player's game.
+
+    Instance Attributes:
+        - session_id: The ID the session is known by.
+        - game: The player's game.
+        - player: The player's character.
+        - game_log: The player's event log.
+        - last_active: The time the session was last used, by the manager's clock.
+        - footprint: The estimated size of the session in memory, in bytes, as of when it was last used.
+    """
+    session_id: str
+    game: AdventureGame
+    player: Player
+    game_log: EventList
+    last_active: float
+    footprint: int = 0
+
+
+class SessionManager:
+    """The sessions of one world, of which only the recently used are kept in memory.
+
+    Sessions are used through use(), which rehydrates a hibernated session first. A session in
+    use is never hibernated. Every method may be called from any thread.
+
+    The manager's lock is only held to update its bookkeeping. A session being hibernated or
+    rehydrated is marked as moving while it is encoded or decoded and its record written to or
+    read from the spill file, with the lock released, so that other sessions can be used
+    meanwhile; anything else that needs a moving session waits for the move to finish. Idle
+    sessions are hibernated by a background thread every sweep_interval seconds, rather than
+    by use().
+
+    Instance Attributes:
+        - idle_timeout: The number of seconds a session may be idle before hibernate_idle hibernates it.
+        - memory_budget: The estimated size of all resident sessions, in bytes, above which the
+          least recently used are hibernated.
+        - session_bytes: The measured size of a new session, in bytes.
+        - event_bytes: The measured size of each event in a session's log, in bytes.
+        - resident_bytes: The estimated size of all resident sessions, in bytes.
+        - hibernations: The number of times a session was hibernated.
+        - rehydrations: The number of times a session was rehydrated.
+        - prefetch_hits: The number of times use() found a session already rehydrated by prefetch().
+        - spill_failures: The number of times a session could not be hibernated, and stayed resident.
+        - last_spill_error: The error raised by the most recent failed spill, or None.
+        - store: The spill store holding the hibernated sessions.
+
+    Representation Invariants:
+        - self.resident_bytes == sum(session.footprint for session in self._resident.values())
+        - not any(session_id in self.store for session_id in self._resident)
+        - not any(session_id in self._resident for session_id in self._moving)
+    """
+    idle_timeout: float
+    memory_budget: int
+    session_bytes: int
+    event_bytes: int
+    resident_bytes: int
+    hibernations: int
+    rehydrations: int
+    prefetch_hits: int
+    spill_failures: int
+    last_spill_error: Optional[BaseException]
+    store: SpillStore
+
+    # Private Instance Attributes:
+    #   - _game_data_file: the game data file of the world
+    #   - _world_data: the game data, parsed once, from which every game is built
+    #   - _world_hash: the SHA-256 hash of the game data
+    #   - _codec: the state codec of the world
+    #   - _resident: the resident sessions, least recently used first
+    #   - _in_use: the number of use() blocks currently open on each session
+    #   - _moving: the sessions being hibernated, rehydrated or closed, each with an event set when it is done
+    #   - _prefetched: the sessions rehydrated by prefetch() and not used since
+    #   - _prefetching: the sessions with a prefetch in progress
+    #   - _clock: returns the current time, in seconds
+    #   - _executor: the background thread that prefetches sessions
+    #   - _stopping: set when the manager shuts down, to stop the sweeper
+    #   - _sweeper: the background thread that hibernates idle sessions, or None if there is none
+    #   - _lock: guards every attribute of the manager and its sessions' footprints
+    _game_data_file: str
+    _world_data: dict
+    _world_hash: str
+    _codec: StateCodec
+    _resident: OrderedDict[str, Session]
+    _in_use: Counter
+    _moving: dict[str, threading.Event]
+    _prefetched: set[str]
+    _prefetching: set[str]
+    _clock: Callable[[], float]
+    _executor: ThreadPoolExecutor
+    _stopping: threading.Event
+    _sweeper: Optional[threading.Thread]
+    _lock: threading.RLock
+
+    def __init__(self, game_data_file: str, spill_file: str, idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 memory_budget: int = DEFAULT_MEMORY_BUDGET, clock: Callable[[], float] = time.monotonic,
+                 sweep_interval: Optional[float] = DEFAULT_SWEEP_INTERVAL) -> None:
+        """Create a manager of sessions in the world of game_data_file, hibernating them to spill_file.
+
+        clock gives the current time in seconds; it is only compared with itself. Idle sessions
+        are hibernated every sweep_interval seconds of real time, or only when hibernate_idle is
+        called if sweep_interval is None (e.g. when clock is simulated).
+        """
+        self._game_data_file = game_data_file
+        self._world_data, self._world_hash = AdventureGame._load_game_data(game_data_file)
+        self._codec = StateCodec(self._new_game())
+        self.idle_timeout = idle_timeout
+        self.memory_budget = memory_budget
+        self.session_bytes, self.event_bytes = self._measure_footprint()
+        self.resident_bytes = 0
+        self.hibernations = 0
+        self.rehydrations = 0
+        self.prefetch_hits = 0
+        self.spill_failures = 0
+        self.last_spill_error = None
+        self._resident = OrderedDict()
+        self.store = SpillStore(spill_file)
+        self._in_use = Counter()
+        self._moving = {}
+        self._prefetched = set()
+        self._prefetching = set()
+        self._clock = clock
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="prefetch")
+        self._lock = threading.RLock()
+        self._stopping = threading.Event()
+        self._sweeper = None
+        if sweep_interval is not None:
+            self._sweeper = threading.Thread(target=self._sweep, args=(sweep_interval,), name="idle-sweeper",
+                                             daemon=True)
+            self._sweeper.start()
+
+    def _new_game(self) -> AdventureGame:
+        """Return a new game in this manager's world, without reading or validating the game data again."""
+        return AdventureGame(self._game_data_file, 1, world_data=self._world_data, world_hash=self._world_hash)
+
+    def new_session_state(self, stats: tuple[int, int, int] = (5, 5, 0)) -> tuple[AdventureGame, Player, EventList]:
+        """Return a new game at the start of this manager's world, a player with the given
+        (speed, attack, defense) and an event log of the start location, not opened as a session.
+        """
+        speed, attack, defense = stats
+        game = self._new_game()
+        player = Player(Inventory([], WEIGHT_LIMIT, 0.0), speed=speed, attack=attack, defense=defense,
+                        skip_stats_selection=True)
+        game_log = EventList()
+        game_log.add_event(Event(game.current_location_id, game.get_location().long_description))
+        return game, player, game_log
+
+    def _measure_footprint(self) -> tuple[int, int]:
+        """Return the size of a new session and of each event in its log, in bytes, measured with tracemalloc."""
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        try:
+            start = tracemalloc.get_traced_memory()[0]
+            game, player, game_log = self.new_session_state()
+            created = tracemalloc.get_traced_memory()[0]
+            for _ in range(100):
+                update_game_log(game_log, game.get_location(), "look")
+            logged = tracemalloc.get_traced_memory()[0]
+        finally:
+            if not tracing:
+                tracemalloc.stop()
+        del game, player, game_log
+        return created - start, max((logged - created) // 100, 0)
+
+    def __len__(self) -> int:
+        """Return the number of open sessions, resident, hibernated or moving between the two."""
+        with self._lock:
+            return len(self._resident) + len(self.store) + sum(session_id not in self.store
+                                                               for session_id in self._moving)
+
+    def resident_count(self) -> int:
+        """Return the number of sessions held in memory."""
+        with self._lock:
+            return len(self._resident)
+
+    def resident_sessions(self) -> list[Session]:
+        """Return the sessions held in memory, least recently used first."""
+        with self._lock:
+            return list(self._resident.values())
+
+    def is_resident(self, session_id: str) -> bool:
+        """Return whether the session with the given ID is held in memory."""
+        with self._lock:
+            return session_id in self._resident
+
+    def open(self, session_id: str, stats: tuple[int, int, int] = (5, 5, 0)) -> None:
+        """Open a new session with the given ID, for a player with the given (speed, attack, defense)
+        at the start location.
+
+        Preconditions:
+            - no session with the given ID is open
+        """
+        game, player, game_log = self.new_session_state(stats)
+        with self._lock:
+            self._admit(Session(session_id, game, player, game_log, self._clock()))
+            evicted = self._over_budget()
+        self._spill_all(evicted)
+
+    def close(self, session_id: str) -> None:
+        """Close the session with the given ID, freeing it wherever it is."""
+        while True:
+            with self._lock:
+                moving = self._moving.get(session_id)
+                if moving is None:
+                    session = self._resident.pop(session_id, None)
+                    if session is not None:
+                        self.resident_bytes -= session.footprint
+                    self._prefetched.discard(session_id)
+                    done = self._moving[session_id] = threading.Event()
+                    break
+            moving.wait()
+        try:
+            self.store.delete(session_id)
+        finally:
+            self._finish_move(session_id, done)
+
+    @contextlib.contextmanager
+    def use(self, session_id: str) -> Iterator[Session]:
+        """Yield the session with the given ID, rehydrating it first if it is hibernated, and keep it
+        resident until the with block ends. Its footprint is then re-estimated and the memory
+        budget enforced.
+
+        Raise KeyError if no session with the given ID is open.
+        """
+        session = None
+        while session is None:
+            with self._lock:
+                moving = self._moving.get(session_id)
+                rehydrate = moving is None and session_id not in self._resident
+                if rehydrate:
+                    moving = self._start_rehydration(session_id)
+                elif moving is None:
+                    session = self._resident[session_id]
+                    if session_id in self._prefetched:
+                        self.prefetch_hits += 1
+                    self._prefetched.discard(session_id)
+                    session.last_active = self._clock()
+                    self._resident.move_to_end(session_id)
+                    self._in_use[session_id] += 1
+            if rehydrate:
+                self._rehydrate(session_id, moving, use=True)
+            elif session is None:
+                moving.wait()  # hibernated or rehydrated by another thread: look again once it is done
+        try:
+            yield session
+        finally:
+            with self._lock:
+                self._in_use[session_id] -= 1
+                if not self._in_use[session_id]:
+                    del self._in_use[session_id]
+                evicted = []
+                if self._resident.get(session_id) is session:
+                    session.last_active = self._clock()
+                    self._resident.move_to_end(session_id)
+                    self._charge(session)
+                    evicted = self._over_budget()
+            self._spill_all(evicted)
+
+    def prefetch(self, session_id: str) -> Optional[Future]:
+        """Start rehydrating the session with the given ID on a background thread, if it is hibernated,
+        so that its next use() does not wait for it. Return the future of the rehydration, or None if
+        there is nothing to do.
+        """
+        with self._lock:
+            if session_id not in self.store or session_id in self._prefetching:
+                return None
+            self._prefetching.add(session_id)
+        return self._executor.submit(self._prefetch, session_id)
+
+    def _prefetch(self, session_id: str) -> None:
+        """Rehydrate the session with the given ID if it is still hibernated."""
+        with self._lock:
+            self._prefetching.discard(session_id)
+            if session_id in self._moving or session_id in self._resident or session_id not in self.store:
+                return
+            moving = self._start_rehydration(session_id)
+        self._rehydrate(session_id, moving, use=False)
+
+    def hibernate(self, session_id: str) -> bool:
+        """Hibernate the session with the given ID, returning whether it was resident and not in use."""
+        with self._lock:
+            detached = self._detach(session_id)
+        if detached is None:
+            return False
+        self._spill(*detached)
+        return True
+
+    def hibernate_idle(self) -> int:
+        """Hibernate every session idle for longer than idle_timeout, returning how many were hibernated.
+
+        Sessions are checked from the least recently used, so this stops at the first that is not idle.
+        """
+        with self._lock:
+            cutoff = self._clock() - self.idle_timeout
+            idle = []
+            for session_id, session in self._resident.items():
+                if session.last_active > cutoff:
+                    break
+                if session_id not in self._in_use:
+                    idle.append(session_id)
+            detached = [self._detach(session_id) for session_id in idle]
+        self._spill_all(detached)
+        return len(detached)
+
+    def _sweep(self, interval: float) -> None:
+        """Hibernate idle sessions every interval seconds, until the manager shuts down.
+
+        A sweep that fails is logged, and the next one runs as usual.
+        """
+        while not self._stopping.wait(interval):
+            try:
+                self.hibernate_idle()
+            except Exception:
+                logging.getLogger(__name__).exception("Sweeping the idle sessions failed")
+
+    def _detach(self, session_id: str) -> Optional[tuple[Session, threading.Event]]:
+        """Mark the session with the given ID as moving out of memory and return it with the event
+        to set once it is spilled, or return None if it is not resident or is in use.
+
+        The caller must hold the lock, and then spill the session with _spill.
+        """
+        session = self._resident.get(session_id)
+        if session is None or session_id in self._in_use:
+            return None
+        del self._resident[session_id]
+        self.resident_bytes -= session.footprint
+        self._prefetched.discard(session_id)
+        done = self._moving[session_id] = threading.Event()
+        return session, done
+
+    def _spill(self, session: Session, done: threading.Event) -> None:
+        """Encode the detached session and write it to the spill file, without holding the lock.
+
+        If that fails, the session is made resident again, as the least recently used, and the
+        error is raised.
+        """
+        try:
+            state = self._codec.encode(session.game, session.player)
+            self.store.put(session.session_id, struct.pack('<I', len(state)) + state + pack_log(session.game_log))
+        except BaseException as error:
+            self._reattach(session, done, error)
+            raise
+        with self._lock:
+            self.hibernations += 1
+        self._finish_move(session.session_id, done)
+
+    def _spill_all(self, detached: list[Optional[tuple[Session, threading.Event]]]) -> None:
+        """Spill every detached session (see _detach). Every one is spilled or made resident again
+        even if some fail, after which the first error is raised.
+        """
+        pending = [entry for entry in detached if entry is not None]
+        first_error = None
+        try:
+            while pending:
+                session, done = pending.pop(0)
+                try:
+                    self._spill(session, done)
+                except Exception as error:
+                    first_error = first_error or error
+        finally:
+            for session, done in pending:  # only when interrupted
+                self._reattach(session, done)
+        if first_error is not None:
+            raise first_error
+
+    def _reattach(self, session: Session, done: threading.Event, error: Optional[BaseException] = None) -> None:
+        """Make the detached session resident again, as the least recently used, and wake up whoever
+        waits for it. If error is not None, record it as the reason its spill failed.
+        """
+        with self._lock:
+            # Made resident and no longer moving at once, as in _rehydrate
+            self._resident[session.session_id] = session
+            self._resident.move_to_end(session.session_id, last=False)
+            self.resident_bytes += session.footprint
+            if error is not None:
+                self.spill_failures += 1
+                self.last_spill_error = error
+            del self._moving[session.session_id]
+        done.set()
+
+    def _start_rehydration(self, session_id: str) -> threading.Event:
+        """Mark the hibernated session with the given ID as moving into memory, and return the event
+        to set once it is resident. The caller must hold the lock, and then call _rehydrate.
+
+        Raise KeyError if no session with the given ID is open.
+        """
+        if session_id not in self.store:
+            raise KeyError(session_id)
+        done = self._moving[session_id] = threading.Event()
+        return done
+
+    def _rehydrate(self, session_id: str, done: threading.Event, use: bool) -> None:
+        """Read and decode the hibernated session with the given ID without holding the lock, then
+        make it resident, as prefetched unless use is True.
+        """
+        try:
+            record = self.store.get(session_id)
+            state_length = struct.unpack_from('<I', record)[0]
+            game = self._new_game()
+            player = Player(Inventory([], WEIGHT_LIMIT, 0.0), skip_stats_selection=True)
+            self._codec.decode(record[4:4 + state_length], game, player)
+            session = Session(session_id, game, player, unpack_log(record[4 + state_length:]), self._clock())
+            self.store.delete(session_id)
+        except BaseException:
+            self._finish_move(session_id, done)
+            raise
+        with self._lock:
+            # Made resident and no longer moving at once, so that no other thread sees it as both
+            self._admit(session)
+            self.rehydrations += 1
+            if not use:
+                self._prefetched.add(session_id)
+            del self._moving[session_id]
+            evicted = self._over_budget(keep=session_id if use else None)
+        done.set()
+        self._spill_all(evicted)
+
+    def _finish_move(self, session_id: str, done: threading.Event) -> None:
+        """Unmark the session with the given ID as moving, and wake up whoever waits for it."""
+        with self._lock:
+            del self._moving[session_id]
+        done.set()
+
+    def _admit(self, session: Session) -> None:
+        """Make session resident, as the most recently used."""
+        self._resident[session.session_id] = session
+        self._charge(session)
+
+    def _charge(self, session: Session) -> None:
+        """Re-estimate the footprint of the resident session, updating resident_bytes."""
+        footprint = self.session_bytes + len(session.game_log) * self.event_bytes
+        self.resident_bytes += footprint - session.footprint
+        session.footprint = footprint
+
+    def _over_budget(self, keep: Optional[str] = None) -> list[Optional[tuple[Session, threading.Event]]]:
+        """Detach the least recently used sessions not in use (other than keep) until the resident
+        sessions fit in memory_budget, and return them to be spilled. The caller must hold the lock.
+        """
+        detached = []
+        while self.resident_bytes > self.memory_budget:
+            session_id = next((session_id for session_id in self._resident
+                               if session_id not in self._in_use and session_id != keep), None)
+            if session_id is None:
+                break
+            detached.append(self._detach(session_id))
+        return detached
+
+    def shutdown(self) -> None:
+        """Stop prefetching and sweeping, and delete the spill file, discarding every hibernated session."""
+        self._stopping.set()
+        if self._sweeper is not None:
+            self._sweeper.join()
+        self._executor.shutdown(wait=True)
+        with self._lock:
+            self.store.close()
+
+
+def _play_turn(session: Session, rng: random.Random) -> None:
+    """Move or take an item at random in session, without reading input. The steps are reset so
+    that the game never ends.
+    """
+    game, player = session.game, session.player
+    location = game.get_location()
+    choice = rng.choice([command for command in location.available_commands
+                         if command.startswith("go") or command[len("take "):] in location.items])
+    update_game_log(session.game_log, location, choice)
+    if choice.startswith("go"):
+        game.current_location_id = location.available_commands[choice]
+    elif not location.enemies:
+        game.take_item(player, game.get_item(choice[len("take "):]))
+    game.steps = 0
+
+
+def percentile(samples: list[float], fraction: float) -> float:
+    """Return the given fraction's percentile of samples, which is not empty.
+
+    >>> percentile([3.0, 1.0, 2.0, 4.0], 0.5)
+    3.0
+    >>> percentile([3.0, 1.0, 2.0, 4.0], 0.99)
+    4.0
+    """
+    ordered = sorted(samples)
+    return ordered[min(int(len(ordered) * fraction), len(ordered) - 1)]
+
+
+def benchmark(game_data_file: str, sessions: int = 100_000, active: int = 1000, turns: int = 5,
+              memory_budget: int = DEFAULT_MEMORY_BUDGET, seed: int = 0) -> None:
+    """Open the given number of sessions and play a few turns in each, then keep only active of
+    them busy, and print the memory held against keeping every session resident, and the
+    latency of a turn on a resident, a hibernated and a prefetched session.
+
+    The manager runs on a simulated clock, so that sessions go idle without waiting: every
+    session opened or turn played advances it by 10 ms, with an idle timeout of 30 s, and idle
+    sessions are swept once every simulated second instead of by a background thread. Every
+    hundredth session is left alone after it is opened, and is checked at the end to rehydrate
+    to exactly its state before hibernation.
+    """
+    import tempfile
+    from time import perf_counter
+
+    now = [0.0]
+    rng = random.Random(seed)
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    with tempfile.TemporaryDirectory() as spill_dir, open(os.devnull, 'w') as devnull:
+        manager = SessionManager(game_data_file, os.path.join(spill_dir, "sessions.spill"), 30.0, memory_budget,
+                                 lambda: now[0], sweep_interval=None)
+
+        def tick() -> None:
+            """Advance the simulated clock by 10 ms, sweeping the idle sessions every simulated second."""
+            now[0] += 0.01
+            if round(now[0] * 100) % 100 == 0:
+                manager.hibernate_idle()
+
+        digests = {}
+        start = perf_counter()
+        with contextlib.redirect_stdout(devnull):
+            for i in range(sessions):
+                session_id = f"s{i}"
+                manager.open(session_id, (rng.randint(1, 5), rng.randint(1, 5), rng.randint(0, 4)))
+                with manager.use(session_id) as session:
+                    for _ in range(turns):
+                        _play_turn(session, rng)
+                    if i % 100 == 0:
+                        digests[session_id] = session.game.state_digest(session.player, session.game_log)
+                tick()
+            open_seconds = perf_counter() - start
+
+            active_ids = [f"s{i}" for i in range(sessions - 1, -1, -1) if i % 100][:active]
+            for _ in range(turns):
+                for session_id in active_ids:
+                    with manager.use(session_id) as session:
+                        _play_turn(session, rng)
+                    tick()
+        manager.hibernate_idle()
+        held = tracemalloc.get_traced_memory()[0] - baseline
+        tracemalloc.stop()
+
+        print(f"{sessions} sessions opened and played in {open_seconds:.1f} s; {active} kept active")
+        print(f"  measured session size: {manager.session_bytes} bytes + {manager.event_bytes} bytes per event")
+        print(f"  resident sessions: {manager.resident_count()} "
+              f"(estimated {manager.resident_bytes / 2 ** 20:.1f} MiB of a {memory_budget / 2 ** 20:.0f} MiB budget)")
+        everything = sessions * (manager.session_bytes + (turns + 1) * manager.event_bytes)
+        print(f"  memory held: {held / 2 ** 20:.1f} MiB, against an estimated {everything / 2 ** 20:.0f} MiB "
+              f"with every session resident; spill file: {manager.store.size() / 2 ** 20:.1f} MiB")
+
+        latencies = {"resident": [], "hibernated": [], "prefetched": []}
+        samples = [f"s{i}" for i in range(1, sessions, max(sessions // 1000, 1)) if i % 100]
+        for kind in latencies:
+            for session_id in samples:
+                if kind == "resident":
+                    with manager.use(session_id):
+                        pass
+                else:
+                    manager.hibernate(session_id)
+                    if kind == "prefetched":
+                        manager.prefetch(session_id).result()
+                began = perf_counter()
+                with manager.use(session_id) as session, contextlib.redirect_stdout(devnull):
+                    _play_turn(session, rng)
+                latencies[kind].append(perf_counter() - began)
+        for kind, samples_ in latencies.items():
+            print(f"  turn on a {kind + ' session:':<20} median {percentile(samples_, 0.5) * 1e6:7.1f} us, "
+                  f"99th percentile {percentile(samples_, 0.99) * 1e6:7.1f} us")
+
+        mismatches = 0
+        for session_id, digest in digests.items():
+            with manager.use(session_id) as session:
+                mismatches += session.game.state_digest(session.player, session.game_log) != digest
+        print(f"  {len(digests) - mismatches}/{len(digests)} sessions rehydrated to their state before hibernation; "
+              f"{manager.hibernations} hibernations, {manager.rehydrations} rehydrations, "
+              f"{manager.prefetch_hits} prefetch hits, {manager.store.compactions} spill compactions")
+        manager.shutdown()
+
+
+def check_spill_failures(game_data_file: str, sessions: int = 5, seed: int = 0) -> list[str]:
+    """Make every write to the spill file fail with a full disk, and return every way in which
+    the manager then loses, corrupts or blocks a session, or stops sweeping.
+
+    A sweep must leave every session resident, unchanged and usable at once, and the sweeper
+    thread must keep trying; once writes succeed again, every session must be hibernated by the
+    next sweep and rehydrate unchanged.
+    """
+    import errno
+    import tempfile
+
+    def failing_put(key: str, record: bytes) -> None:
+        """Fail like a write to a full disk."""
+        attempts.append(key)
+        raise OSError(errno.ENOSPC, os.strerror(errno.ENOSPC))
+
+    def use_within(manager: SessionManager, session_id: str, seconds: float) -> Optional[str]:
+        """Return the digest of the session with the given ID, or None if use() fails or blocks for seconds."""
+        result = []
+
+        def target() -> None:
+            """Use the session and record its digest."""
+            with contextlib.suppress(Exception), manager.use(session_id) as used:
+                result.append(used.game.state_digest(used.player, used.game_log))
+
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        thread.join(seconds)
+        return result[0] if result else None
+
+    failures = []
+    rng = random.Random(seed)
+    now = [0.0]
+    session_ids = [f"s{i}" for i in range(sessions)]
+    logger = logging.getLogger(__name__)
+    logger.disabled = True  # the sweeper logs every failure on purpose
+    with tempfile.TemporaryDirectory() as spill_dir, open(os.devnull, 'w') as devnull, \
+            contextlib.redirect_stdout(devnull):
+        for sweeper in (False, True):
+            manager = SessionManager(game_data_file, os.path.join(spill_dir, f"{sweeper}.spill"), idle_timeout=1.0,
+                                     clock=lambda: now[0], sweep_interval=0.01 if sweeper else None)
+            attempts = []
+            digests = {}
+            for session_id in session_ids:
+                manager.open(session_id)
+                with manager.use(session_id) as session:
+                    for _ in range(5):
+                        _play_turn(session, rng)
+                    digests[session_id] = session.game.state_digest(session.player, session.game_log)
+            resident_bytes = manager.resident_bytes
+            working_put, manager.store.put = manager.store.put, failing_put
+
+            now[0] += 2.0
+            if sweeper:
+                deadline = time.monotonic() + 5.0
+                while len(attempts) < 3 * sessions and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                if len(attempts) < 3 * sessions:
+                    failures.append("the sweeper stopped trying after a failed spill")
+            else:
+                try:
+                    manager.hibernate_idle()
+                    failures.append("hibernate_idle did not raise the error of a failed spill")
+                except OSError:
+                    pass
+                if len(attempts) != sessions:
+                    failures.append(f"{len(attempts)} spills attempted after the first failed, not {sessions}")
+
+            label = "with a sweeper" if sweeper else "without a sweeper"
+            if manager.resident_count() != sessions or manager.resident_bytes != resident_bytes:
+                failures.append(f"{label}: {manager.resident_count()} of {sessions} sessions resident "
+                                f"({manager.resident_bytes} of {resident_bytes} bytes) after failed spills")
+            for session_id in session_ids:
+                digest = use_within(manager, session_id, 5.0)
+                if digest != digests[session_id]:
+                    failures.append(f"{label}: {session_id} " + ("lost or blocked" if digest is None else "changed")
+                                    + " after a failed spill")
+
+            manager.store.put = working_put
+            now[0] += 2.0
+            if not sweeper:
+                manager.hibernate_idle()
+            deadline = time.monotonic() + 5.0
+            while manager.resident_count() and time.monotonic() < deadline:
+                time.sleep(0.01)
+            if manager.resident_count():
+                failures.append(f"{label}: {manager.resident_count()} sessions not hibernated once writes succeed")
+            for session_id in session_ids:
+                if use_within(manager, session_id, 5.0) != digests[session_id]:
+                    failures.append(f"{label}: {session_id} does not rehydrate unchanged after failed spills")
+            manager.shutdown()
+    logger.disabled = False
+    return failures
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Benchmark idle-session hibernation.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--sessions", type=int, default=100_000)
+    parser.add_argument("--active", type=int, default=1000)
+    parser.add_argument("--budget-mb", type=int, default=DEFAULT_MEMORY_BUDGET // 2 ** 20)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    benchmark(args.game_data, args.sessions, args.active, memory_budget=args.budget_mb * 2 ** 20, seed=args.seed)
+    spill_failures = check_spill_failures(args.game_data, seed=args.seed)
+    print(f"Sessions after failed spills: {len(spill_failures)} failures")
+    for failure in spill_failures[:10]:
+        print("   ", failure)
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
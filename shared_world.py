@@ -0,0 +1,367 @@
+"""CSC111 Project 1: Text Adventure Game - Shared Multi-Player World
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module lets several players play in the same world at once: an item taken by one
+player disappears for the others, enemies are fought cooperatively (every player's hits count
+against the same health), and the T-Card puzzle spawns the USB Stick once, for everyone.
+
+Each player keeps their own Player and EventList, and their own AdventureGame view of the
+world, which shares the world's locations, items and enemies but has its own current location,
+steps and render cache. A view is a shallow copy of the world's game, so it also shares the
+initial world (read by saves and state_codec.py) and the cache of opened hint tables. The
+initial world must stay read-only, so no view may apply changes to the world's game data (see
+AdventureGame.apply_world_changes). The hint table cache only ever gains entries, each a read-only
+table; two players asking for their first hint at once may open the same table twice, which is
+harmless.
+
+Every change to a location (taking or dropping an item, defeating an enemy, spawning the
+puzzle reward) happens under that location's lock; an action touching two locations takes
+both locks in order of location ID, so it cannot deadlock. The locks keep the world
+consistent, but do not make it faster: Python's global interpreter lock lets only one player
+thread run at a time, so players at different locations still take turns, and per-location
+locks only pay off on a free-threaded build of Python.
+
+Running this module stress tests the world: many player threads take, drop, move and attack
+at random, after which no item may be duplicated or lost, no enemy may be defeated twice, and
+every location and inventory must be consistent. Throughput is measured as the number of
+players grows, against the same test with one lock for the whole world (with the global
+interpreter lock, expect no difference beyond noise).
+
+Usage:
+    python shared_world.py [--actions N] [--max-players N] [--seed N]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import contextlib
+import copy
+import os
+import random
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from time import perf_counter
+from typing import Iterator, Optional
+
+from adventure import AdventureGame, _handle_combat_defeat, update_game_log
+from event_logger import EventList
+from game_entities import Inventory, Player
+from puzzles import PUZZLE_ITEM, PUZZLE_LOCATION_ID, PUZZLE_REWARD, PUZZLE_REWARD_LOCATION_ID
+from rendering import RenderCache
+
+
+@dataclass
+class PlayerSession:
+    """One player in a shared world.
+
+    Instance Attributes:
+        - name: The player's name.
+        - game: The player's view of the world: shared locations, items and enemies, with the
+          player's own current location, steps and render cache.
+        - player: The player's character.
+        - game_log: The player's own event log.
+        - combat_turn: The number of enemy turns so far in the player's current fight.
+    """
+    name: str
+    game: AdventureGame
+    player: Player
+    game_log: EventList
+    combat_turn: int = 1
+
+
+class SharedWorld:
+    """A world shared by several players, with one lock per location.
+
+    Instance Attributes:
+        - players: Every player that has joined the world.
+        - defeats: How many times each enemy has been defeated.
+    """
+    players: list[PlayerSession]
+    defeats: Counter
+
+    # Private Instance Attributes:
+    #   - _world: the game holding the shared locations, items and enemies.
+    #   - _locks: the lock guarding each location, its items and the enemies at it.
+    #   - _players_lock: guards players.
+    #   - _reward_spawned: whether the puzzle reward has been spawned (guarded by the reward location's lock).
+    _world: AdventureGame
+    _locks: dict[int, threading.Lock]
+    _players_lock: threading.Lock
+    _reward_spawned: bool
+
+    def __init__(self, game_data_file: str, single_lock: bool = False) -> None:
+        """Load a new shared world from game_data_file.
+
+        If single_lock, every location shares one lock instead (for comparison).
+        """
+        self.players = []
+        self.defeats = Counter()
+        self._world = AdventureGame(game_data_file, 1)
+        world_lock = threading.Lock()
+        self._locks = {loc_id: world_lock if single_lock else threading.Lock()
+                       for loc_id in self._world.get_location_ids()}
+        self._players_lock = threading.Lock()
+        self._reward_spawned = PUZZLE_REWARD in self.item_census()
+
+    def join(self, name: str, stats: tuple[int, int, int] = (5, 5, 0)) -> PlayerSession:
+        """Add a new player with the given (speed, attack, defense) at the start location and return them.
+
+        The player's view shares the world's initial world and hint table cache (see the module docstring).
+        """
+        game = copy.copy(self._world)
+        game.current_location_id = 1
+        game.steps = 0
+        game.ongoing = True
+        game.render_cache = RenderCache()
+        player = Player(Inventory([], 10, 0), speed=stats[0], attack=stats[1], defense=stats[2],
+                        skip_stats_selection=True)
+        session = PlayerSession(name, game, player, EventList())
+        with self._players_lock:
+            self.players.append(session)
+        return session
+
+    @contextlib.contextmanager
+    def _locked(self, *loc_ids: int) -> Iterator[None]:
+        """Hold the locks of the given locations, taken in order of location ID, during the with block."""
+        locks = []
+        for loc_id in sorted(set(loc_ids)):
+            if self._locks[loc_id] not in locks:
+                locks.append(self._locks[loc_id])
+        for lock in locks:
+            lock.acquire()
+        try:
+            yield
+        finally:
+            for lock in reversed(locks):
+                lock.release()
+
+    def commands(self, session: PlayerSession) -> list[str]:
+        """Return the commands available at the player's location."""
+        location = session.game.get_location()
+        with self._locked(location.id_num):
+            return list(location.available_commands)
+
+    def go(self, session: PlayerSession, command: str) -> bool:
+        """Move the player with the given "go" command, returning whether it was a valid exit.
+
+        Moving changes only the player's own state, so it takes no lock.
+        """
+        location = session.game.get_location()
+        if not command.startswith("go") or command not in location.available_commands:
+            return False
+        update_game_log(session.game_log, location, command)
+        session.game.current_location_id = location.available_commands[command]
+        session.game.increment_steps(session.player)
+        session.game.check_steps()
+        session.combat_turn = 1
+        return True
+
+    def take(self, session: PlayerSession, item_name: str) -> bool:
+        """Take the named item at the player's location, returning whether the player got it.
+
+        Fails if another player took it first, if an enemy still guards the location, or if it is too heavy.
+        """
+        location = session.game.get_location()
+        item = session.game.get_item(item_name)
+        with self._locked(location.id_num):
+            if item is None or item_name not in location.items or location.enemies:
+                return False
+            session.player.inventory.take_item(item, location)
+            return item in session.player.inventory.items
+
+    def drop(self, session: PlayerSession, item_name: str) -> bool:
+        """Drop the named item from the player's inventory at their location, returning whether they had it.
+
+        Dropping the puzzle item at the puzzle location spawns the puzzle reward, once per world.
+        """
+        location = session.game.get_location()
+        item = next((item for item in session.player.inventory.items if item.name == item_name), None)
+        if item is None:
+            return False
+        puzzle = location.id_num == PUZZLE_LOCATION_ID and item_name == PUZZLE_ITEM
+        with self._locked(location.id_num, *([PUZZLE_REWARD_LOCATION_ID] if puzzle else [])):
+            session.player.inventory.drop_item(item, location)
+            if puzzle and not self._reward_spawned:
+                reward_location = self._world.get_location(PUZZLE_REWARD_LOCATION_ID)
+                reward_location.items.append(PUZZLE_REWARD)
+                reward_location.available_commands[f"take {PUZZLE_REWARD}"] = PUZZLE_REWARD_LOCATION_ID
+                reward_location.version += 1
+                self._reward_spawned = True
+        return True
+
+    def attack(self, session: PlayerSession) -> Optional[bool]:
+        """Attack the enemy at the player's location and, if it survives, take its counterattack.
+
+        Return None if there is no enemy here (e.g. another player just defeated it), otherwise
+        whether this attack defeated it.
+        """
+        location = session.game.get_location()
+        player = session.player
+        with self._locked(location.id_num):
+            if not location.enemies:
+                return None
+            enemy = session.game.get_enemy(location.enemies[-1])
+            if player.attack > 0 and not enemy.take_damage(player.attack):
+                _handle_combat_defeat(session.game, enemy)
+                self.defeats[enemy.name] += 1
+                return True
+            damage = max(enemy.deal_damage(session.combat_turn) - player.defense, 1)
+        player.current_health = max(player.current_health - damage, 0)
+        if player.current_health <= 0:
+            session.game.ongoing = False
+        session.combat_turn += 1
+        session.game.increment_steps(player)
+        session.game.check_steps()
+        return False
+
+    def item_census(self) -> Counter:
+        """Return how many copies of each item exist in the world: at locations, held by enemies at
+        locations, and in every player's inventory. Every location is locked while counting.
+        """
+        census = Counter()
+        with self._locked(*self._locks):
+            for loc_id in self._world.get_location_ids():
+                location = self._world.get_location(loc_id)
+                census.update(location.items)
+                for name in location.enemies:
+                    census.update(self._world.get_enemy(name).items)
+            with self._players_lock:
+                for session in self.players:
+                    census.update(item.name for item in session.player.inventory.items)
+        return census
+
+    def check_invariants(self, initial_items: set[str]) -> list[str]:
+        """Return every way in which the world is inconsistent, given the items that existed at the start."""
+        failures = []
+        census = self.item_census()
+        expected = initial_items | ({PUZZLE_REWARD} if self._reward_spawned else set())
+        failures.extend(f"{name} exists {count} times" for name, count in census.items() if count > 1)
+        failures.extend(f"{name} was lost" for name in expected - set(census))
+        failures.extend(f"{name} was defeated {count} times" for name, count in self.defeats.items() if count > 1)
+        for loc_id in self._world.get_location_ids():
+            location = self._world.get_location(loc_id)
+            takes = {command[len("take "):] for command in location.available_commands if command.startswith("take ")}
+            if not set(location.items) <= takes:
+                failures.append(f"location {loc_id} has no take command for {set(location.items) - takes}")
+            failures.extend(f"{name} is still at {loc_id} after its defeat"
+                            for name in location.enemies if self.defeats[name])
+        for session in self.players:
+            inventory = session.player.inventory
+            if abs(inventory.current_weight - sum(item.weight for item in inventory.items)) > 1e-9:
+                failures.append(f"{session.name}'s inventory weight is wrong")
+            if inventory.current_weight > inventory.weight_limit:
+                failures.append(f"{session.name}'s inventory is over its weight limit")
+        return failures
+
+
+@dataclass
+class StressReport:
+    """The result of one stress test.
+
+    Instance Attributes:
+        - players: The number of player threads.
+        - single_lock: Whether the world used one lock for every location.
+        - actions: The total number of actions performed.
+        - seconds: The elapsed time.
+        - failures: Every invariant violated at the end.
+    """
+    players: int
+    single_lock: bool
+    actions: int = 0
+    seconds: float = 0.0
+    failures: list[str] = field(default_factory=list)
+
+    def actions_per_second(self) -> float:
+        """Return the throughput of the test."""
+        return self.actions / self.seconds if self.seconds else 0.0
+
+
+def _play(world: SharedWorld, session: PlayerSession, actions: int, rng: random.Random,
+          start: threading.Barrier) -> None:
+    """Perform the given number of random actions as session, fighting whenever an enemy is present."""
+    start.wait()
+    for _ in range(actions):
+        if world.attack(session) is not None:
+            if not session.game.ongoing:
+                # Revive the player to keep up the contention; the world's invariants do not depend on them
+                session.player.current_health = session.player.max_health
+                session.game.ongoing = True
+            continue
+        choices = [command for command in world.commands(session) if command.startswith(("go", "take "))]
+        choices += [f"drop {item.name}" for item in session.player.inventory.items]
+        choice = rng.choice(choices)
+        if choice.startswith("go"):
+            world.go(session, choice)
+        elif choice.startswith("take "):
+            world.take(session, choice[len("take "):])
+        else:
+            world.drop(session, choice[len("drop "):])
+        session.game.steps = 0  # keep everyone playing past the step limit
+
+
+def stress_test(game_data_file: str, players: int, actions: int = 5000, single_lock: bool = False,
+                seed: int = 0) -> StressReport:
+    """Run players threads performing the given number of random actions each in one shared world,
+    and check the world's invariants at the end.
+    """
+    world = SharedWorld(game_data_file, single_lock)
+    initial_items = set(world.item_census())
+    sessions = [world.join(f"player {i}", (5, 3, 2)) for i in range(players)]
+    start = threading.Barrier(players + 1)
+    threads = [threading.Thread(target=_play, args=(world, session, actions, random.Random(seed * 1000 + i),
+                                                    start))
+               for i, session in enumerate(sessions)]
+    report = StressReport(players, single_lock, players * actions)
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        for thread in threads:
+            thread.start()
+        start.wait()
+        began = perf_counter()
+        for thread in threads:
+            thread.join()
+        report.seconds = perf_counter() - began
+    report.failures = world.check_invariants(initial_items)
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Stress test the shared multi-player world.")
+    parser.add_argument("--game-data", default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                            "game_data.json"))
+    parser.add_argument("--actions", type=int, default=5000, help="actions per player")
+    parser.add_argument("--max-players", type=int, default=32)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    print(f"{'players':>8}{'per-location locks':>22}{'one world lock':>18}  invariants")
+    count = 1
+    while count <= args.max_players:
+        fine = stress_test(args.game_data, count, args.actions, False, args.seed)
+        coarse = stress_test(args.game_data, count, args.actions, True, args.seed)
+        failures = fine.failures + coarse.failures
+        print(f"{count:>8}{fine.actions_per_second():>16.0f} act/s{coarse.actions_per_second():>12.0f} act/s  "
+              f"{'OK' if not failures else '; '.join(failures[:3])}")
+        count *= 2
+    print("Only one player thread runs at a time under the global interpreter lock, so per-location locks are "
+          "not expected to be faster here.")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
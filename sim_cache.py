@@ -0,0 +1,303 @@
+"""CSC111 Project 1: Text Adventure Game - Simulation Result Cache
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains an on-disk, content-addressed cache of simulation results.
+A result is stored under the hash of everything that determines it: the game data file,
+the engine's source code, the command list and the player's starting stats. Replaying a
+walkthrough whose inputs have not changed reads the stored result instead of running the
+simulation. The cache is bounded in size, evicting the least recently used entries, and
+can verify itself by re-running a random sample of its entries.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import ast
+import contextlib
+import hashlib
+import io
+import json
+import os
+import random
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+from autosave import write_bytes_atomically
+
+# The module running simulations: its source code, and that of every module it imports (see
+# engine_modules), determines the outcome of a simulation.
+ENGINE_ROOT = "simulation.py"
+
+# Default bound on the total size of the cache directory.
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# Player (speed, attack, defense) used by AdventureGameSimulation by default.
+DEFAULT_STATS = (5, 5, 0)
+
+_engine_version = None
+
+
+def _imported_modules(source: str) -> set[str]:
+    """Return the names of the top-level modules imported anywhere in source (including inside
+    functions), except in its main block.
+
+    >>> sorted(_imported_modules("import os\\nfrom a.b import c\\ndef f():\\n    import d\\n"
+    ...                          "if __name__ == '__main__':\\n    import e"))
+    ['a', 'd', 'os']
+    """
+    tree = ast.parse(source)
+    main_blocks = [node for node in tree.body if isinstance(node, ast.If) and "__main__" in ast.unparse(node.test)]
+    skipped = {id(node) for block in main_blocks for node in ast.walk(block)}
+    names = set()
+    for node in ast.walk(tree):
+        if id(node) in skipped:
+            continue
+        if isinstance(node, ast.Import):
+            names.update(alias.name.split('.')[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.add(node.module.split('.')[0])
+    return names
+
+
+def engine_modules() -> list[str]:
+    """Return the filenames of the engine's modules: ENGINE_ROOT and every module of this directory
+    it imports, directly or through other such modules, in sorted order.
+
+    The list is derived from the source code, so a module that the simulation starts using is
+    part of the engine without anyone having to remember to add it.
+    """
+    source_dir = os.path.dirname(os.path.abspath(__file__))
+    found, to_visit = set(), [ENGINE_ROOT]
+    while to_visit:
+        module = to_visit.pop()
+        if module in found:
+            continue
+        found.add(module)
+        with open(os.path.join(source_dir, module), encoding='utf-8') as f:
+            imported = _imported_modules(f.read())
+        to_visit.extend(f"{name}.py" for name in imported if os.path.isfile(os.path.join(source_dir, f"{name}.py")))
+    return sorted(found)
+
+
+def engine_version() -> str:
+    """Return a hash of the engine's source code, computed once per process.
+
+    Any change to the engine modules (see engine_modules) changes this hash, so results cached
+    by an older engine are never returned.
+    """
+    global _engine_version
+    if _engine_version is None:
+        digest = hashlib.sha256()
+        source_dir = os.path.dirname(os.path.abspath(__file__))
+        for module in engine_modules():
+            with open(os.path.join(source_dir, module), 'rb') as f:
+                digest.update(module.encode('utf-8') + b'\0' + f.read() + b'\0')
+        _engine_version = digest.hexdigest()
+    return _engine_version
+
+
+def file_hash(filename: str) -> str:
+    """Return the SHA-256 hash of the contents of the given file."""
+    with open(filename, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+
+def cache_key(world_hash: str, commands: list[str], stats: tuple[int, int, int]) -> str:
+    """Return the cache key for simulating commands with the given stats in the world with world_hash.
+
+    >>> cache_key("w", ["go east"], (5, 5, 0)) == cache_key("w", ["go east"], (5, 5, 0))
+    True
+    >>> cache_key("w", ["go east"], (5, 5, 0)) == cache_key("w", ["go east"], (5, 0, 5))
+    False
+    """
+    payload = json.dumps([world_hash, engine_version(), commands, list(stats)], separators=(',', ':'))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+@dataclass
+class SimulationResult:
+    """The result of simulating a list of commands.
+
+    Instance Attributes:
+        - id_log: The location IDs of every event, in order.
+        - outcome: How the game ended (see AdventureGameSimulation.get_outcome).
+        - score: The player's final score.
+        - steps: The number of steps taken.
+    """
+    id_log: list[int]
+    outcome: str
+    score: int
+    steps: int
+
+
+def simulate(game_data_file: str, commands: list[str], stats: tuple[int, int, int] = DEFAULT_STATS,
+             quiet: bool = True) -> SimulationResult:
+    """Run the simulation for the given commands and stats and return its result, without using any cache.
+
+    If quiet is True, the simulation's console output is discarded.
+    """
+    from simulation import AdventureGameSimulation
+
+    speed, attack, defense = stats
+    output = io.StringIO() if quiet else None
+    with contextlib.redirect_stdout(output) if quiet else contextlib.nullcontext():
+        sim = AdventureGameSimulation(game_data_file, 1, commands, speed=speed, attack=attack, defense=defense)
+    return SimulationResult(sim.get_id_log(), sim.get_outcome(), sim.get_score(), sim.get_steps())
+
+
+class SimulationCache:
+    """A size-bounded directory of cached simulation results, with least-recently-used eviction.
+
+    Each entry is one JSON file named after its cache key, holding the result and the inputs
+    that produced it (so that verify() can re-run it). An entry's modification time records
+    when it was last used.
+
+    Instance Attributes:
+        - directory: The directory holding the cache entries.
+        - max_bytes: The maximum total size of the entries before the least recently used are evicted.
+        - hits: The number of lookups answered from the cache.
+        - misses: The number of lookups that were not in the cache.
+
+    Representation Invariants:
+        - self.max_bytes > 0
+    """
+    directory: str
+    max_bytes: int
+    hits: int
+    misses: int
+
+    def __init__(self, directory: str, max_bytes: int = DEFAULT_MAX_BYTES) -> None:
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        """Return the path of the entry file for key."""
+        return os.path.join(self.directory, key + '.json')
+
+    def get(self, key: str) -> Optional[SimulationResult]:
+        """Return the result cached under key, or None if there is none (or it cannot be read)."""
+        path = self._path(key)
+        try:
+            with open(path, 'r') as f:
+                entry = json.load(f)
+            os.utime(path)  # mark as recently used
+        except (OSError, json.JSONDecodeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return SimulationResult(**entry['result'])
+
+    def put(self, key: str, result: SimulationResult, world_hash: str, commands: list[str],
+            stats: tuple[int, int, int]) -> None:
+        """Store result under key, together with the inputs that produced it, then enforce the size bound."""
+        entry = {'world': world_hash, 'engine': engine_version(), 'commands': commands,
+                 'stats': list(stats), 'result': asdict(result)}
+        write_bytes_atomically(self._path(key), json.dumps(entry, separators=(',', ':')).encode('utf-8'))
+        self.evict()
+
+    def evict(self) -> int:
+        """Delete least recently used entries until the cache fits in max_bytes, returning how many were deleted."""
+        entries = []
+        total = 0
+        with os.scandir(self.directory) as it:
+            for dir_entry in it:
+                if dir_entry.name.endswith('.json'):
+                    stat = dir_entry.stat()
+                    entries.append((stat.st_mtime, stat.st_size, dir_entry.path))
+                    total += stat.st_size
+
+        removed = 0
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_bytes:
+                break
+            with contextlib.suppress(FileNotFoundError):
+                os.remove(path)
+            total -= size
+            removed += 1
+        return removed
+
+    def keys(self) -> list[str]:
+        """Return the keys of every entry in the cache."""
+        return [name[:-len('.json')] for name in os.listdir(self.directory) if name.endswith('.json')]
+
+    def verify(self, game_data_file: str, sample_size: int = 10, seed: Optional[int] = None) -> list[str]:
+        """Re-run a random sample of entries made for game_data_file and the current engine, and return
+        the keys of those whose stored result differs from a fresh simulation.
+
+        Stale entries are deleted. Entries for other worlds or engines are never returned by get
+        for the current inputs, so they are not sampled.
+        """
+        world_hash = file_hash(game_data_file)
+        candidates = []
+        for key in self.keys():
+            try:
+                with open(self._path(key), 'r') as f:
+                    entry = json.load(f)
+            except (OSError, json.JSONDecodeError):
+                continue
+            if entry['world'] == world_hash and entry['engine'] == engine_version():
+                candidates.append((key, entry))
+
+        rng = random.Random(seed)
+        stale = []
+        for key, entry in rng.sample(candidates, min(sample_size, len(candidates))):
+            fresh = simulate(game_data_file, entry['commands'], tuple(entry['stats']))
+            if asdict(fresh) != entry['result']:
+                stale.append(key)
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self._path(key))
+        return stale
+
+
+def run_cached(cache: SimulationCache, game_data_file: str, commands: list[str],
+               stats: tuple[int, int, int] = DEFAULT_STATS) -> SimulationResult:
+    """Return the result of simulating commands with stats, from cache if possible.
+
+    On a cache hit the simulation is not run at all.
+    """
+    world_hash = file_hash(game_data_file)
+    key = cache_key(world_hash, commands, stats)
+    result = cache.get(key)
+    if result is None:
+        result = simulate(game_data_file, commands, stats)
+        cache.put(key, result, world_hash, commands, stats)
+    return result
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Manage the simulation result cache.")
+    parser.add_argument("--verify", type=int, metavar="N", default=0,
+                        help="re-run N random entries and delete any that are stale")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    data_file = os.path.join(script_dir, "game_data.json")
+    sim_cache = SimulationCache(os.path.join(script_dir, ".sim_cache"))
+    print(f"{len(sim_cache.keys())} cached results")
+    if args.verify:
+        stale_keys = sim_cache.verify(data_file, args.verify)
+        print(f"{len(stale_keys)} stale entries removed: {stale_keys}")
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,434 @@
+"""CSC111 Project 1: Text Adventure Game - Compact Game State Codec
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module encodes the full mutable state of a game as a compact byte string, so that
+search, forks, checkpoints and deduplication can treat a game state as a cheap value: it can
+be stored, compared, hashed (see state_hash) and decoded back into the live game objects.
+
+The state covers whether the game is ongoing, the current location, the steps taken, the
+player's stats, health, points and inventory, the items, enemies and visited flag of every
+location, and the health of every enemy. Locations, items and enemies are interned as indices
+into sorted tables built once per world. A state is a sequence of varints:
+    - flags (bit 0: ongoing), the current location's index, steps, the player's speed, attack,
+      defense, max health and points, and current health (zigzag-encoded, as it can be negative),
+    - the number of inventory items, then the index of each, in inventory order,
+    - the visited flags of all locations, as a bitset of one bit per location,
+    - the number of locations whose items or enemies differ from the game data, then for each
+      one the gap since the previous such location, and its item list and enemy list,
+    - the number of enemies whose health differs from their max health, then for each one the
+      gap since the previous such enemy, and its health (zigzag-encoded).
+A location's item (or enemy) list is stored as a bitset of the entries of its list in the game
+data that are still there, followed by the indices of the entries added since, in order. A list
+whose order cannot be rebuilt that way is stored as a list of indices instead, so decoding
+always restores every list exactly. Only changed locations and enemies are stored, so a state
+is a few dozen bytes, and encoding and decoding take time linear in the size of the world.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import hashlib
+from typing import Callable, TYPE_CHECKING
+
+from game_entities import Inventory, Location, Player
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+# Flag bits of the first varint of a state.
+_ONGOING = 1
+
+# The header of a list stored as a list of indices instead of a bitset of its game data entries.
+_EXPLICIT_LIST = 1
+
+
+def _append_varint(out: bytearray, value: int) -> None:
+    """Append the non-negative integer value to out as a varint (7 bits per byte, low bits first)."""
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(state: bytes, pos: int) -> tuple[int, int]:
+    """Return the varint at pos in state, and the position after it.
+
+    >>> out = bytearray()
+    >>> _append_varint(out, 300)
+    >>> _read_varint(bytes(out), 0)
+    (300, 2)
+    """
+    value = shift = 0
+    while True:
+        byte = state[pos]
+        pos += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, pos
+        shift += 7
+
+
+def _zigzag(value: int) -> int:
+    """Return value mapped to a non-negative integer, small when value is close to 0.
+
+    >>> [_zigzag(value) for value in (0, -1, 1, -2)]
+    [0, 1, 2, 3]
+    """
+    return value * 2 if value >= 0 else -value * 2 - 1
+
+
+def _unzigzag(value: int) -> int:
+    """Return the integer that _zigzag mapped to value.
+
+    >>> [_unzigzag(_zigzag(value)) for value in (0, -1, 1, -7)]
+    [0, -1, 1, -7]
+    """
+    return value // 2 if value % 2 == 0 else -(value + 1) // 2
+
+
+def state_hash(state: bytes) -> int:
+    """Return a 64-bit hash of an encoded state, the same in every process (unlike hash()).
+
+    >>> state_hash(b"state") == state_hash(b"state") and 0 <= state_hash(b"state") < 2 ** 64
+    True
+    """
+    return int.from_bytes(hashlib.blake2b(state, digest_size=8).digest(), 'little')
+
+
+class StateCodec:
+    """Encodes the state of games in one world as compact byte strings, and decodes them back
+    into the live objects of any game in that world.
+
+    Instance Attributes:
+        - world_hash: The SHA-256 hash of the game data of the world.
+
+    Representation Invariants:
+        - len(self._location_ids) == len(self._baseline)
+    """
+    world_hash: str
+
+    # Private Instance Attributes:
+    #   - _location_ids: every location ID, sorted; a location's index is its position here
+    #   - _location_index: the index of every location ID
+    #   - _item_names: every item name, sorted; an item's index is its position here
+    #   - _item_index: the index of every item name
+    #   - _enemy_names: every enemy name, sorted; an enemy's index is its position here
+    #   - _enemy_index: the index of every enemy name
+    #   - _baseline: for each location index, its items and enemies in the game data, each with
+    #       the position of every entry
+    _location_ids: list[int]
+    _location_index: dict[int, int]
+    _item_names: list[str]
+    _item_index: dict[str, int]
+    _enemy_names: list[str]
+    _enemy_index: dict[str, int]
+    _baseline: list[tuple[list[str], dict[str, int], list[str], dict[str, int]]]
+
+    def __init__(self, game: AdventureGame) -> None:
+        """Build the codec for the world of game, using its game data as the baseline state."""
+        self.world_hash = game.world_hash
+        self._location_ids = sorted(game.get_location_ids())
+        self._location_index = {loc_id: i for i, loc_id in enumerate(self._location_ids)}
+        self._item_names = sorted(game.get_item_names())
+        self._item_index = {name: i for i, name in enumerate(self._item_names)}
+        self._enemy_names = sorted(game.get_enemy_names())
+        self._enemy_index = {name: i for i, name in enumerate(self._enemy_names)}
+        initial_world = game.get_initial_world()
+        self._baseline = []
+        for loc_id in self._location_ids:
+            items, enemies = initial_world[loc_id]
+            self._baseline.append((items, {name: j for j, name in enumerate(items)},
+                                   enemies, {name: j for j, name in enumerate(enemies)}))
+
+    def encode(self, game: AdventureGame, player: Player) -> bytes:
+        """Return the state of game and player as a compact byte string."""
+        out = bytearray()
+        _append_varint(out, _ONGOING if game.ongoing else 0)
+        _append_varint(out, self._location_index[game.current_location_id])
+        for value in (game.steps, player.speed, player.attack, player.defense, player.max_health, player.points,
+                      _zigzag(player.current_health), len(player.inventory.items)):
+            _append_varint(out, value)
+        for item in player.inventory.items:
+            _append_varint(out, self._item_index[item.name])
+
+        visited = bytearray((len(self._location_ids) + 7) // 8)
+        changed = []
+        for i, loc_id in enumerate(self._location_ids):
+            location = game.get_location(loc_id)
+            if location.visited:
+                visited[i >> 3] |= 1 << (i & 7)
+            items, _, enemies, _ = self._baseline[i]
+            if location.items != items or location.enemies != enemies:
+                changed.append((i, location))
+        out += visited
+
+        _append_varint(out, len(changed))
+        previous = -1
+        for i, location in changed:
+            items, item_positions, enemies, enemy_positions = self._baseline[i]
+            _append_varint(out, i - previous - 1)
+            self._encode_list(out, location.items, item_positions, self._item_index)
+            self._encode_list(out, location.enemies, enemy_positions, self._enemy_index)
+            previous = i
+
+        wounded = []
+        for k, name in enumerate(self._enemy_names):
+            enemy = game.get_enemy(name)
+            if enemy.current_health != enemy.max_health:
+                wounded.append((k, enemy.current_health))
+        _append_varint(out, len(wounded))
+        previous = -1
+        for k, health in wounded:
+            _append_varint(out, k - previous - 1)
+            _append_varint(out, _zigzag(health))
+            previous = k
+        return bytes(out)
+
+    @staticmethod
+    def _encode_list(out: bytearray, names: list[str], positions: dict[str, int], index: dict[str, int]) -> None:
+        """Append names to out, as a bitset of the entries of its game data list (whose entries
+        have the given positions) that are still there followed by the entries added since, or as
+        a list of indices if the order of names cannot be rebuilt from that.
+        """
+        kept = 0
+        added = []
+        last = -1
+        for name in names:
+            position = positions.get(name)
+            if position is None:
+                added.append(index[name])
+            elif added or position <= last:
+                break  # out of game data order
+            else:
+                kept |= 1 << position
+                last = position
+        else:
+            _append_varint(out, kept << 1)
+            _append_varint(out, len(added))
+            for value in added:
+                _append_varint(out, value)
+            return
+
+        _append_varint(out, _EXPLICIT_LIST)
+        _append_varint(out, len(names))
+        for name in names:
+            _append_varint(out, index[name])
+
+    @staticmethod
+    def _decode_list(state: bytes, pos: int, baseline: list[str], names: list[str]) -> tuple[list[str], int]:
+        """Return the list stored by _encode_list at pos in state, and the position after it.
+        baseline is the game data list it was stored against, and names the interned names.
+        """
+        header, pos = _read_varint(state, pos)
+        if header == _EXPLICIT_LIST:
+            result = []
+        else:
+            kept = header >> 1
+            result = [name for j, name in enumerate(baseline) if kept >> j & 1]
+        count, pos = _read_varint(state, pos)
+        for _ in range(count):
+            value, pos = _read_varint(state, pos)
+            result.append(names[value])
+        return result, pos
+
+    def decode(self, state: bytes, game: AdventureGame, player: Player) -> None:
+        """Restore the state encoded in state into game and player, which are in this codec's world.
+
+        Every part of the state is overwritten, whatever state game and player were in before.
+        Locations whose items or enemies change get new versions, so their rendered text is redrawn,
+        and the game's item index is dropped, to be rebuilt when next needed.
+        """
+        flags, pos = _read_varint(state, 0)
+        game.ongoing = bool(flags & _ONGOING)
+        location_index, pos = _read_varint(state, pos)
+        game.current_location_id = self._location_ids[location_index]
+        values = []
+        for _ in range(8):
+            value, pos = _read_varint(state, pos)
+            values.append(value)
+        game.steps, player.speed, player.attack, player.defense, player.max_health, player.points = values[:6]
+        player.current_health = _unzigzag(values[6])
+        inventory = []
+        for _ in range(values[7]):
+            value, pos = _read_varint(state, pos)
+            inventory.append(game.get_item(self._item_names[value]))
+        player.inventory.items = inventory
+        player.inventory.current_weight = sum(item.weight for item in inventory)
+
+        visited = state[pos:pos + (len(self._location_ids) + 7) // 8]
+        pos += len(visited)
+        changed = {}
+        count, pos = _read_varint(state, pos)
+        i = -1
+        for _ in range(count):
+            gap, pos = _read_varint(state, pos)
+            i += gap + 1
+            items, _, enemies, _ = self._baseline[i]
+            items, pos = self._decode_list(state, pos, items, self._item_names)
+            enemies, pos = self._decode_list(state, pos, enemies, self._enemy_names)
+            changed[i] = (items, enemies)
+
+        for i, loc_id in enumerate(self._location_ids):
+            location = game.get_location(loc_id)
+            location.visited = bool(visited[i >> 3] >> (i & 7) & 1)
+            items, _, enemies, _ = self._baseline[i]
+            items, enemies = changed.get(i, (items, enemies))
+            if location.items != items:
+                _set_items(location, list(items))
+            if location.enemies != enemies:
+                location.enemies = list(enemies)
+                location.version += 1
+
+        health = {}
+        count, pos = _read_varint(state, pos)
+        k = -1
+        for _ in range(count):
+            gap, pos = _read_varint(state, pos)
+            k += gap + 1
+            value, pos = _read_varint(state, pos)
+            health[k] = _unzigzag(value)
+        for k, name in enumerate(self._enemy_names):
+            enemy = game.get_enemy(name)
+            enemy.current_health = health.get(k, enemy.max_health)
+        game.item_index = None
+
+
+def _set_items(location: Location, items: list[str]) -> None:
+    """Make items the items of location, with a "take" command for each of them and no other."""
+    location.items = items
+    location.available_commands = {command: target for command, target in location.available_commands.items()
+                                   if not command.startswith("take ")}
+    for name in items:
+        location.available_commands[f"take {name}"] = location.id_num
+    location.version += 1
+
+
+def _observable(game: AdventureGame, player: Player) -> tuple:
+    """Return everything about the state of game and player that the codec must restore."""
+    locations = tuple((loc_id, tuple(location.items), tuple(location.enemies), location.visited,
+                       tuple(sorted(location.available_commands.items())))
+                      for loc_id in game.get_location_ids() for location in [game.get_location(loc_id)])
+    enemies = tuple((name, game.get_enemy(name).current_health) for name in game.get_enemy_names())
+    return (game.ongoing, game.current_location_id, game.steps, player.speed, player.attack, player.defense,
+            player.max_health, player.current_health, player.points,
+            tuple(item.name for item in player.inventory.items), round(player.inventory.current_weight, 9),
+            locations, enemies)
+
+
+def check_round_trips(game_data_file: str, runs: int = 200, inputs_per_run: int = 150, seed: int = 0) -> list[str]:
+    """Play the given number of games with random stats and random commands (see
+    fuzzer.check_random_games), and return every case in which the codec does not restore a
+    state exactly.
+
+    Whenever a game asks for input, a visited flag may be flipped, then its state is encoded
+    and decoded into a scratch game (still in whatever state the previous decode left it),
+    which must then encode to the same bytes and match the game on everything the codec covers.
+    Now and then, between turns, the game is also rewound to a state encoded earlier in the run,
+    which must decode back to exactly that state.
+    """
+    # Imported here because adventure imports item_index, which imports this module, and fuzzer imports adventure
+    from adventure import AdventureGame
+    from fuzzer import TURN_PROMPT, RandomRun, check_random_games
+
+    codec = StateCodec(AdventureGame(game_data_file, 1))
+    scratch_game = AdventureGame(game_data_file, 1)
+    scratch_player = Player(Inventory([], 10, 0.0), skip_stats_selection=True)
+    location_ids = scratch_game.get_location_ids()
+
+    def start_run(run: RandomRun) -> Callable[[str], list[str]]:
+        """Return the round trip check of run."""
+        game, player, rng = run.game, run.player, run.rng
+        checkpoints = []
+
+        def check(prompt: str) -> list[str]:
+            """Check the round trip of the current state, and now and then rewind to a checkpoint between turns."""
+            failures = []
+            if rng.random() < 0.1:
+                # Only loading a save sets visited flags, so they are flipped at random to cover them
+                location = game.get_location(rng.choice(location_ids))
+                location.visited = not location.visited
+            state = codec.encode(game, player)
+            codec.decode(state, scratch_game, scratch_player)
+            if codec.encode(scratch_game, scratch_player) != state:
+                failures.append("a decoded state encodes differently")
+            elif _observable(scratch_game, scratch_player) != _observable(game, player):
+                failures.append("a decoded state differs from the original")
+            checkpoints.append(state)
+            if prompt == TURN_PROMPT and rng.random() < 0.05:
+                rewind_to = rng.choice(checkpoints)
+                codec.decode(rewind_to, game, player)
+                if codec.encode(game, player) != rewind_to:
+                    failures.append("rewinding to a checkpoint does not restore it")
+                run.restart_turn()
+            return failures
+
+        return check
+
+    return check_random_games(game_data_file, start_run, runs, inputs_per_run, seed)
+
+
+def benchmark(game_data_file: str = "game_data.json", world_sizes: tuple[int, ...] = (1000, 10_000, 100_000),
+              repeats: int = 2000) -> None:
+    """Print the size of an encoded state and the time to encode and decode it, for a game in the
+    shipped world and in generated worlds of the given numbers of locations (see
+    world_validator.generate_world), each with a few locations changed from their game data.
+    """
+    import contextlib
+    import io
+    from time import perf_counter
+    from adventure import AdventureGame
+    from game_entities import Inventory
+    from world_validator import generate_world
+
+    worlds = [("shipped world", AdventureGame(game_data_file, 1))]
+    worlds += [(f"{size} locations", AdventureGame(game_data_file, 1, world_data=generate_world(size)))
+               for size in world_sizes]
+    for label, game in worlds:
+        codec = StateCodec(game)
+        player = Player(Inventory([], 10, 0.0), 5, 5, 0, skip_stats_selection=True)
+        with contextlib.redirect_stdout(io.StringIO()):
+            for loc_id in sorted(game.get_location_ids())[1:200:10]:
+                location = game.get_location(loc_id)
+                location.visited = True
+                if location.items:
+                    player.inventory.take_item(game.get_item(location.items[0]), location)
+        game.steps = 12
+        times = max(repeats * 12 // len(game.get_location_ids()), 3)
+
+        start = perf_counter()
+        for _ in range(times):
+            state = codec.encode(game, player)
+        encode_seconds = (perf_counter() - start) / times
+        start = perf_counter()
+        for _ in range(times):
+            codec.decode(state, game, player)
+        decode_seconds = (perf_counter() - start) / times
+        print(f"{label:>18}: {len(state):>7} bytes  encode {encode_seconds * 1e6:10.1f} us  "
+              f"decode {decode_seconds * 1e6:10.1f} us  hash {state_hash(state):016x}")
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    benchmark()
+    round_trip_failures = check_round_trips("game_data.json")
+    print(f"Round trips over random command streams: {len(round_trip_failures)} failures")
+    for failure in round_trip_failures[:10]:
+        print("   ", failure)
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
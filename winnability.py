@@ -0,0 +1,276 @@
+"""CSC111 Project 1: Text Adventure Game - Unwinnable State Detection
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module decides, after every turn, whether the game can still be won, so that
+sessions that are already lost can end at once instead of running on until the step limit
+or the player's death.
+
+It computes optimistic lower bounds on what winning still costs:
+    - steps: for each required item not yet at OISE, the shortest route from the player to
+      the item (by way of the T-Card puzzle, for the USB stick before it is spawned) and on
+      to OISE, using distances between locations precomputed once per world; the longest of
+      these routes, plus the enemy turns of every fight that must be won on the way, each
+      costing the steps of one move at the player's speed,
+    - damage: the damage of those fights, against the player's health plus every healing item
+      left in the game.
+The items are found through the game's item index (see item_index.py), rather than by
+scanning the world. The game is lost when a required item no longer exists, a necessary enemy
+cannot be defeated, the step bound does not fit in the steps left, or the damage bound reaches
+the player's health plus healing. Since the bounds are optimistic, a game that can still be
+won is never declared lost. The check takes about 25 microseconds per turn.
+
+A fight need not run to its end: the player can flee and come back, and the enemy's
+attack_pattern then starts over from its first attack. Whatever the player does, every enemy
+turn of a fight follows one of the player's blows that does not defeat the enemy, so the
+number of enemy turns is that of a fight to the end (see Enemy.fight_outcome); but a player
+who flees before the big attacks of a pattern only ever takes its first ones. The damage bound
+therefore charges each enemy turn the lowest average damage per turn of any run of attacks
+from the start of the pattern, which no sequence of restarted fights can beat.
+
+The bounds assume the world only changes through the player. A game following a world clock
+(see world_clock.py) moves, respawns and triggers things on its own, e.g. a patrolling enemy
+may leave the route it blocks, so such a game is never declared lost.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional, TYPE_CHECKING
+
+from game_entities import Enemy, Player
+from item_index import ENEMY, INVENTORY, LOCATION
+from puzzles import BREAD, GOOSE, PUZZLE_ITEM, PUZZLE_LOCATION_ID, PUZZLE_REWARD, PUZZLE_REWARD_LOCATION_ID
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+# Large enough that a fight's damage is never capped by the player's health.
+_UNLIMITED_HEALTH = 10 ** 9
+
+# Where an item is: (location ID or None if carried, the enemies that must be defeated to get it).
+_Position = tuple[Optional[int], list[str]]
+
+# For each game, the location each enemy holding an item was last found at.
+_enemy_locations = weakref.WeakKeyDictionary()
+
+
+def shortest_distances(exits: dict[int, list[int]]) -> dict[int, dict[int, int]]:
+    """Return the number of moves between every pair of locations, given each location's exits.
+
+    Unreachable pairs are missing from the result.
+
+    >>> distances = shortest_distances({1: [2], 2: [1, 3], 3: [2], 4: [1]})
+    >>> distances[1][3], distances[4][3], 4 in distances[1]
+    (2, 3, False)
+    """
+    distances = {}
+    for source in exits:
+        from_source = {source: 0}
+        queue = deque([source])
+        while queue:
+            loc_id = queue.popleft()
+            for dest in exits.get(loc_id, []):
+                if dest not in from_source:
+                    from_source[dest] = from_source[loc_id] + 1
+                    queue.append(dest)
+        distances[source] = from_source
+    return distances
+
+
+@dataclass
+class WinBound:
+    """Lower bounds on what it still costs to win a game.
+
+    Instance Attributes:
+        - steps: The fewest steps needed to win (infinite if the game cannot be won).
+        - damage: The least damage the player must take on the way.
+        - healing: The most health the player can still restore with healing items.
+        - reason: Why the game cannot be won, or None if nothing rules it out.
+    """
+    steps: float = 0
+    damage: int = 0
+    healing: int = 0
+    reason: Optional[str] = None
+
+
+@dataclass
+class _Fights:
+    """The fights that must be won, and their cost.
+
+    Instance Attributes:
+        - enemies: The (location ID, enemy name) of every fight.
+        - enemy_turns: The total number of enemy turns.
+        - damage: The total damage taken.
+    """
+    enemies: set[tuple[int, str]] = field(default_factory=set)
+    enemy_turns: float = 0
+    damage: int = 0
+
+
+def _locate_items(game: AdventureGame, player: Player, names: list[str]) -> dict[str, _Position]:
+    """Return the position of each of the named items that is still in the game, as the game's
+    item index has it.
+    """
+    index = game.get_item_index(player)
+    positions = {}
+    for name in names:
+        holder = index.where(name)
+        if holder is None:
+            continue
+        kind, key = holder
+        if kind == INVENTORY:
+            positions[name] = (None, [])
+        elif kind == LOCATION:
+            # The player fights the last enemy on arrival, and can take what lies here once it is defeated
+            positions[name] = (key, game.get_location(key).enemies[-1:])
+        elif kind == ENEMY:
+            loc_id = _enemy_location(game, key)
+            enemies = game.get_location(loc_id).enemies
+            positions[name] = (loc_id, enemies[enemies.index(key):])
+    return positions
+
+
+def _enemy_location(game: AdventureGame, enemy_name: str) -> int:
+    """Return the ID of the location of the named enemy, which guards a location of game.
+
+    The location is remembered, so the world is only searched again once the enemy has moved.
+    """
+    known = _enemy_locations.setdefault(game, {})
+    loc_id = known.get(enemy_name)
+    if loc_id is None or enemy_name not in game.get_location(loc_id).enemies:
+        loc_id = next(loc_id for loc_id in game.get_location_ids() if enemy_name in game.get_location(loc_id).enemies)
+        known[enemy_name] = loc_id
+    return loc_id
+
+
+def fight_damage_bound(enemy: Enemy, enemy_turns: int, defense: int) -> int:
+    """Return the least damage the player can take over enemy_turns attacks of enemy, even by
+    fleeing and fighting it again, which starts its attack_pattern over (see the module docstring).
+
+    >>> barista = Enemy("Barista", 8, 8, 4, ["small", "big"], [])
+    >>> fight_damage_bound(barista, 3, defense=0)  # fleeing before every big attack: 2 + 2 + 2
+    6
+    >>> goose = Enemy("Giant Goose", 50, 50, 10, ["big", "small", "small"], [])
+    >>> fight_damage_bound(goose, 3, defense=0)  # a fight to the end is cheapest: 10 + 5 + 5
+    20
+    """
+    # The lowest average of the first r attacks, as a fraction damage / r, over one cycle of the pattern
+    damage, best_damage, best_turns = 0, None, 1
+    for turns in range(1, len(enemy.attack_pattern) + 1):
+        damage += max(enemy.deal_damage(turns) - defense, 1)
+        if best_damage is None or damage * best_turns < best_damage * turns:
+            best_damage, best_turns = damage, turns
+    return -(-enemy_turns * best_damage // best_turns)
+
+
+def _route(distances: dict[int, dict[int, int]], stops: list[int]) -> float:
+    """Return the fewest moves needed to visit stops in order (infinite if impossible)."""
+    moves = 0
+    for source, dest in zip(stops, stops[1:]):
+        if dest not in distances.get(source, {}):
+            return float('inf')
+        moves += distances[source][dest]
+    return moves
+
+
+def lower_bound(game: AdventureGame, player: Player, required: list[str], win_location_id: int) -> WinBound:
+    """Return lower bounds on the steps and damage needed to bring every required item to win_location_id."""
+    distances = game.get_distances()
+    index = game.get_item_index(player)
+    items = [game.get_item(name) for name in game.get_item_names() if index.where(name) is not None]
+    positions = _locate_items(game, player, required + [PUZZLE_ITEM])
+    bread = index.where(BREAD) is not None
+    attack = max([player.attack] + [item.strength for item in items if item.combat_use == 2 and item.name != BREAD])
+    healing = sum(item.strength for item in items if item.combat_use == 1)
+    at_win = set(game.get_location(win_location_id).items)
+    current = game.current_location_id
+
+    moves = 0
+    fights = _Fights()
+    for name in required:
+        if name in at_win:
+            continue
+        if name in positions:
+            loc_id, guards = positions[name]
+            stops = [current, win_location_id] if loc_id is None else [current, loc_id, win_location_id]
+        elif name == PUZZLE_REWARD and PUZZLE_ITEM in positions:
+            # The reward appears once the puzzle item is dropped at the puzzle location
+            loc_id, guards = positions[PUZZLE_ITEM]
+            stops = [current] + ([] if loc_id is None else [loc_id]) + \
+                [PUZZLE_LOCATION_ID, PUZZLE_REWARD_LOCATION_ID, win_location_id]
+            reward_guard = game.get_location(PUZZLE_REWARD_LOCATION_ID).enemies[-1:]
+            _add_fights(game, fights, PUZZLE_REWARD_LOCATION_ID, reward_guard, attack, player.defense, bread)
+        else:
+            return WinBound(float('inf'), 0, healing, f"the {name} can no longer be obtained")
+
+        if loc_id is not None:
+            _add_fights(game, fights, loc_id, guards, attack, player.defense, bread)
+        moves = max(moves, _route(distances, stops))
+
+    if fights.enemy_turns == float('inf'):
+        return WinBound(float('inf'), fights.damage, healing, "an enemy guarding a required item cannot be defeated")
+    if moves == float('inf'):
+        return WinBound(float('inf'), fights.damage, healing, "a required item cannot be reached")
+    return WinBound((6 - player.speed) * (moves + fights.enemy_turns), fights.damage, healing)
+
+
+def _add_fights(game: AdventureGame, fights: _Fights, loc_id: int, enemies: list[str], attack: int,
+                defense: int, bread: bool) -> None:
+    """Add the fights against the given enemies at loc_id to fights, unless they are already counted."""
+    for name in enemies:
+        if (loc_id, name) in fights.enemies:
+            continue
+        fights.enemies.add((loc_id, name))
+        if name == GOOSE and bread:
+            continue  # stale bread defeats the goose outright
+        enemy = game.get_enemy(name)
+        outcome = enemy.fight_outcome(attack, defense, _UNLIMITED_HEALTH)
+        if outcome is None:
+            fights.enemy_turns = float('inf')
+        else:
+            fights.enemy_turns += outcome.enemy_turns
+            fights.damage += fight_damage_bound(enemy, outcome.enemy_turns, defense)
+
+
+def unwinnable_reason(game: AdventureGame, player: Player, required: list[str], win_location_id: int) -> Optional[str]:
+    """Return why the game can no longer be won, or None if it still might be.
+
+    A game following a world clock still might be won, whatever its bounds (see the module docstring).
+    """
+    if game.world_clock is not None:
+        return None
+    bound = lower_bound(game, player, required, win_location_id)
+    if bound.reason is not None:
+        return bound.reason
+
+    steps_left = game.max_steps - game.steps
+    # Reaching the step limit on a move ends the game, so the last move must leave at least one step
+    if bound.steps > 0 and bound.steps >= steps_left:
+        return f"winning needs at least {bound.steps:g} more steps, but only {steps_left} are left"
+    if bound.damage > 0 and bound.damage >= player.current_health + bound.healing:
+        return f"the fights ahead deal at least {bound.damage} damage, more than your health and healing allow"
+    return None
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
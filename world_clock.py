@@ -0,0 +1,464 @@
+"""CSC111 Project 1: Text Adventure Game - World Clock
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module contains the world clock: the scheduler of the timed events that make the
+world change between the player's turns. Enemies can patrol a route of locations, moving one
+location along it every so many steps; defeated enemies can respawn after a delay; and timed
+triggers can run any action at a given step, once or periodically.
+
+The clock is driven by the game's step counter. Its events are kept in a priority queue ordered
+by the step at which they are due, so that advancing the clock only looks at the events that are
+due: a turn costs the same whether the world has ten patrolling enemies or a hundred thousand.
+A game follows a clock if its world_clock attribute is set; the game loop (and the simulation)
+then advance the clock at the start of every turn, before any combat. Defeating an enemy tells
+the clock, which stops the enemy's patrol and schedules its respawn.
+
+The clock's state is not part of saved games or encoded states (see state_codec.py), as its
+triggers are arbitrary functions: a game started from a save, or a hosted session rehydrated
+after hibernation (see sessions.py), has no clock until one is set again, and loading a save into
+a running game leaves its clock as it was. The winnability check (see winnability.py) never ends
+a game following a clock, since its bounds assume a world that only the player changes.
+
+Running this module plays random games in the shipped world with the campus clock (see
+campus_clock), checking that no enemy is duplicated or lost and that every event runs when it is
+due, and then measures the cost of a turn as the number of patrolling enemies grows.
+
+Usage:
+    python world_clock.py [--runs N] [--entities N ...]
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import heapq
+import random
+from collections import Counter
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+from fuzzer import RandomRun, check_random_games
+from item_index import ItemIndex
+
+if TYPE_CHECKING:
+    from adventure import AdventureGame
+
+# The kinds of timed event
+_MOVE = 0
+_RESPAWN = 1
+_TRIGGER = 2
+
+
+@dataclass
+class Patrol:
+    """An enemy walking a route of locations, moving to the next location of the route (and from
+    the last back to the first) every interval steps.
+
+    Instance Attributes:
+        - enemy_name: The name of the patrolling enemy.
+        - route: The IDs of the locations of the route, in order.
+        - interval: The number of steps between two moves.
+        - stop: The position in route of the location the enemy is at.
+        - generation: The number of times the patrol was stopped, so that the moves scheduled
+          before it was last stopped are ignored.
+        - active: Whether the enemy is patrolling (it is not while it is defeated).
+
+    Representation Invariants:
+        - len(self.route) > 0
+        - self.interval > 0
+        - 0 <= self.stop < len(self.route)
+    """
+    enemy_name: str
+    route: list[int]
+    interval: int
+    stop: int = 0
+    generation: int = 0
+    active: bool = True
+
+
+@dataclass
+class Trigger:
+    """A timed action, run once at a given step or periodically.
+
+    Instance Attributes:
+        - action: The function run with the game when the trigger is due.
+        - every: The number of steps between two runs, or None if the trigger runs once.
+        - runs: The number of times the trigger has run.
+
+    Representation Invariants:
+        - self.every is None or self.every > 0
+    """
+    action: Callable[[AdventureGame], None]
+    every: Optional[int] = None
+    runs: int = 0
+
+
+class WorldClock:
+    """The scheduler of the timed events of one game's world, driven by the game's step counter.
+
+    Instance Attributes:
+        - now: The step up to which the clock has run the due events.
+        - events_run: The number of events run so far.
+
+    Representation Invariants:
+        - self.events_run >= 0
+    """
+    # Private Instance Attributes:
+    #   - _queue: a heap of (due step, sequence number, kind, key, generation) for every scheduled
+    #       event; the sequence number runs events due at the same step in the order they were scheduled
+    #   - _sequence: the sequence number of the next event scheduled
+    #   - _patrols: the patrol of each patrolling enemy, by enemy name
+    #   - _respawns: the location at which each enemy that respawns reappears, and its delay in steps
+    #   - _triggers: the triggers that have not been cancelled, by ID
+
+    now: int
+    events_run: int
+    _queue: list[tuple[int, int, int, object, int]]
+    _sequence: int
+    _patrols: dict[str, Patrol]
+    _respawns: dict[str, tuple[int, int]]
+    _triggers: dict[int, Trigger]
+
+    def __init__(self, now: int = 0) -> None:
+        """Initialize a clock with no events, which has run the events due up to step now."""
+        self.now = now
+        self.events_run = 0
+        self._queue = []
+        self._sequence = 0
+        self._patrols = {}
+        self._respawns = {}
+        self._triggers = {}
+
+    def _schedule(self, due: int, kind: int, key: object, generation: int = 0) -> None:
+        """Add an event of the given kind to the queue, due at step due."""
+        heapq.heappush(self._queue, (due, self._sequence, kind, key, generation))
+        self._sequence += 1
+
+    def pending(self) -> int:
+        """Return the number of events in the queue, including those of stopped patrols and
+        cancelled triggers that have not been reached yet.
+        """
+        return len(self._queue)
+
+    def next_due(self) -> Optional[int]:
+        """Return the step at which the next event is due, or None if there are no events.
+
+        >>> clock = WorldClock()
+        >>> clock.next_due() is None
+        True
+        >>> trigger_id = clock.at(12, lambda game: None)
+        >>> clock.next_due()
+        12
+        """
+        return self._queue[0][0] if self._queue else None
+
+    def patrol(self, enemy_name: str, route: list[int], interval: int, first_move: Optional[int] = None) -> Patrol:
+        """Make the named enemy, which is at the first location of route, patrol route, moving every
+        interval steps from step first_move (from now + interval if it is None). Return the patrol.
+
+        Raise ValueError if the route is empty, the interval is not positive, or the enemy already patrols.
+        """
+        if not route or interval <= 0:
+            raise ValueError(f"a patrol needs a route and a positive interval, not {route} and {interval}")
+        if enemy_name in self._patrols:
+            raise ValueError(f"{enemy_name} already patrols")
+        patrol = Patrol(enemy_name, list(route), interval)
+        self._patrols[enemy_name] = patrol
+        self._schedule(self.now + interval if first_move is None else first_move, _MOVE, enemy_name)
+        return patrol
+
+    def get_patrol(self, enemy_name: str) -> Optional[Patrol]:
+        """Return the patrol of the named enemy, or None if it does not patrol."""
+        return self._patrols.get(enemy_name)
+
+    def respawn(self, enemy_name: str, location_id: int, delay: int) -> None:
+        """Make the named enemy reappear at the given location, at full health, delay steps after
+        each time it is defeated. A respawned enemy drops nothing when defeated again, so that
+        its items are not duplicated.
+
+        Raise ValueError if the delay is not positive.
+        """
+        if delay <= 0:
+            raise ValueError(f"a respawn delay must be positive, not {delay}")
+        self._respawns[enemy_name] = (location_id, delay)
+
+    def at(self, step: int, action: Callable[[AdventureGame], None], every: Optional[int] = None) -> int:
+        """Run action with the game when the step counter reaches step, and then every every steps if
+        every is given. Return the ID of the trigger, to cancel it with.
+
+        >>> clock = WorldClock()
+        >>> clock.at(5, lambda game: None, every=0)
+        Traceback (most recent call last):
+        ...
+        ValueError: a trigger must repeat every positive number of steps, not 0
+        """
+        if every is not None and every <= 0:
+            raise ValueError(f"a trigger must repeat every positive number of steps, not {every}")
+        trigger_id = self._sequence
+        self._triggers[trigger_id] = Trigger(action, every)
+        self._schedule(step, _TRIGGER, trigger_id)
+        return trigger_id
+
+    def get_trigger(self, trigger_id: int) -> Optional[Trigger]:
+        """Return the trigger with the given ID, or None if it was cancelled or has run its only time."""
+        return self._triggers.get(trigger_id)
+
+    def cancel(self, trigger_id: int) -> None:
+        """Cancel the trigger with the given ID, if it has not run its only time already."""
+        self._triggers.pop(trigger_id, None)
+
+    def enemy_defeated(self, game: AdventureGame, enemy_name: str, location_id: int) -> None:
+        """Record that the named enemy was defeated at the given location of game: stop its patrol,
+        if it was patrolling there, and schedule its respawn, if it respawns.
+        """
+        patrol = self._patrols.get(enemy_name)
+        if patrol is not None and patrol.active and patrol.route[patrol.stop] == location_id:
+            patrol.active = False
+            patrol.generation += 1
+        if enemy_name in self._respawns:
+            self._schedule(game.steps + self._respawns[enemy_name][1], _RESPAWN, enemy_name)
+
+    def advance(self, game: AdventureGame) -> int:
+        """Run every event of game due by its current step, in order of due step (and of scheduling,
+        for events due at the same step), and return how many ran.
+
+        A patrol that fell several moves behind (e.g. because a move cost several steps) makes all of
+        them, so where an enemy is depends only on the step counter.
+        """
+        ran = 0
+        queue = self._queue
+        while queue and queue[0][0] <= game.steps:
+            due, _, kind, key, generation = heapq.heappop(queue)
+            self.now = due
+            if kind == _MOVE:
+                ran += self._move(game, key, generation)
+            elif kind == _RESPAWN:
+                ran += self._respawn(game, key)
+            else:
+                ran += self._trigger(game, key)
+        self.now = max(self.now, game.steps)
+        self.events_run += ran
+        return ran
+
+    def _move(self, game: AdventureGame, enemy_name: str, generation: int) -> bool:
+        """Move the named enemy to the next location of its patrol, unless the patrol was stopped
+        since the move was scheduled. Return whether it moved.
+        """
+        patrol = self._patrols.get(enemy_name)
+        if patrol is None or patrol.generation != generation:
+            return False
+        here = game.get_location(patrol.route[patrol.stop])
+        if enemy_name not in here.enemies:
+            # Removed by something other than a defeat (e.g. a hot reload): the patrol ends
+            patrol.active = False
+            patrol.generation += 1
+            return False
+
+        patrol.stop = (patrol.stop + 1) % len(patrol.route)
+        there = game.get_location(patrol.route[patrol.stop])
+        here.enemies.remove(enemy_name)
+        there.enemies.append(enemy_name)
+        here.version += 1
+        there.version += 1
+        self._schedule(self.now + patrol.interval, _MOVE, enemy_name, generation)
+        return True
+
+    def _respawn(self, game: AdventureGame, enemy_name: str) -> bool:
+        """Bring the named enemy back at full health at its respawn location, restarting its patrol
+        from there if that location is on its route. Return whether it came back.
+        """
+        enemy = game.get_enemy(enemy_name)
+        if enemy is None or enemy_name not in self._respawns:
+            return False
+        location = game.get_location(self._respawns[enemy_name][0])
+        enemy.current_health = enemy.max_health
+        enemy.items = []
+        location.enemies.append(enemy_name)
+        location.version += 1
+
+        patrol = self._patrols.get(enemy_name)
+        if patrol is not None and location.id_num in patrol.route:
+            patrol.stop = patrol.route.index(location.id_num)
+            patrol.active = True
+            patrol.generation += 1
+            self._schedule(self.now + patrol.interval, _MOVE, enemy_name, patrol.generation)
+        return True
+
+    def _trigger(self, game: AdventureGame, trigger_id: int) -> bool:
+        """Run the trigger with the given ID, unless it was cancelled, and schedule its next run if it
+        repeats. Return whether it ran.
+        """
+        trigger = self._triggers.get(trigger_id)
+        if trigger is None:
+            return False
+        if trigger.every is None:
+            del self._triggers[trigger_id]
+        else:
+            self._schedule(self.now + trigger.every, _TRIGGER, trigger_id)
+        trigger.runs += 1
+        trigger.action(game)
+        return True
+
+
+def _ring_bells(game: AdventureGame) -> None:
+    """The periodic trigger of the campus clock."""
+    print(f"\nThe bells of Soldiers' Tower ring. ({game.max_steps - game.steps} steps left)")
+
+
+def campus_clock() -> WorldClock:
+    """Return a clock bringing the shipped world to life: the Stressed Out Student paces between
+    Robarts, Trinity and Hart House, the Sleep Deprived TA comes back to Vic a while after being
+    defeated, and the bells of Soldiers' Tower ring every 15 steps.
+
+    Hint tables assume enemies stay where the game data puts them, so hints can be wrong in a game
+    following this clock.
+    """
+    clock = WorldClock()
+    clock.patrol("Stressed Out Student", [4, 5, 6, 5], interval=8)
+    clock.respawn("Sleep Deprived TA", 3, delay=20)
+    clock.at(15, _ring_bells, every=15)
+    return clock
+
+
+def check_world_clock(game_data_file: str, runs: int = 200, inputs_per_run: int = 150, seed: int = 0) -> list[str]:
+    """Play the given number of games with random stats and random commands (see
+    fuzzer.check_random_games) in a world following the campus clock, in which the Barista also
+    respawns, and return every way in which the world went wrong.
+
+    Whenever a game asks for input, no enemy may be at more locations than at the start, the
+    patrolling student must be at the location of its route given by the step counter (until it is
+    defeated), the TA must be back at Vic within 20 steps of being found defeated, a trigger added
+    every 7 steps must have run once every 7 steps, no item may be in two places (the Barista must
+    not drop the lucky mug again), and the game's item index must match its world.
+    """
+    def start_run(run: RandomRun) -> Callable[[str], list[str]]:
+        """Set up the clock of run's game, and return the clock check of run."""
+        game, player = run.game, run.player
+        game.world_clock = campus_clock()
+        game.max_steps = 10 ** 6  # keep playing long enough for every event to come up
+        start = Counter(name for loc_id in game.get_location_ids() for name in game.get_location(loc_id).enemies)
+        game.world_clock.respawn("Barista", 9, delay=10)
+        ticks = game.world_clock.get_trigger(game.world_clock.at(7, lambda _: None, every=7))
+        ta_missing_since = [None]
+
+        def check(_: str) -> list[str]:
+            """Check the world against the clock."""
+            clock = game.world_clock
+            enemies = Counter(name for loc_id in game.get_location_ids() for name in game.get_location(loc_id).enemies)
+            failures = [f"{name} is at {count} locations" for name, count in enemies.items() if count > start[name]]
+            patrol = clock.get_patrol("Stressed Out Student")
+            expected = patrol.route[clock.now // patrol.interval % len(patrol.route)]
+            if patrol.active and "Stressed Out Student" not in game.get_location(expected).enemies:
+                failures.append(f"the patrolling student is not at {expected} at step {clock.now}")
+            if "Sleep Deprived TA" in game.get_location(3).enemies:
+                ta_missing_since[0] = None
+            elif ta_missing_since[0] is None:
+                ta_missing_since[0] = game.steps
+            elif clock.now >= ta_missing_since[0] + 20:
+                failures.append(f"the TA has not respawned {clock.now - ta_missing_since[0]} steps later")
+            if ticks.runs != clock.now // 7:
+                failures.append(f"a trigger due every 7 steps ran {ticks.runs} times by step {clock.now}")
+            index = game.get_item_index(player)
+            failures.extend(index.differences(ItemIndex(game, player)))
+            failures.extend(f"{name} is in {len(index.holders(name))} places"
+                            for name in game.get_item_names() if len(index.holders(name)) > 1)
+            return failures
+
+        return check
+
+    return check_random_games(game_data_file, start_run, runs, inputs_per_run, seed)
+
+
+def _scan_advance(patrols: list[Patrol], due: list[int], game: AdventureGame) -> int:
+    """Move every patrolling enemy that is due by checking each of them, as a clock without a
+    priority queue would; due holds the step of each patrol's next move. Return how many moved.
+    """
+    moved = 0
+    for i, patrol in enumerate(patrols):
+        while due[i] <= game.steps:
+            here = game.get_location(patrol.route[patrol.stop])
+            patrol.stop = (patrol.stop + 1) % len(patrol.route)
+            there = game.get_location(patrol.route[patrol.stop])
+            here.enemies.remove(patrol.enemy_name)
+            there.enemies.append(patrol.enemy_name)
+            here.version += 1
+            there.version += 1
+            due[i] += patrol.interval
+            moved += 1
+    return moved
+
+
+def benchmark(game_data_file: str = "game_data.json", entity_counts: tuple[int, ...] = (100, 1_000, 10_000, 100_000),
+              due_per_turn: int = 4, turns: int = 2000) -> None:
+    """Print the time a turn takes to run the due events, with the clock's priority queue and by
+    checking every entity, as the number of patrolling enemies grows while about due_per_turn of
+    them move each turn, in a generated world of 10,000 locations (see world_validator.generate_world).
+    """
+    from time import perf_counter
+    from adventure import AdventureGame
+    from world_validator import generate_world
+
+    for count in entity_counts:
+        data = generate_world(10_000)
+        rng = random.Random(count)
+        interval = max(count // due_per_turn, 1)
+        routes = []
+        for n in range(count):
+            first = rng.randint(1, 10_000 - 101)
+            routes.append([first, first + 1, first + 101, first + 100])
+            data['enemies'].append({'name': f"patroller {n}", 'max_health': 5, 'current_health': 5, 'attack': 1,
+                                    'items': [], 'attack_pattern': ["small"]})
+            data['locations'][first - 1]['enemies'].append(f"patroller {n}")
+
+        timings = {}
+        for label in ("queue", "scan"):
+            game = AdventureGame(game_data_file, 1, world_data=data)
+            clock, patrols, due = WorldClock(), [], []
+            for n, route in enumerate(routes):
+                # Stagger the patrols, so that about due_per_turn of them move every turn
+                due.append(interval - n % interval)
+                patrols.append(clock.patrol(f"patroller {n}", route, interval, first_move=due[-1]))
+            moved = 0
+            start = perf_counter()
+            for _ in range(turns):
+                game.steps += 1
+                moved += clock.advance(game) if label == "queue" else _scan_advance(patrols, due, game)
+            timings[label] = ((perf_counter() - start) / turns, moved / turns)
+
+        print(f"{count:>8} patrolling enemies: {timings['queue'][0] * 1e6:8.1f} us per turn with the queue, "
+              f"{timings['scan'][0] * 1e6:10.1f} us checking every enemy "
+              f"({timings['queue'][1]:.1f} and {timings['scan'][1]:.1f} moves per turn)")
+
+
+if __name__ == "__main__":
+    import argparse
+    import doctest
+    doctest.testmod()
+
+    parser = argparse.ArgumentParser(description="Check the world clock and measure the cost of a turn.")
+    parser.add_argument("--game-data", default="game_data.json")
+    parser.add_argument("--runs", type=int, default=200)
+    parser.add_argument("--entities", type=int, nargs="+", default=[100, 1_000, 10_000, 100_000])
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    clock_failures = check_world_clock(args.game_data, runs=args.runs, seed=args.seed)
+    print(f"World clock over random command streams: {len(clock_failures)} failures")
+    for failure in clock_failures[:10]:
+        print("   ", failure)
+    benchmark(args.game_data, tuple(args.entities))
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })
@@ -0,0 +1,428 @@
+"""CSC111 Project 1: Text Adventure Game - Game Data Validator
+
+Instructions (READ THIS FIRST!)
+===============================
+
+This Python module checks that a game data file describes a consistent world before any game
+is played in it, so that a broken exit, item or enemy reference is reported when the world is
+loaded instead of failing when a player first reaches it.
+
+The validator builds symbol tables of the location IDs, item names and enemy names, then
+checks every location, item and enemy against them:
+    - every entry has its fields, of the right types, and IDs and names are unique,
+    - every "go" command leads to an existing location,
+    - every "take" command names an item lying at its location and leads back to it, and
+      every item lying at a location can be taken with a "take" command,
+    - every item and enemy listed at a location, and every item held by an enemy, exists,
+    - no item is placed twice, and items agree with their start_position and target_position,
+    - every enemy has a non-empty attack_pattern of "small" and "big" attacks, and sensible health.
+It reports every error at once, each with the JSON path of the offending value, in time linear
+in the size of the game data.
+
+Valid worlds are remembered by the SHA-256 hash of their game data (and of this validator's
+source code), so loading a world that was already found valid skips the validation. The most
+recently validated worlds are remembered in memory, and the last one in a file of a cache
+directory, so that every edit or hot reload of the game data replaces the remembered world
+rather than adding to the cache.
+
+Copyright and Usage Information
+===============================
+
+This file is provided solely for the personal and private use of students
+taking CSC111 at the University of Toronto St. George campus. All forms of
+distribution of this code, whether as given or with any changes, are
+expressly prohibited. For more information on copyright for CSC111 materials,
+please consult our Course Syllabus.
+
+This file is Copyright (c) 2026 CSC111 Teaching Team
+"""
+from __future__ import annotations
+import contextlib
+import hashlib
+import os
+from collections import OrderedDict
+from typing import Any, Optional
+
+from autosave import write_bytes_atomically
+
+# Where the hash of the last valid world is remembered between runs.
+DEFAULT_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".world_cache")
+
+# The file of the cache directory holding the hash of the last valid world.
+LAST_VALID_FILE = "last_valid"
+
+# Most world hashes remembered as valid in memory; the least recently checked are forgotten first.
+MAX_VALID_WORLDS = 16
+
+# Most errors listed in an InvalidWorldError's message (all of them are kept in its errors).
+MAX_REPORTED_ERRORS = 20
+
+# The attacks an enemy's attack_pattern may contain.
+ATTACK_TYPES = {"small", "big"}
+
+# The start_position of an item that is not lying anywhere when the game starts
+# (it is held by an enemy, or appears later).
+NOT_PLACED = -1
+
+# The fields of each kind of entry and their types.
+LOCATION_FIELDS = {'id': int, 'brief_description': str, 'long_description': str, 'available_commands': dict,
+                   'items': list, 'enemies': list}
+ITEM_FIELDS = {'name': str, 'description': str, 'start_position': int, 'target_position': int,
+               'target_points': int, 'weight': (int, float), 'combat_use': int, 'strength': int}
+ENEMY_FIELDS = {'name': str, 'max_health': int, 'current_health': int, 'attack': int, 'attack_pattern': list,
+                'items': list}
+
+# Item combat_use values: no combat use, healing, damage.
+COMBAT_USES = {0, 1, 2}
+
+# Stands for a missing field.
+_MISSING = object()
+
+# World hashes found valid in this process, least recently checked first.
+_valid_worlds = OrderedDict()
+_validator_version = None
+
+
+class InvalidWorldError(Exception):
+    """Raised when game data does not describe a consistent world.
+
+    Instance Attributes:
+        - errors: Every error found, each starting with the JSON path of the offending value.
+    """
+    errors: list[str]
+
+    def __init__(self, errors: list[str]) -> None:
+        self.errors = errors
+        shown = errors[:MAX_REPORTED_ERRORS]
+        more = f"\n    ... and {len(errors) - len(shown)} more" if len(errors) > len(shown) else ""
+        super().__init__(f"{len(errors)} errors in the game data:\n    " + "\n    ".join(shown) + more)
+
+
+def _check_fields(entry: Any, path: str, fields: dict[str, Any], errors: list[str]) -> bool:
+    """Check that entry is an object with every one of fields, of the right type, appending an
+    error (starting with the JSON path of entry) to errors for each one that is not. Return
+    whether entry can be checked further.
+    """
+    if not isinstance(entry, dict):
+        errors.append(f"{path}: expected an object")
+        return False
+    complete = True
+    for name, kind in fields.items():
+        value = entry.get(name, _MISSING)
+        if isinstance(value, kind) and type(value) is not bool:
+            continue
+        if value is _MISSING:
+            errors.append(f"{path}: missing field '{name}'")
+        else:
+            errors.append(f"{path}.{name}: expected {'a number' if name == 'weight' else kind.__name__}, "
+                          f"got {value!r}")
+        complete = False
+    return complete
+
+
+def _section(data: Any, name: str, errors: list[str]) -> list:
+    """Return the list under name in data, or an empty list (appending an error) if there is none."""
+    section = data.get(name) if isinstance(data, dict) else None
+    if not isinstance(section, list):
+        errors.append(f"$.{name}: expected a list")
+        return []
+    return section
+
+
+def validate_world(data: Any) -> list[str]:
+    """Return every error in the parsed game data, each starting with the JSON path of the offending
+    value, or an empty list if it describes a consistent world.
+
+    >>> world = {'locations': [{'id': 1, 'brief_description': 'OISE', 'long_description': 'OISE',
+    ...                         'available_commands': {'go east': 2, 'take mug': 1, 'take pen': 1},
+    ...                         'items': ['mug'], 'enemies': ['TA']}],
+    ...          'items': [{'name': 'mug', 'description': 'A mug', 'start_position': 1, 'target_position': 1,
+    ...                     'target_points': 5, 'weight': 1.5, 'combat_use': 1, 'strength': 3}],
+    ...          'enemies': [{'name': 'Goose', 'max_health': 5, 'current_health': 5, 'attack': 2,
+    ...                       'attack_pattern': ['small', 'huge'], 'items': []}]}
+    >>> for error in validate_world(world):
+    ...     print(error)
+    $.locations[0].available_commands['go east']: there is no location 2
+    $.locations[0].available_commands['take pen']: there is no item 'pen'
+    $.locations[0].enemies[0]: there is no enemy 'TA'
+    $.enemies[0].attack_pattern[1]: unknown attack 'huge' (expected one of: big, small)
+    """
+    errors = []
+    items = _section(data, 'items', errors)
+    enemies = _section(data, 'enemies', errors)
+    locations = _section(data, 'locations', errors)
+
+    # Symbol tables: the index of every item, enemy and location, by name or ID
+    item_index = _symbols(items, 'items', 'name', ITEM_FIELDS, errors)
+    enemy_index = _symbols(enemies, 'enemies', 'name', ENEMY_FIELDS, errors)
+    location_index = _symbols(locations, 'locations', 'id', LOCATION_FIELDS, errors)
+
+    # Where each item is placed when the game starts, as (section, index in section, index in items)
+    placed_at = {}
+    for i, location in enumerate(locations):
+        if isinstance(location, dict) and isinstance(location.get('id'), int) \
+                and location_index.get(location['id']) == i:
+            _check_location(location, i, item_index, enemy_index, location_index, placed_at, errors)
+    for i, enemy in enumerate(enemies):
+        if isinstance(enemy, dict) and isinstance(enemy.get('name'), str) and enemy_index.get(enemy['name']) == i:
+            _check_enemy(enemy, i, item_index, placed_at, errors)
+    for i, item in enumerate(items):
+        if isinstance(item, dict) and isinstance(item.get('name'), str) and item_index.get(item['name']) == i:
+            _check_item(item, i, location_index, placed_at, errors)
+    return errors
+
+
+def _symbols(entries: list, section: str, key: str, fields: dict[str, Any], errors: list[str]) -> dict:
+    """Return the index of every entry of entries by its key field, checking the fields of each entry
+    and appending an error for every duplicate key (only the first entry with a key is indexed).
+    """
+    index = {}
+    for i, entry in enumerate(entries):
+        if not _check_fields(entry, f"$.{section}[{i}]", fields, errors) and not (
+                isinstance(entry, dict) and isinstance(entry.get(key), fields[key])):
+            continue
+        if entry[key] in index:
+            errors.append(f"$.{section}[{i}].{key}: duplicate {key} {entry[key]!r} "
+                          f"(first at $.{section}[{index[entry[key]]}])")
+        else:
+            index[entry[key]] = i
+    return index
+
+
+def _placement_path(placement: tuple[str, int, int]) -> str:
+    """Return the JSON path of an item placement recorded in placed_at."""
+    section, i, j = placement
+    return f"$.{section}[{i}].items[{j}]"
+
+
+def _place(item: str, placement: tuple[str, int, int], placed_at: dict[str, tuple[str, int, int]],
+           errors: list[str]) -> None:
+    """Record that item is placed at placement, appending an error if it was already placed elsewhere."""
+    if item in placed_at:
+        errors.append(f"{_placement_path(placement)}: item '{item}' is already placed at "
+                      f"{_placement_path(placed_at[item])}")
+    else:
+        placed_at[item] = placement
+
+
+def _check_enemy(enemy: dict, i: int, item_index: dict[str, int], placed_at: dict[str, tuple[str, int, int]],
+                 errors: list[str]) -> None:
+    """Check the enemy at index i, appending every error to errors."""
+    path = f"$.enemies[{i}]"
+    if isinstance(enemy.get('attack_pattern'), list):
+        if not enemy['attack_pattern']:
+            errors.append(f"{path}.attack_pattern: must not be empty")
+        for j, attack in enumerate(enemy['attack_pattern']):
+            if attack not in ATTACK_TYPES:
+                errors.append(f"{path}.attack_pattern[{j}]: unknown attack {attack!r} "
+                              f"(expected one of: {', '.join(sorted(ATTACK_TYPES))})")
+    if isinstance(enemy.get('max_health'), int) and enemy['max_health'] <= 0:
+        errors.append(f"{path}.max_health: must be positive, got {enemy['max_health']}")
+    if isinstance(enemy.get('current_health'), int) and isinstance(enemy.get('max_health'), int) \
+            and not 0 < enemy['current_health'] <= enemy['max_health']:
+        errors.append(f"{path}.current_health: must be between 1 and max_health, got {enemy['current_health']}")
+    if isinstance(enemy.get('attack'), int) and enemy['attack'] < 0:
+        errors.append(f"{path}.attack: must not be negative, got {enemy['attack']}")
+    for j, item in enumerate(enemy['items'] if isinstance(enemy.get('items'), list) else []):
+        if not isinstance(item, str) or item not in item_index:
+            errors.append(f"{path}.items[{j}]: there is no item {item!r}")
+        else:
+            _place(item, ('enemies', i, j), placed_at, errors)
+
+
+def _check_location(location: dict, i: int, item_index: dict[str, int], enemy_index: dict[str, int],
+                    location_index: dict[int, int], placed_at: dict[str, tuple[str, int, int]],
+                    errors: list[str]) -> None:
+    """Check the location at index i, appending every error to errors.
+
+    This runs once per location, so JSON paths are only built for errors.
+    """
+    loc_id = location['id']
+    items_here = location['items'] if isinstance(location.get('items'), list) else []
+    commands = location['available_commands'] if isinstance(location.get('available_commands'), dict) else {}
+    for command, target in commands.items():
+        if command.startswith("go "):
+            if type(target) is not int or target not in location_index:
+                errors.append(f"$.locations[{i}].available_commands[{command!r}]: there is no location {target!r}")
+        elif not command.startswith("take "):
+            errors.append(f"$.locations[{i}].available_commands[{command!r}]: not a 'go' or 'take' command")
+        elif command[5:] not in item_index:
+            errors.append(f"$.locations[{i}].available_commands[{command!r}]: there is no item {command[5:]!r}")
+        elif target != loc_id:
+            errors.append(f"$.locations[{i}].available_commands[{command!r}]: leads to {target!r} instead of "
+                          f"this location ({loc_id})")
+        elif command[5:] not in items_here:
+            errors.append(f"$.locations[{i}].available_commands[{command!r}]: '{command[5:]}' is not in "
+                          f"this location's items")
+
+    for j, item in enumerate(items_here):
+        if not isinstance(item, str) or item not in item_index:
+            errors.append(f"$.locations[{i}].items[{j}]: there is no item {item!r}")
+            continue
+        _place(item, ('locations', i, j), placed_at, errors)
+        if "take " + item not in commands:
+            errors.append(f"$.locations[{i}].items[{j}]: '{item}' has no 'take {item}' command here")
+    for j, enemy in enumerate(location['enemies'] if isinstance(location.get('enemies'), list) else []):
+        if not isinstance(enemy, str) or enemy not in enemy_index:
+            errors.append(f"$.locations[{i}].enemies[{j}]: there is no enemy {enemy!r}")
+
+
+def _check_item(item: dict, i: int, location_index: dict[int, int], placed_at: dict[str, tuple[str, int, int]],
+                errors: list[str]) -> None:
+    """Check the item at index i, after every location and enemy has been checked, appending every
+    error to errors.
+    """
+    path = f"$.items[{i}]"
+    if isinstance(item.get('combat_use'), int) and item['combat_use'] not in COMBAT_USES:
+        errors.append(f"{path}.combat_use: must be one of {sorted(COMBAT_USES)}, got {item['combat_use']}")
+    if isinstance(item.get('weight'), (int, float)) and item['weight'] < 0:
+        errors.append(f"{path}.weight: must not be negative, got {item['weight']}")
+    if isinstance(item.get('target_position'), int) and item['target_position'] not in location_index:
+        errors.append(f"{path}.target_position: there is no location {item['target_position']}")
+
+    start = item.get('start_position')
+    if not isinstance(start, int):
+        return
+    placement = placed_at.get(item['name'])
+    lies_at = placement[1] if placement is not None and placement[0] == 'locations' else None
+    if start == NOT_PLACED:
+        if lies_at is not None:
+            errors.append(f"{path}.start_position: is {NOT_PLACED}, but the item lies at {_placement_path(placement)}")
+    elif start not in location_index:
+        errors.append(f"{path}.start_position: there is no location {start}")
+    elif lies_at != location_index[start]:
+        errors.append(f"{path}.start_position: is {start}, but location {start} does not list the item")
+
+
+def _version() -> str:
+    """Return a hash of this validator's source code, computed once per process."""
+    global _validator_version
+    if _validator_version is None:
+        with open(os.path.abspath(__file__), 'rb') as f:
+            _validator_version = hashlib.sha256(f.read()).hexdigest()
+    return _validator_version
+
+
+def check_world(data: Any, world_hash: str = "", cache_dir: Optional[str] = DEFAULT_CACHE_DIR) -> None:
+    """Raise InvalidWorldError, listing every error, if the parsed game data does not describe a
+    consistent world.
+
+    If world_hash (the SHA-256 hash of the game data file) is given, a world already found valid,
+    in this process or (if cache_dir is not None) in an earlier one, is not validated again.
+    """
+    key = hashlib.sha256((world_hash + _version()).encode()).hexdigest() if world_hash else None
+    if key is not None and key in _valid_worlds:
+        _valid_worlds.move_to_end(key)
+        return
+    last_valid = os.path.join(cache_dir, LAST_VALID_FILE) if key is not None and cache_dir is not None else None
+    if last_valid is not None and _read_last_valid(last_valid) == key:
+        _remember(key)
+        return
+
+    errors = validate_world(data)
+    if errors:
+        raise InvalidWorldError(errors)
+    if key is not None:
+        _remember(key)
+    if last_valid is not None:
+        with contextlib.suppress(OSError):  # the cache is only an optimization
+            os.makedirs(cache_dir, exist_ok=True)
+            write_bytes_atomically(last_valid, key.encode('ascii'))
+            for name in os.listdir(cache_dir):  # markers of the earlier cache layout, one per world
+                if len(name) == 64 and all(char in '0123456789abcdef' for char in name):
+                    os.remove(os.path.join(cache_dir, name))
+
+
+def _read_last_valid(last_valid: str) -> Optional[str]:
+    """Return the key of the last valid world stored in the file last_valid, or None if it cannot be read."""
+    try:
+        with open(last_valid, 'rb') as f:
+            return f.read().decode('ascii')
+    except (OSError, UnicodeDecodeError):
+        return None
+
+
+def _remember(key: str) -> None:
+    """Remember the world with the given key as valid, forgetting the least recently checked
+    world if more than MAX_VALID_WORLDS are remembered.
+    """
+    _valid_worlds[key] = None
+    _valid_worlds.move_to_end(key)
+    if len(_valid_worlds) > MAX_VALID_WORLDS:
+        _valid_worlds.popitem(last=False)
+
+
+def generate_world(locations: int, seed: int = 0) -> dict:
+    """Return the game data of a valid world with the given number of locations: a grid in which
+    every location leads to its neighbours, with an item lying at every tenth location and an
+    enemy guarding every seventh.
+    """
+    import random
+
+    rng = random.Random(seed)
+    width = max(int(locations ** 0.5), 1)
+    items, enemies, location_data = [], [], []
+    for enemy_num in range(100):
+        enemies.append({'name': f"enemy {enemy_num}", 'max_health': rng.randint(1, 20), 'current_health': 1,
+                        'attack': rng.randint(0, 5), 'items': [],
+                        'attack_pattern': [rng.choice(["small", "big"]) for _ in range(rng.randint(1, 4))]})
+    for loc_id in range(1, locations + 1):
+        commands = {}
+        for direction, neighbour in (("north", loc_id - width), ("south", loc_id + width),
+                                     ("west", loc_id - 1), ("east", loc_id + 1)):
+            if 1 <= neighbour <= locations:
+                commands[f"go {direction}"] = neighbour
+        loc_items = []
+        if loc_id % 10 == 0:
+            name = f"item {loc_id}"
+            loc_items.append(name)
+            commands[f"take {name}"] = loc_id
+            items.append({'name': name, 'description': "An item.", 'start_position': loc_id,
+                          'target_position': rng.randint(1, locations), 'target_points': 5, 'weight': 1.0,
+                          'combat_use': rng.choice([0, 1, 2]), 'strength': 1})
+        location_data.append({'id': loc_id, 'name': f"Location {loc_id}", 'brief_description': "A place.",
+                              'long_description': "A place in a very large world.", 'available_commands': commands,
+                              'items': loc_items,
+                              'enemies': [f"enemy {loc_id % 100}"] if loc_id % 7 == 0 else []})
+    return {'locations': location_data, 'items': items, 'enemies': enemies}
+
+
+def benchmark(locations: int = 1_000_000) -> None:
+    """Print the time taken to validate a generated world with the given number of locations, to
+    find every error in a broken copy of it, and to check it again once it is known to be valid.
+    """
+    import tempfile
+    from time import perf_counter
+
+    data = generate_world(locations)
+    start = perf_counter()
+    errors = validate_world(data)
+    print(f"Validated {locations} locations in {perf_counter() - start:.2f} s: {len(errors)} errors")
+
+    for loc_id in range(0, locations, 1000):
+        data['locations'][loc_id]['available_commands']['go nowhere'] = -loc_id
+    start = perf_counter()
+    errors = validate_world(data)
+    print(f"Validated a broken copy in {perf_counter() - start:.2f} s: {len(errors)} errors, e.g. {errors[0]}")
+
+    for loc_id in range(0, locations, 1000):
+        del data['locations'][loc_id]['available_commands']['go nowhere']
+    with tempfile.TemporaryDirectory() as cache_dir:
+        check_world(data, "0" * 64, cache_dir)
+        _valid_worlds.clear()
+        start = perf_counter()
+        check_world(data, "0" * 64, cache_dir)
+        print(f"Checked it again from the cache in {(perf_counter() - start) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    import doctest
+    doctest.testmod()
+
+    benchmark()
+
+    import python_ta
+    python_ta.check_all(config={
+        'max-line-length': 120,
+        'disable': ['R1705', 'E9998', 'E9999', 'static_type_checker']
+    })